@@ -1,98 +1,708 @@
+import os
+import sys
+from bisect import bisect_left, bisect_right
+
+# Módulos compartilhados pelas duas árvores ficam em ../comum
+_COMUM = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "comum")
+if _COMUM not in sys.path:
+    sys.path.append(_COMUM)
+
+from arvore_ordenada import SortedTree, _MISSING, _merge_sorted, _sorted_unique, _subtract_sorted
+from estatisticas import CountingKey, TreeStats, instrumented_class
+
+
+def _split_even(total, parts):
+    # Divide total em `parts` grupos cujos tamanhos diferem no máximo em 1
+    q, r = divmod(total, parts)
+    return [q + 1] * r + [q] * (parts - r)
+
+
 class Node234:
-    def __init__(self, keys=None, children=None):
+    def __init__(self, keys=None, children=None, values=None):
         self.keys = keys or []
         self.children = children or []
+        # Valores paralelos às chaves: values[i] pertence a keys[i]
+        self.values = values if values is not None else [None] * len(self.keys)
 
     def is_leaf(self):
         return len(self.children) == 0
 
-    def is_full(self):
-        return len(self.keys) == 3
 
+class BTree(SortedTree):
+    """Árvore B de ordem `order`: cada nó tem no máximo order - 1 chaves.
 
-class Tree234:
-    def __init__(self):
+    A inserção divide nós cheios e a remoção empresta ou funde nós, sempre na
+    descida. Esse esquema de uma passada só fecha as contas com ordem par
+    (um nó cheio se divide em duas metades válidas), por isso a ordem deve
+    ser par e >= 4. Ordens maiores deixam a árvore mais rasa e trocam
+    ponteiros por buscas binárias (bisect) dentro de listas contíguas.
+    """
+
+    # Preenchido por enable_stats; None enquanto as estatísticas estão desligadas
+    stats = None
+
+    def __init__(self, order=4):
+        if order < 4 or order % 2:
+            raise ValueError("a ordem da árvore B deve ser par e >= 4")
+        self.order = order
+        self._max_keys = order - 1
+        # Grau mínimo: nós (exceto a raiz) têm entre t - 1 e 2t - 1 chaves
+        self._t = order // 2
         self.root = Node234()
+        self._len = 0
+
+    @classmethod
+    def from_sorted(cls, keys, values=None, **kwargs):
+        """Constrói a árvore em O(n) a partir de chaves ordenadas, sem splits.
+
+        Entrada fora de ordem é ordenada antes (O(n log n)). A construção é de
+        baixo para cima: as folhas são preenchidas por igual e a chave entre
+        duas folhas vizinhas sobe como separadora para o nível de cima.
+        Argumentos extras (como order) vão para o construtor.
+        """
+        tree = cls(**kwargs)
+        tree._load_sorted(*_sorted_unique(keys, values))
+        return tree
+
+    def _load_sorted(self, keys, values):
+        # Substitui todo o conteúdo da árvore; keys já ordenada e sem repetições
+        n = len(keys)
+        self.root = Node234()
+        self._len = n
+        if n == 0:
+            return
+        fan = self.order
+
+        # Folhas: as n + 1 "lacunas" entre chaves são divididas em grupos;
+        # uma folha com g lacunas guarda g - 1 chaves
+        level, sep_keys, sep_values = [], [], []
+        pos = 0
+        for g in _split_even(n + 1, -(-(n + 1) // fan)):
+            level.append(Node234(keys[pos:pos + g - 1], values=values[pos:pos + g - 1]))
+            pos += g - 1
+            if pos < n:
+                sep_keys.append(keys[pos])
+                sep_values.append(values[pos])
+                pos += 1
+
+        # Níveis internos: agrupa os nós do nível de baixo sob novos pais
+        while len(level) > 1:
+            parents, next_keys, next_values = [], [], []
+            c = 0
+            for g in _split_even(len(level), -(-len(level) // fan)):
+                parents.append(Node234(sep_keys[c:c + g - 1], level[c:c + g],
+                                       sep_values[c:c + g - 1]))
+                c += g
+                if c < len(level):
+                    next_keys.append(sep_keys[c - 1])
+                    next_values.append(sep_values[c - 1])
+            level, sep_keys, sep_values = parents, next_keys, next_values
+
+        self.root = level[0]
 
     # -------------------------
-    # Split de nó 4 (3 chaves)
+    # Split de nó cheio (order - 1 chaves)
     # -------------------------
     def split_child(self, parent, index):
         node = parent.children[index]
 
-        # O nó cheio tem: [A, B, C]
-        A, B, C = node.keys
+        # O nó cheio tem 2t - 1 chaves: [esquerda..., mediana, direita...]
+        mid = self._t - 1
 
         # Novo nó direito
-        right = Node234(keys=[C], children=node.children[2:])
+        right = Node234(keys=node.keys[mid + 1:], children=node.children[mid + 1:],
+                        values=node.values[mid + 1:])
 
-        # Nó esquerdo permanece com A
-        left = Node234(keys=[A], children=node.children[:2])
+        # Mediana (e seu valor) sobe para o pai
+        parent.keys.insert(index, node.keys[mid])
+        parent.values.insert(index, node.values[mid])
 
-        # Inserir chave B no pai
-        parent.keys.insert(index, B)
+        # O próprio nó vira a metade esquerda
+        del node.keys[mid:]
+        del node.values[mid:]
+        del node.children[mid + 1:]
 
-        # Substituir o filho por left e inserir right
-        parent.children[index] = left
         parent.children.insert(index + 1, right)
 
     # -------------------------
     # Inserção principal
     # -------------------------
-    def insert(self, key):
-        root = self.root
+    def insert(self, key, value=None):
+        inserted = self._insert_from([(self.root, None)], key, value)
+        if inserted:
+            self._len += 1
+        return inserted
+
+    # Descida de inserção a partir do topo de `stack`, uma pilha de
+    # (nó, limite superior exclusivo; None = infinito) que começa na raiz.
+    # O caminho percorrido fica na pilha: o lote ordenado recomeça do nó
+    # mais fundo que ainda contém a chave seguinte e não está cheio
+    def _insert_from(self, stack, key, value):
+        max_keys = self._max_keys
+        while stack[-1][1] is not None and not key < stack[-1][1]:
+            stack.pop()
+        while len(stack) > 1 and len(stack[-1][0].keys) == max_keys:
+            stack.pop()
+        node, hi = stack[-1]
 
         # Se a raiz está cheia, precisa split antes de descer
-        if root.is_full():
-            new_root = Node234(children=[root])
-            self.split_child(new_root, 0)
-            self.root = new_root
+        if len(node.keys) == max_keys:
+            node = Node234(children=[self.root])
+            self.split_child(node, 0)
+            self.root = node
+            stack[0] = (node, None)
 
-        self._insert_non_full(self.root, key)
+        while True:
+            # Posição da chave no nó (ou do filho a seguir), por busca binária
+            i = bisect_left(node.keys, key)
+            if i < len(node.keys) and node.keys[i] == key:
+                # Chave já existe: substitui o valor no lugar
+                node.values[i] = value
+                return False
 
-    # Inserção em nó não cheio
-    def _insert_non_full(self, node, key):
+            # Caso 1: nó folha
+            if not node.children:
+                node.keys.insert(i, key)
+                node.values.insert(i, value)
+                return True
 
-        # Caso 1: nó folha
-        if node.is_leaf():
-            node.keys.append(key)
-            node.keys.sort()
-            return
+            # Caso 2: nó interno
+            # Se o filho está cheio, split antes de descer
+            if len(node.children[i].keys) == max_keys:
+                self.split_child(node, i)
+
+                # Após split, decidir qual dos dois filhos seguir
+                if key == node.keys[i]:
+                    node.values[i] = value
+                    return False
+                if key > node.keys[i]:
+                    i += 1
+
+            if i < len(node.keys):
+                hi = node.keys[i]
+            node = node.children[i]
+            stack.append((node, hi))
+
+    # -------------------------
+    # Remoção (descida única, de cima para baixo)
+    # -------------------------
+    # Antes de descer para um filho, garante que ele tenha pelo menos
+    # t chaves (2 na árvore 2-3-4), emprestando de um irmão ou
+    # fundindo com ele. Assim a remoção na folha nunca esvazia um nó e não é
+    # preciso voltar subindo para rebalancear.
+    def delete(self, key):
+        if self._delete(key) is _MISSING:
+            print(f"Valor {key} não encontrado na árvore")
+            return False
+        return True
 
-        # Caso 2: nó interno
-        # Escolher filho adequado
-        for i in range(len(node.keys)):
-            if key < node.keys[i]:
-                child_index = i
+    def _delete(self, key, stack=None):
+        # Remove key e devolve o seu valor, ou _MISSING se não existir.
+        # Com `stack` (como em _insert_from), recomeça do nó mais fundo que
+        # ainda contém a chave e tem folga, e deixa na pilha o caminho novo
+        t = self._t
+        if stack is None:
+            stack = [(self.root, None)]
+        while stack[-1][1] is not None and not key < stack[-1][1]:
+            stack.pop()
+        while len(stack) > 1 and len(stack[-1][0].keys) < t:
+            stack.pop()
+        node, hi = stack[-1]
+        result = _MISSING
+        while True:
+            i = bisect_left(node.keys, key)
+            found = i < len(node.keys) and node.keys[i] == key
+
+            # Caso 1: folha
+            if not node.children:
+                if found:
+                    node.keys.pop(i)
+                    result = node.values.pop(i)
                 break
-        else:
-            child_index = len(node.keys)
 
-        # Se o filho está cheio, split antes de descer
-        if node.children[child_index].is_full():
-            self.split_child(node, child_index)
+            # Caso 2: chave em nó interno
+            if found:
+                left, right = node.children[i], node.children[i + 1]
+                if len(left.keys) >= t:
+                    # Substitui pelo predecessor, removido na mesma descida
+                    result = node.values[i]
+                    node.keys[i], node.values[i] = self._pop_max(left)
+                    break
+                if len(right.keys) >= t:
+                    # Substitui pelo sucessor
+                    result = node.values[i]
+                    node.keys[i], node.values[i] = self._pop_min(right)
+                    break
+                # Os dois filhos estão no mínimo: funde e continua no nó fundido
+                self._merge_children(node, i)
+                if i < len(node.keys):
+                    hi = node.keys[i]
+                node = left
+                stack.append((node, hi))
+                continue
+
+            # Caso 3: chave está abaixo; garante um filho com folga antes de descer
+            i = self._ensure_child(node, i)
+            if i < len(node.keys):
+                hi = node.keys[i]
+            node = node.children[i]
+            stack.append((node, hi))
+
+        # Uma fusão na raiz pode deixá-la sem chaves: a altura diminui
+        if not self.root.keys and self.root.children:
+            self.root = self.root.children[0]
+            stack[:] = [(self.root, None)]
+        if result is not _MISSING:
+            self._len -= 1
+        return result
+
+    def _pop_min(self, node):
+        while node.children:
+            node = node.children[self._ensure_child(node, 0)]
+        return node.keys.pop(0), node.values.pop(0)
 
-            # Após split, decidir qual dos dois filhos seguir
-            if key > node.keys[child_index]:
-                child_index += 1
+    def _pop_max(self, node):
+        while node.children:
+            node = node.children[self._ensure_child(node, len(node.keys))]
+        return node.keys.pop(), node.values.pop()
 
-        self._insert_non_full(node.children[child_index], key)
+    def _ensure_child(self, node, i):
+        # Garante que node.children[i] tenha folga; devolve o índice do filho
+        # a seguir (muda se a fusão for com o irmão da esquerda)
+        t = self._t
+        if len(node.children[i].keys) >= t:
+            return i
+        if i > 0 and len(node.children[i - 1].keys) >= t:
+            self._borrow_from_left(node, i)
+            return i
+        if i < len(node.keys) and len(node.children[i + 1].keys) >= t:
+            self._borrow_from_right(node, i)
+            return i
+        if i < len(node.keys):
+            self._merge_children(node, i)
+            return i
+        self._merge_children(node, i - 1)
+        return i - 1
+
+    def _borrow_from_left(self, parent, index):
+        # Rotação: separadora desce para o filho, última chave do irmão sobe
+        child = parent.children[index]
+        sibling = parent.children[index - 1]
+        child.keys.insert(0, parent.keys[index - 1])
+        child.values.insert(0, parent.values[index - 1])
+        parent.keys[index - 1] = sibling.keys.pop()
+        parent.values[index - 1] = sibling.values.pop()
+        if sibling.children:
+            child.children.insert(0, sibling.children.pop())
+
+    def _borrow_from_right(self, parent, index):
+        child = parent.children[index]
+        sibling = parent.children[index + 1]
+        child.keys.append(parent.keys[index])
+        child.values.append(parent.values[index])
+        parent.keys[index] = sibling.keys.pop(0)
+        parent.values[index] = sibling.values.pop(0)
+        if sibling.children:
+            child.children.append(sibling.children.pop(0))
+
+    def _merge_children(self, parent, index):
+        # Junta filho[index], a separadora e filho[index + 1] em um só nó
+        left = parent.children[index]
+        right = parent.children.pop(index + 1)
+        left.keys.append(parent.keys.pop(index))
+        left.values.append(parent.values.pop(index))
+        left.keys.extend(right.keys)
+        left.values.extend(right.values)
+        left.children.extend(right.children)
 
     # -------------------------
     # Busca
     # -------------------------
     def search(self, node, key):
+        # Busca iterativa com busca binária dentro de cada nó
+        while node is not None:
+            i = bisect_left(node.keys, key)
+            if i < len(node.keys) and node.keys[i] == key:
+                return True
+            if not node.children:
+                return False
+            node = node.children[i]
+        return False
+
+    def _find(self, key):
+        # Devolve (nó, índice) da chave, ou (None, -1) se não existir
+        node = self.root
+        while True:
+            i = bisect_left(node.keys, key)
+            if i < len(node.keys) and node.keys[i] == key:
+                return node, i
+            if not node.children:
+                return None, -1
+            node = node.children[i]
+
+    # -------------------------
+    # Mínimo, máximo e vizinhos (uma descida, O(log n))
+    # -------------------------
+    def min(self):
+        if not self._len:
+            raise ValueError("árvore vazia")
+        node = self.root
+        while node.children:
+            node = node.children[0]
+        return node.keys[0]
+
+    def max(self):
+        if not self._len:
+            raise ValueError("árvore vazia")
+        node = self.root
+        while node.children:
+            node = node.children[-1]
+        return node.keys[-1]
+
+    def floor(self, key):
+        """Maior chave <= key, ou None."""
+        best = None
+        node = self.root
+        while True:
+            i = bisect_right(node.keys, key)
+            if i > 0:
+                best = node.keys[i - 1]
+                if best == key:
+                    return best
+            if not node.children:
+                return best
+            node = node.children[i]
+
+    def ceiling(self, key):
+        """Menor chave >= key, ou None."""
+        best = None
+        node = self.root
+        while True:
+            i = bisect_left(node.keys, key)
+            if i < len(node.keys):
+                best = node.keys[i]
+                if best == key:
+                    return best
+            if not node.children:
+                return best
+            node = node.children[i]
+
+    def predecessor(self, key):
+        """Maior chave < key, ou None."""
+        best = None
+        node = self.root
+        while True:
+            i = bisect_left(node.keys, key)
+            if i > 0:
+                best = node.keys[i - 1]
+            if not node.children:
+                return best
+            node = node.children[i]
+
+    def successor(self, key):
+        """Menor chave > key, ou None."""
+        best = None
+        node = self.root
+        while True:
+            i = bisect_right(node.keys, key)
+            if i < len(node.keys):
+                best = node.keys[i]
+            if not node.children:
+                return best
+            node = node.children[i]
+
+    # -------------------------
+    # Iteração preguiçosa
+    # -------------------------
+    # A pilha guarda pares (nó, i). Em ordem crescente, i é a próxima chave
+    # a emitir (o filho i já foi visitado); em ordem decrescente, idem mas o
+    # filho i + 1 é que já foi visitado. Os geradores emitem posições (nó, i).
+    def _push_left(self, stack, node):
+        while node.children:
+            stack.append((node, 0))
+            node = node.children[0]
+        stack.append((node, 0))
+
+    def _push_right(self, stack, node):
+        while node.children:
+            stack.append((node, len(node.keys) - 1))
+            node = node.children[-1]
+        stack.append((node, len(node.keys) - 1))
+
+    def _walk_forward(self, stack):
+        while stack:
+            node, i = stack.pop()
+            if not node.children:
+                for j in range(i, len(node.keys)):
+                    yield node, j
+            elif i < len(node.keys):
+                yield node, i
+                stack.append((node, i + 1))
+                self._push_left(stack, node.children[i + 1])
+
+    def _walk_backward(self, stack):
+        while stack:
+            node, i = stack.pop()
+            if not node.children:
+                for j in range(i, -1, -1):
+                    yield node, j
+            elif i >= 0:
+                yield node, i
+                stack.append((node, i - 1))
+                self._push_right(stack, node.children[i])
+
+    def _positions(self, reverse=False):
+        stack = []
+        if reverse:
+            self._push_right(stack, self.root)
+            return self._walk_backward(stack)
+        self._push_left(stack, self.root)
+        return self._walk_forward(stack)
+
+    def __iter__(self):
+        return (node.keys[i] for node, i in self._positions())
+
+    def __reversed__(self):
+        return (node.keys[i] for node, i in self._positions(reverse=True))
+
+    def keys(self, reverse=False):
+        return reversed(self) if reverse else iter(self)
+
+    def values(self, reverse=False):
+        return (node.values[i] for node, i in self._positions(reverse))
+
+    def items(self, reverse=False):
+        return ((node.keys[i], node.values[i]) for node, i in self._positions(reverse))
+
+    def _positions_from(self, key, reverse=False):
+        stack = []
+        node = self.root
+        while True:
+            if reverse:
+                i = bisect_right(node.keys, key) - 1
+                stack.append((node, i))
+                if i >= 0 and node.keys[i] == key or not node.children:
+                    break
+                node = node.children[i + 1]
+            else:
+                i = bisect_left(node.keys, key)
+                stack.append((node, i))
+                if i < len(node.keys) and node.keys[i] == key or not node.children:
+                    break
+                node = node.children[i]
+        if reverse:
+            return self._walk_backward(stack)
+        return self._walk_forward(stack)
+
+    def iter_from(self, key, reverse=False):
+        """Itera as chaves a partir da primeira >= key (ou <= key se reverse)."""
+        return (node.keys[i] for node, i in self._positions_from(key, reverse))
+
+    def items_from(self, key, reverse=False):
+        return ((node.keys[i], node.values[i]) for node, i in self._positions_from(key, reverse))
+
+    # -------------------------
+    # Interface de mapa ordenado
+    # -------------------------
+    def __len__(self):
+        return self._len
+
+    def __contains__(self, key):
+        return self._find(key)[0] is not None
+
+    def __getitem__(self, key):
+        node, i = self._find(key)
         if node is None:
-            return False
+            raise KeyError(key)
+        return node.values[i]
 
-        # Verifica chaves no nó atual
-        for i, k in enumerate(node.keys):
-            if key == k:
-                return True
-            if key < k:
-                return self.search(node.children[i], key)
+    def __setitem__(self, key, value):
+        self.insert(key, value)
+
+    def __delitem__(self, key):
+        if self._delete(key) is _MISSING:
+            raise KeyError(key)
+
+    def get(self, key, default=None):
+        node, i = self._find(key)
+        if node is None:
+            return default
+        return node.values[i]
+
+    def setdefault(self, key, default=None):
+        node, i = self._find(key)
+        if node is not None:
+            return node.values[i]
+        self.insert(key, default)
+        return default
 
-        return self.search(node.children[-1] if node.children else None, key)
+    def pop(self, key, default=_MISSING):
+        value = self._delete(key)
+        if value is _MISSING:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        return value
+
+    # -------------------------
+    # Operações em lote
+    # -------------------------
+    # Cada lote é ordenado uma vez. Lotes grandes em relação à árvore são
+    # executados como intercalação ordenada + reconstrução em O(n + m). Nos
+    # demais, a descida guarda a pilha do caminho e a chave seguinte só
+    # desempilha os nós cujo intervalo ela ultrapassou (prefixo comum). Na
+    # inserção e na remoção também saem da pilha os nós sem folga (cheios,
+    # ou no mínimo de chaves), porque o split ou a fusão que eles pedem
+    # mexe no pai: a descida recomeça do primeiro ancestral com folga.
+    def _prefers_rebuild(self, m):
+        return 4 * m >= self._len
+
+    def insert_many(self, keys, values=None):
+        """Insere um lote de chaves (e valores); devolve quantas eram novas."""
+        keys, values = _sorted_unique(keys, values)
+        if not keys:
+            return 0
+        if self._prefers_rebuild(len(keys)):
+            old_keys, old_values = [], []
+            for node, i in self._positions():
+                old_keys.append(node.keys[i])
+                old_values.append(node.values[i])
+            merged_keys, merged_values, added = _merge_sorted(old_keys, old_values, keys, values)
+            self._load_sorted(merged_keys, merged_values)
+            return added
+        stack = [(self.root, None)]
+        added = sum(self._insert_from(stack, key, value) for key, value in zip(keys, values))
+        self._len += added
+        return added
+
+    def delete_many(self, keys):
+        """Remove um lote de chaves; devolve quantas existiam."""
+        keys = _sorted_unique(keys)[0]
+        if not keys or not self._len:
+            return 0
+        if self._prefers_rebuild(len(keys)):
+            old_keys, old_values = [], []
+            for node, i in self._positions():
+                old_keys.append(node.keys[i])
+                old_values.append(node.values[i])
+            kept_keys, kept_values, removed = _subtract_sorted(old_keys, old_values, keys)
+            self._load_sorted(kept_keys, kept_values)
+            return removed
+        stack = [(self.root, None)]
+        return sum(self._delete(key, stack) is not _MISSING for key in keys)
+
+    def get_many(self, keys, default=None):
+        """Devolve os valores do lote, na ordem original (default para as ausentes).
+
+        As chaves são visitadas em ordem crescente; a pilha guarda o caminho
+        da descida anterior e só desempilha os nós cujo intervalo ficou para
+        trás, em vez de recomeçar da raiz.
+        """
+        keys = list(keys)
+        result = [default] * len(keys)
+        # Pilha de (nó, limite superior exclusivo da subárvore; None = infinito)
+        stack = [(self.root, None)]
+        for i in sorted(range(len(keys)), key=keys.__getitem__):
+            key = keys[i]
+            while stack[-1][1] is not None and not key < stack[-1][1]:
+                stack.pop()
+            node, hi = stack[-1]
+            while True:
+                j = bisect_left(node.keys, key)
+                if j < len(node.keys) and node.keys[j] == key:
+                    result[i] = node.values[j]
+                    break
+                if not node.children:
+                    break
+                if j < len(node.keys):
+                    hi = node.keys[j]
+                node = node.children[j]
+                stack.append((node, hi))
+        return result
+
+    def contains_many(self, keys):
+        """Devolve uma máscara de booleanos, na ordem do lote, indicando quais chaves existem."""
+        return [value is not _MISSING for value in self.get_many(keys, _MISSING)]
+
+    # -------------------------
+    # Cursor
+    # -------------------------
+    def cursor(self, key=None):
+        """Cursor na primeira chave (ou na primeira >= key); ver BTreeCursor."""
+        cur = BTreeCursor(self)
+        if key is None:
+            cur.first()
+        else:
+            cur.seek(key)
+        return cur
+
+    # -------------------------
+    # Verificação de invariantes
+    # -------------------------
+    def validate(self):
+        """Confere as propriedades da árvore B em O(n) e devolve a altura.
+
+        Verifica as chaves em ordem estrita dentro dos nós e entre nós
+        (pelos limites das separadoras), um valor por chave, len(keys) + 1
+        filhos nos nós internos, entre t - 1 e 2t - 1 chaves fora da raiz,
+        todas as folhas no mesmo nível e o total de chaves igual a len(self).
+        A primeira violação levanta AssertionError (também com python -O).
+        """
+        t, max_keys = self._t, self._max_keys
+        root = self.root
+        if not root.keys and (root.children or self._len):
+            raise AssertionError("raiz vazia com filhos ou com len > 0")
+        leaf_depths = set()
+        total = 0
+        # Pilha de (nó, profundidade, limite inferior, limite superior); None = aberto
+        stack = [(root, 0, None, None)]
+        while stack:
+            node, depth, lo, hi = stack.pop()
+            keys = node.keys
+            total += len(keys)
+            if len(node.values) != len(keys):
+                raise AssertionError(f"{len(node.values)} valores para as chaves {keys!r}")
+            if len(keys) > max_keys or (node is not root and len(keys) < t - 1):
+                raise AssertionError(f"nó {keys!r} com {len(keys)} chaves (ordem {self.order})")
+            for a, b in zip(keys, keys[1:]):
+                if not a < b:
+                    raise AssertionError(f"chaves fora de ordem no nó {keys!r}")
+            if keys and ((lo is not None and not lo < keys[0]) or (hi is not None and not keys[-1] < hi)):
+                raise AssertionError(f"nó {keys!r} fora do intervalo ({lo!r}, {hi!r})")
+            if not node.children:
+                leaf_depths.add(depth)
+                continue
+            if len(node.children) != len(keys) + 1:
+                raise AssertionError(f"nó {keys!r} com {len(node.children)} filhos")
+            bounds = [lo] + keys + [hi]
+            for i, child in enumerate(node.children):
+                stack.append((child, depth + 1, bounds[i], bounds[i + 1]))
+        if len(leaf_depths) != 1:
+            raise AssertionError(f"folhas em profundidades diferentes: {sorted(leaf_depths)}")
+        if total != self._len:
+            raise AssertionError(f"{total} chaves nos nós, mas len = {self._len}")
+        return leaf_depths.pop() + 1
+
+    # -------------------------
+    # Estatísticas (opcionais)
+    # -------------------------
+    def enable_stats(self, log=False):
+        """Liga os contadores de comparações, profundidade, splits, fusões e empréstimos.
+
+        Devolve o TreeStats que acumula os totais e histogramas (ver
+        comum/estatisticas.py). Com log=True, guarda também um registro por
+        operação.
+        """
+        base = getattr(type(self), "_base_class", type(self))
+        self.stats = TreeStats(log=log)
+        self.__class__ = instrumented_class(base, _BTreeStatsHooks)
+        return self.stats
+
+    def disable_stats(self):
+        """Desliga os contadores; a árvore volta a rodar o código sem instrumentação."""
+        self.__class__ = getattr(type(self), "_base_class", type(self))
+        stats, self.stats = self.stats, None
+        return stats
 
     # -------------------------
     # Impressão da árvore (nivel por nivel)
@@ -102,7 +712,10 @@ class Tree234:
         queue = deque([(self.root, 0)])
         current_level = 0
 
-        print("\nÁrvore 2-3-4 (níveis):")
+        if self.order == 4:
+            print("\nÁrvore 2-3-4 (níveis):")
+        else:
+            print(f"\nÁrvore B de ordem {self.order} (níveis):")
         while queue:
             node, level = queue.popleft()
 
@@ -115,3 +728,240 @@ class Tree234:
             for child in node.children:
                 queue.append((child, level + 1))
         print("\n")
+
+
+class BTreeCursor:
+    """Posição numa BTree (ou Tree234), para acessos com localidade.
+
+    Os nós não têm ponteiro para o pai, então o cursor guarda o caminho desde
+    a raiz: cada entrada é [nó, índice, lo, hi], com (lo, hi) o intervalo de
+    chaves da subárvore daquele nó (None = aberto). Nos ancestrais o índice é
+    o do filho seguido; na última entrada, o da chave atual.
+
+    seek desempilha só os nós cujo intervalo não contém a chave e desce a
+    partir dali, como get_many. insert e delete alteram a folha no lugar
+    quando ela tem espaço (ou folga); senão usam a inserção/remoção normal,
+    que reestrutura na descida, e reposicionam o cursor a partir da raiz.
+    Alterações feitas por fora do cursor invalidam o caminho; seek
+    reposiciona.
+    """
+
+    __slots__ = ("tree", "_path")
+
+    def __init__(self, tree):
+        self.tree = tree
+        self._path = []
+
+    @property
+    def valid(self):
+        return bool(self._path)
+
+    def __bool__(self):
+        return self.valid
+
+    def _current(self):
+        if not self._path:
+            raise ValueError("cursor fora da árvore")
+        return self._path[-1]
+
+    @property
+    def key(self):
+        node, i = self._current()[:2]
+        return node.keys[i]
+
+    @property
+    def value(self):
+        node, i = self._current()[:2]
+        return node.values[i]
+
+    # -------------------------
+    # Descida e normalização do caminho
+    # -------------------------
+    def _descend_edge(self, leftmost):
+        # Desce do filho indicado pela última entrada até a folha da ponta
+        path = self._path
+        node, i, lo, hi = path[-1]
+        child = node.children[i]
+        if i:
+            lo = node.keys[i - 1]
+        if i < len(node.keys):
+            hi = node.keys[i]
+        while child.children:
+            j = 0 if leftmost else len(child.keys)
+            path.append([child, j, lo, hi])
+            if leftmost:
+                hi = child.keys[0]
+            else:
+                lo = child.keys[-1]
+            child = child.children[j]
+        path.append([child, 0 if leftmost else len(child.keys) - 1, lo, hi])
+
+    def _forward(self):
+        # Índice além do fim do nó: a posição é a chave do ancestral logo acima
+        path = self._path
+        while path and path[-1][1] == len(path[-1][0].keys):
+            path.pop()
+
+    def _seek(self, key):
+        # Posiciona em key ou na lacuna da folha onde key entraria (sem normalizar)
+        path = self._path
+        if not path:
+            path.append([self.tree.root, 0, None, None])
+        while len(path) > 1:
+            lo, hi = path[-1][2], path[-1][3]
+            if (lo is None or lo < key) and (hi is None or key < hi):
+                break
+            path.pop()
+        node, _, lo, hi = path[-1]
+        while True:
+            keys = node.keys
+            i = bisect_left(keys, key)
+            path[-1][1] = i
+            if i < len(keys) and keys[i] == key:
+                return True
+            if not node.children:
+                return False
+            if i:
+                lo = keys[i - 1]
+            if i < len(keys):
+                hi = keys[i]
+            node = node.children[i]
+            path.append([node, 0, lo, hi])
+
+    # -------------------------
+    # Movimento
+    # -------------------------
+    def first(self):
+        self._path = [[self.tree.root, 0, None, None]]
+        if self.tree.root.children:
+            self._descend_edge(leftmost=True)
+        self._forward()
+        return self.valid
+
+    def last(self):
+        root = self.tree.root
+        if root.children:
+            self._path = [[root, len(root.keys), None, None]]
+            self._descend_edge(leftmost=False)
+        else:
+            self._path = [[root, len(root.keys) - 1, None, None]] if root.keys else []
+        return self.valid
+
+    def next(self):
+        """Avança para a chave seguinte; devolve False ao passar da última."""
+        entry = self._current()
+        entry[1] += 1
+        if entry[0].children:
+            # Menor chave da subárvore logo à direita da atual
+            self._descend_edge(leftmost=True)
+        else:
+            self._forward()
+        return self.valid
+
+    def prev(self):
+        """Volta para a chave anterior; devolve False ao passar da primeira."""
+        entry = self._current()
+        if entry[0].children:
+            # Maior chave da subárvore logo à esquerda da atual
+            self._descend_edge(leftmost=False)
+            return True
+        path = self._path
+        if entry[1]:
+            entry[1] -= 1
+            return True
+        # Primeira chave da folha: a anterior é a do ancestral à esquerda
+        path.pop()
+        while path:
+            if path[-1][1]:
+                path[-1][1] -= 1
+                return True
+            path.pop()
+        return False
+
+    def seek(self, key):
+        """Vai para a primeira chave >= key; devolve True se key existe."""
+        found = self._seek(key)
+        if not found:
+            self._forward()
+        return found
+
+    # -------------------------
+    # Alterações na posição
+    # -------------------------
+    def insert(self, key, value=None):
+        """Insere (ou atualiza) key e posiciona o cursor nela; True se era nova."""
+        tree = self.tree
+        if self._seek(key):
+            node, i = self._path[-1][:2]
+            node.values[i] = value
+            return False
+        leaf, i = self._path[-1][:2]
+        if len(leaf.keys) < tree._max_keys:
+            leaf.keys.insert(i, key)
+            leaf.values.insert(i, value)
+            tree._len += 1
+            return True
+        # Folha cheia: a inserção normal divide os nós cheios na descida
+        tree.insert(key, value)
+        self._path = []
+        self._seek(key)
+        return True
+
+    def delete(self):
+        """Remove a chave atual, devolve o seu valor e avança para a seguinte."""
+        tree = self.tree
+        node, i = self._current()[:2]
+        if not node.children and (len(node.keys) >= tree._t or len(self._path) == 1):
+            # Folha com folga (ou a raiz): sai no lugar, sem rebalancear
+            node.keys.pop(i)
+            value = node.values.pop(i)
+            tree._len -= 1
+            self._forward()
+            return value
+        key = node.keys[i]
+        value = tree.pop(key)
+        self._path = []
+        self.seek(key)
+        return value
+
+
+class _BTreeStatsHooks:
+    # Ganchos da subclasse instrumentada: contam splits, fusões e empréstimos
+    # e medem a descida de cada operação
+
+    def _trace(self, key):
+        # Busca espelho de _find, com a chave embrulhada para contar comparações
+        probe = CountingKey(key)
+        node, depth = self.root, 0
+        while True:
+            depth += 1
+            i = bisect_left(node.keys, probe)
+            if i < len(node.keys) and probe == node.keys[i]:
+                break
+            if not node.children:
+                break
+            node = node.children[i]
+        return depth, probe.comparisons
+
+    def split_child(self, parent, index):
+        self.stats.count("splits")
+        super().split_child(parent, index)
+
+    def _merge_children(self, parent, index):
+        self.stats.count("merges")
+        super()._merge_children(parent, index)
+
+    def _borrow_from_left(self, parent, index):
+        self.stats.count("borrows")
+        super()._borrow_from_left(parent, index)
+
+    def _borrow_from_right(self, parent, index):
+        self.stats.count("borrows")
+        super()._borrow_from_right(parent, index)
+
+
+class Tree234(BTree):
+    """Árvore 2-3-4: a árvore B de ordem 4 (nós com 1 a 3 chaves)."""
+
+    def __init__(self):
+        super().__init__(order=4)
@@ -0,0 +1,97 @@
+import random
+import sys
+from bisect import bisect_left, bisect_right
+
+from main import BTree, Tree234
+
+
+def conferir(tree, oraculo, q):
+    """Compara todas as consultas de vizinhança com a lista ordenada."""
+    i = bisect_left(oraculo, q)
+    j = bisect_right(oraculo, q)
+    esperado = {
+        "floor": oraculo[j - 1] if j > 0 else None,
+        "ceiling": oraculo[i] if i < len(oraculo) else None,
+        "predecessor": oraculo[i - 1] if i > 0 else None,
+        "successor": oraculo[j] if j < len(oraculo) else None,
+    }
+    for nome, valor in esperado.items():
+        obtido = getattr(tree, nome)(q)
+        assert obtido == valor, f"{nome}({q}) = {obtido}, esperado {valor}"
+
+
+seed = int(sys.argv[1]) if len(sys.argv) > 1 else 2024
+operacoes = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+rng = random.Random(seed)
+
+tree = Tree234()
+oraculo = []
+contagem = {"insert": 0, "delete": 0, "consulta": 0}
+
+print(f"Fuzz da árvore 2-3-4: seed={seed}, {operacoes} operações")
+for passo in range(operacoes):
+    chave = rng.randrange(operacoes // 10 + 1)
+    sorteio = rng.random()
+
+    if sorteio < 0.45:
+        i = bisect_left(oraculo, chave)
+        if i == len(oraculo) or oraculo[i] != chave:
+            oraculo.insert(i, chave)
+        tree.insert(chave, passo)
+        contagem["insert"] += 1
+    elif sorteio < 0.85:
+        existia = tree.pop(chave, None) is not None
+        i = bisect_left(oraculo, chave)
+        esperado = i < len(oraculo) and oraculo[i] == chave
+        assert existia == esperado, f"pop({chave}) divergiu do oráculo"
+        if esperado:
+            oraculo.pop(i)
+        contagem["delete"] += 1
+    else:
+        conferir(tree, oraculo, chave)
+        contagem["consulta"] += 1
+
+    assert len(tree) == len(oraculo)
+    if passo % 500 == 0:
+        assert list(tree) == oraculo, f"iteração divergiu no passo {passo}"
+        # Folhas no mesmo nível, chaves em ordem, contagem de chaves e filhos
+        tree.validate()
+        if oraculo:
+            assert tree.min() == oraculo[0] and tree.max() == oraculo[-1]
+
+assert list(tree) == oraculo
+tree.validate()
+print(f"Inserções: {contagem['insert']}, remoções: {contagem['delete']}, consultas: {contagem['consulta']}")
+print(f"Tamanho final: {len(tree)} chaves")
+
+# Lotes pequenos (abaixo do limite de reconstrução): insert_many e
+# delete_many reaproveitam o caminho entre chaves, inclusive quando um
+# split ou uma fusão mexe nos nós da pilha. Lotes em faixa estreita
+# concentram splits e fusões nos mesmos nós.
+lotes = 0
+for ordem in (4, 6, 32):
+    tree = BTree(order=ordem)
+    esperado = {}
+    for rodada in range(operacoes // 200):
+        if len(esperado) < 40:
+            novos = {k: rodada for k in rng.sample(range(operacoes), 40)}
+            tree.insert_many(list(novos), list(novos.values()))
+            esperado.update(novos)
+        inicio = rng.randrange(operacoes)
+        largura = rng.choice((20, 200, operacoes))
+        m = max(1, len(esperado) // 5)
+        lote = [rng.randrange(inicio, inicio + largura) for _ in range(m)]
+        if rng.random() < 0.5:
+            novas = len(set(lote) - set(esperado))
+            assert tree.insert_many(lote, lote) == novas, f"insert_many (ordem {ordem})"
+            esperado.update(zip(lote, lote))
+        else:
+            existentes = len(set(lote) & set(esperado))
+            assert tree.delete_many(lote) == existentes, f"delete_many (ordem {ordem})"
+            for chave in lote:
+                esperado.pop(chave, None)
+        tree.validate()
+        assert list(tree.items()) == sorted(esperado.items()), f"lote divergiu (ordem {ordem})"
+        lotes += 1
+print(f"Lotes pequenos conferidos: {lotes}")
+print("✅ Árvore 2-3-4 concorda com a lista ordenada em todas as operações")
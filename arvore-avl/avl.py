@@ -0,0 +1,181 @@
+import os
+import sys
+
+# Módulos compartilhados pelas árvores ficam em ../comum
+_COMUM = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "comum")
+if _COMUM not in sys.path:
+    sys.path.append(_COMUM)
+
+from arvore_binaria import BinarySearchTree
+from arvore_ordenada import _MISSING
+
+
+class AVLNode:
+    __slots__ = ("key", "value", "left", "right", "height")
+
+    def __init__(self, key, value=None):
+        self.key = key
+        self.value = value
+        self.left = None
+        self.right = None
+        # Altura da subárvore com raiz aqui; folha = 1, filho ausente = 0
+        self.height = 1
+
+
+class AVLTree(BinarySearchTree):
+    """Árvore AVL: as alturas dos dois filhos de cada nó diferem no máximo em 1.
+
+    O critério é mais rígido que o rubro-negro: a altura fica abaixo de
+    1,44 log2(n) (contra 2 log2(n)) e as buscas descem menos, mas as
+    alterações giram mais. insert e pop guardam o caminho numa pilha e
+    sobem recalculando alturas, e param no primeiro nó cuja altura não
+    mudou (acima dele nada muda).
+    """
+
+    def rotate_left(self, x):
+        y = x.right
+        x.right = y.left
+        y.left = x
+        x.height = _height_of(x)
+        y.height = _height_of(y)
+        return y
+
+    def rotate_right(self, y):
+        x = y.left
+        y.left = x.right
+        x.right = y
+        y.height = _height_of(y)
+        x.height = _height_of(x)
+        return x
+
+    def _rebalance(self, node):
+        # Recalcula a altura de node e gira se o desnível passou de 1;
+        # devolve a raiz da subárvore, que pode ter mudado
+        left, right = node.left, node.right
+        hl = left.height if left is not None else 0
+        hr = right.height if right is not None else 0
+        if hl > hr + 1:
+            # Caso esquerda-direita: a rotação dupla começa pelo filho
+            if _h(left.left) < _h(left.right):
+                node.left = self.rotate_left(left)
+            return self.rotate_right(node)
+        if hr > hl + 1:
+            if _h(right.right) < _h(right.left):
+                node.right = self.rotate_right(right)
+            return self.rotate_left(node)
+        node.height = (hl if hl > hr else hr) + 1
+        return node
+
+    def _retrace(self, path):
+        # Sobe pelo caminho rebalanceando; a subárvore de cada nó do caminho
+        # mudou (ganhou ou perdeu um nó) logo abaixo
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            old_height = node.height
+            top = self._rebalance(node)
+            if top is not node:
+                if i == 0:
+                    self.root = top
+                elif path[i - 1].left is node:
+                    path[i - 1].left = top
+                else:
+                    path[i - 1].right = top
+            if top.height == old_height:
+                return
+
+    def insert(self, key, value=None):
+        path = []
+        node = self.root
+        while node is not None:
+            if key < node.key:
+                path.append(node)
+                node = node.left
+            elif node.key < key:
+                path.append(node)
+                node = node.right
+            else:
+                # Chave já existe: substitui o valor no próprio nó
+                node.value = value
+                return False
+
+        self._len += 1
+        new = AVLNode(key, value)
+        if not path:
+            self.root = new
+            return True
+        parent = path[-1]
+        if key < parent.key:
+            parent.left = new
+        else:
+            parent.right = new
+        self._retrace(path)
+        return True
+
+    def _pop(self, key):
+        # Remove key e devolve o seu valor, ou _MISSING se não existir
+        path = []
+        node = self.root
+        while node is not None and key != node.key:
+            path.append(node)
+            node = node.left if key < node.key else node.right
+        if node is None:
+            return _MISSING
+        value = node.value
+
+        if node.left is not None and node.right is not None:
+            # Dois filhos: o sucessor (sem filho esquerdo) cede chave e valor
+            # e é ele que sai da árvore
+            path.append(node)
+            successor = node.right
+            while successor.left is not None:
+                path.append(successor)
+                successor = successor.left
+            node.key, node.value = successor.key, successor.value
+            node = successor
+
+        child = node.left if node.left is not None else node.right
+        if not path:
+            self.root = child
+        elif path[-1].left is node:
+            path[-1].left = child
+        else:
+            path[-1].right = child
+        self._len -= 1
+        self._retrace(path)
+        return value
+
+    def _load_sorted(self, keys, values):
+        # Substitui todo o conteúdo; árvore perfeitamente balanceada em O(n)
+        def build(lo, hi):
+            if lo >= hi:
+                return None
+            mid = (lo + hi) // 2
+            node = AVLNode(keys[mid], values[mid])
+            node.left = build(lo, mid)
+            node.right = build(mid + 1, hi)
+            node.height = _height_of(node)
+            return node
+
+        self.root = build(0, len(keys))
+        self._len = len(keys)
+
+    def _check_node(self, node, left, right):
+        # Devolve a altura da subárvore
+        if node is None:
+            return 0
+        if abs(left - right) > 1:
+            raise AssertionError(f"alturas {left} e {right} nos filhos do nó {node.key!r}")
+        height = max(left, right) + 1
+        if node.height != height:
+            raise AssertionError(f"height {node.height} no nó {node.key!r}, esperado {height}")
+        return height
+
+
+def _h(node):
+    return node.height if node is not None else 0
+
+
+def _height_of(node):
+    # Altura a partir das alturas (já corretas) dos filhos
+    hl, hr = _h(node.left), _h(node.right)
+    return (hl if hl > hr else hr) + 1
@@ -1,156 +1,493 @@
+import os
+import sys
+
+# Módulos compartilhados pelas duas árvores ficam em ../comum
+_COMUM = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "comum")
+if _COMUM not in sys.path:
+    sys.path.append(_COMUM)
+
+from arvore_ordenada import SortedTree, _MISSING, _merge_sorted, _sorted_unique, _subtract_sorted
+from estatisticas import CountingKey, TreeStats, instrumented_class
+
+# Cores como inteiros: comparar ints pequenos é mais barato que comparar strings
+RED = 1
+BLACK = 0
+COLOR_NAMES = {RED: "RED", BLACK: "BLACK"}
+
+
 class Node:
-    def __init__(self, key, color="RED"):
+    # __slots__ elimina o __dict__ de cada nó (ver README, seção Desempenho)
+    __slots__ = ("key", "value", "color", "left", "right", "parent", "size")
+
+    def __init__(self, key, color=RED, value=None):
         self.key = key
+        self.value = value
         self.color = color
         self.left = None
         self.right = None
         self.parent = None
+        # Quantidade de nós na subárvore (aumento para estatísticas de ordem)
+        self.size = 1
+
+
+# Folha sentinela única, compartilhada por todas as árvores: como nenhuma
+# operação escreve nela, join e split podem pendurar as subárvores de uma
+# árvore na outra sem reapontar as folhas
+NULL = Node(None, color=BLACK)
+NULL.size = 0
+
+
+def _detach(node):
+    # Solta a subárvore como árvore avulsa: sem pai e com a raiz preta
+    if node is not NULL:
+        node.parent = None
+        node.color = BLACK
+    return node
+
+
+def _black_height(node):
+    # Nós pretos no caminho até a folha pela borda esquerda (NULL não conta)
+    height = 0
+    while node is not NULL:
+        if node.color == BLACK:
+            height += 1
+        node = node.left
+    return height
+
+
+class RedBlackTree(SortedTree):
+    # Preenchido por enable_stats; None enquanto as estatísticas estão desligadas
+    stats = None
+    # Classe dos nós criados pela árvore; variantes aumentadas trocam por
+    # uma subclasse de Node com campos extras
+    node_class = Node
+    # Trocas de cor feitas por fix_insert/fix_delete desde a criação; a
+    # contagem sai dos próprios casos (constantes somadas num inteiro
+    # local), e os ganchos de estatísticas leem a diferença
+    _recolors = 0
 
-class RedBlackTree:
     def __init__(self):
-        self.NULL = Node(None, color="BLACK")
-        self.root = self.NULL
+        self.NULL = NULL
+        self.root = NULL
+
+    @classmethod
+    def from_sorted(cls, keys, values=None):
+        """Constrói a árvore em O(n) a partir de chaves ordenadas, sem rotações.
+
+        Entrada fora de ordem é ordenada antes (O(n log n)). Os nós formam uma
+        árvore perfeitamente balanceada; só o último nível, se incompleto, é
+        vermelho, o que mantém a mesma altura negra em todos os caminhos.
+        """
+        tree = cls()
+        tree._load_sorted(*_sorted_unique(keys, values))
+        return tree
+
+    def _load_sorted(self, keys, values):
+        # Substitui todo o conteúdo da árvore; keys já ordenada e sem repetições
+        NULL = self.NULL
+        node_class = self.node_class
+        # Profundidade a partir da qual os nós estão no último nível incompleto
+        full_depth = (len(keys) + 1).bit_length() - 1
+
+        def build(lo, hi, depth, parent):
+            if lo >= hi:
+                return NULL
+            mid = (lo + hi) // 2
+            node = node_class(keys[mid], BLACK if depth < full_depth else RED, values[mid])
+            node.parent = parent
+            node.left = build(lo, mid, depth + 1, node)
+            node.right = build(mid + 1, hi, depth + 1, node)
+            node.size = hi - lo
+            return node
+
+        self.root = build(0, len(keys), 0, None)
 
     def rotate_left(self, x):
         y = x.right
         x.right = y.left
-        if y.left != self.NULL:
+        if y.left is not self.NULL:
             y.left.parent = x
         y.parent = x.parent
-        if x.parent == None:
+        if x.parent is None:
             self.root = y
-        elif x == x.parent.left:
+        elif x is x.parent.left:
             x.parent.left = y
         else:
             x.parent.right = y
         y.left = x
         x.parent = y
+        y.size = x.size
+        x.size = x.left.size + x.right.size + 1
 
     def rotate_right(self, y):
         x = y.left
         y.left = x.right
-        if x.right != self.NULL:
+        if x.right is not self.NULL:
             x.right.parent = y
         x.parent = y.parent
-        if y.parent == None:
+        if y.parent is None:
             self.root = x
-        elif y == y.parent.right:
+        elif y is y.parent.right:
             y.parent.right = x
         else:
             y.parent.left = x
         x.right = y
         y.parent = x
+        x.size = y.size
+        y.size = y.left.size + y.right.size + 1
 
-    def insert(self, key):
-        node = Node(key)
-        node.left = self.NULL
-        node.right = self.NULL
-        node.parent = None
-
+    def insert(self, key, value=None):
         y = None
         x = self.root
 
-        while x != self.NULL:
+        # Os tamanhos são incrementados já na descida
+        while x is not self.NULL:
             y = x
-            if node.key < x.key:
+            if key < x.key:
+                x.size += 1
                 x = x.left
-            else:
+            elif x.key < key:
+                x.size += 1
                 x = x.right
+            else:
+                # Chave já existe: substitui o valor no próprio nó
+                # e desfaz os incrementos feitos nos ancestrais
+                x.value = value
+                p = x.parent
+                while p is not None:
+                    p.size -= 1
+                    p = p.parent
+                return False
 
+        node = self.node_class(key, value=value)
+        node.left = self.NULL
+        node.right = self.NULL
         node.parent = y
-        if y == None:
+        if y is None:
             self.root = node
         elif node.key < y.key:
             y.left = node
         else:
             y.right = node
 
-        node.color = "RED"
+        node.color = RED
         self.fix_insert(node)
+        return True
 
     def fix_insert(self, k):
-        while k.parent and k.parent.color == "RED":
-            if k.parent == k.parent.parent.left:
+        # Em cada caso, toda escrita de cor troca a cor do nó: o pai e o tio
+        # são vermelhos e o avô, preto
+        recolors = 0
+        while k.parent is not None and k.parent.color == RED:
+            if k.parent is k.parent.parent.left:
                 u = k.parent.parent.right
-                if u.color == "RED":
-                    k.parent.color = "BLACK"
-                    u.color = "BLACK"
-                    k.parent.parent.color = "RED"
+                if u.color == RED:
+                    k.parent.color = BLACK
+                    u.color = BLACK
+                    k.parent.parent.color = RED
+                    recolors += 3
                     k = k.parent.parent
                 else:
-                    if k == k.parent.right:
+                    if k is k.parent.right:
                         k = k.parent
                         self.rotate_left(k)
-                    k.parent.color = "BLACK"
-                    k.parent.parent.color = "RED"
+                    k.parent.color = BLACK
+                    k.parent.parent.color = RED
+                    recolors += 2
                     self.rotate_right(k.parent.parent)
             else:
                 u = k.parent.parent.left
-                if u.color == "RED":
-                    k.parent.color = "BLACK"
-                    u.color = "BLACK"
-                    k.parent.parent.color = "RED"
+                if u.color == RED:
+                    k.parent.color = BLACK
+                    u.color = BLACK
+                    k.parent.parent.color = RED
+                    recolors += 3
                     k = k.parent.parent
                 else:
-                    if k == k.parent.left:
+                    if k is k.parent.left:
                         k = k.parent
                         self.rotate_right(k)
-                    k.parent.color = "BLACK"
-                    k.parent.parent.color = "RED"
+                    k.parent.color = BLACK
+                    k.parent.parent.color = RED
+                    recolors += 2
                     self.rotate_left(k.parent.parent)
-        self.root.color = "BLACK"
+        # Raiz vermelha aqui só acontece quando o caso 1 chegou até ela: ao
+        # voltar a preto, a altura negra da árvore cresce (usado pelo join)
+        grew = self.root.color == RED
+        self.root.color = BLACK
+        self._recolors += recolors + grew
+        return grew
 
     def search(self, node, key):
-        if node == self.NULL or key == node.key:
-            return node
-        if key < node.key:
-            return self.search(node.left, key)
-        else:
-            return self.search(node.right, key)
- 
+        # Busca iterativa: nenhum frame Python extra por nível
+        NULL = self.NULL
+        while node is not NULL and key != node.key:
+            if key < node.key:
+                node = node.left
+            else:
+                node = node.right
+        return node
+
     def inorder(self, node):
-        if node != self.NULL:
-            self.inorder(node.left)
-            print(f"{node.key}({node.color})", end=" ")
-            self.inorder(node.right)
+        # Pilha explícita em vez de recursão
+        stack = []
+        while stack or node is not self.NULL:
+            if node is not self.NULL:
+                stack.append(node)
+                node = node.left
+            else:
+                node = stack.pop()
+                print(f"{node.key}({COLOR_NAMES[node.color]})", end=" ")
+                node = node.right
 
     def minimum(self, node):
-        while node.left != self.NULL:
+        while node.left is not self.NULL:
             node = node.left
         return node
 
+    def maximum(self, node):
+        while node.right is not self.NULL:
+            node = node.right
+        return node
+
+    def successor(self, node):
+        if node.right is not self.NULL:
+            return self.minimum(node.right)
+        parent = node.parent
+        while parent is not None and node is parent.right:
+            node = parent
+            parent = parent.parent
+        return parent if parent is not None else self.NULL
+
+    def predecessor(self, node):
+        if node.left is not self.NULL:
+            return self.maximum(node.left)
+        parent = node.parent
+        while parent is not None and node is parent.left:
+            node = parent
+            parent = parent.parent
+        return parent if parent is not None else self.NULL
+
+    def min(self):
+        """Menor chave da árvore, em O(log n)."""
+        if self.root is self.NULL:
+            raise ValueError("árvore vazia")
+        return self.minimum(self.root).key
+
+    def max(self):
+        """Maior chave da árvore, em O(log n)."""
+        if self.root is self.NULL:
+            raise ValueError("árvore vazia")
+        return self.maximum(self.root).key
+
+    # -------------------------
+    # Iteração preguiçosa
+    # -------------------------
+    def _walk(self, node, reverse=False):
+        # Gera os nós em ordem a partir de `node` seguindo os ponteiros de pai,
+        # com memória O(1); a árvore não deve ser alterada durante a iteração
+        NULL = self.NULL
+        if not reverse:
+            while node is not NULL:
+                yield node
+                if node.right is not NULL:
+                    node = node.right
+                    while node.left is not NULL:
+                        node = node.left
+                else:
+                    parent = node.parent
+                    while parent is not None and node is parent.right:
+                        node = parent
+                        parent = parent.parent
+                    node = parent if parent is not None else NULL
+        else:
+            while node is not NULL:
+                yield node
+                if node.left is not NULL:
+                    node = node.left
+                    while node.right is not NULL:
+                        node = node.right
+                else:
+                    parent = node.parent
+                    while parent is not None and node is parent.left:
+                        node = parent
+                        parent = parent.parent
+                    node = parent if parent is not None else NULL
+
+    def _lower_bound(self, key):
+        # Primeiro nó com chave >= key (ou NULL)
+        node = self.root
+        best = self.NULL
+        while node is not self.NULL:
+            if node.key < key:
+                node = node.right
+            else:
+                best = node
+                node = node.left
+        return best
+
+    def _floor_node(self, key):
+        # Último nó com chave <= key (ou NULL)
+        node = self.root
+        best = self.NULL
+        while node is not self.NULL:
+            if key < node.key:
+                node = node.left
+            else:
+                best = node
+                node = node.right
+        return best
+
+    def _nodes(self, reverse=False):
+        if self.root is self.NULL:
+            return iter(())
+        if reverse:
+            return self._walk(self.maximum(self.root), reverse=True)
+        return self._walk(self.minimum(self.root))
+
+    def __iter__(self):
+        return (node.key for node in self._nodes())
+
+    def __reversed__(self):
+        return (node.key for node in self._nodes(reverse=True))
+
+    def keys(self, reverse=False):
+        return reversed(self) if reverse else iter(self)
+
+    def values(self, reverse=False):
+        return (node.value for node in self._nodes(reverse))
+
+    def items(self, reverse=False):
+        return ((node.key, node.value) for node in self._nodes(reverse))
+
+    def _nodes_from(self, key, reverse=False):
+        start = self._floor_node(key) if reverse else self._lower_bound(key)
+        return self._walk(start, reverse)
+
+    def iter_from(self, key, reverse=False):
+        """Itera as chaves a partir da primeira >= key (ou <= key se reverse)."""
+        return (node.key for node in self._nodes_from(key, reverse))
+
+    def items_from(self, key, reverse=False):
+        return ((node.key, node.value) for node in self._nodes_from(key, reverse))
+
+    # -------------------------
+    # Estatísticas de ordem e intervalos
+    # -------------------------
+    def select(self, k):
+        """Devolve a k-ésima menor chave (k começa em 0; negativo conta do fim)."""
+        n = self.root.size
+        if k < 0:
+            k += n
+        if not 0 <= k < n:
+            raise IndexError("índice fora do intervalo da árvore")
+        node = self.root
+        while True:
+            left_size = node.left.size
+            if k < left_size:
+                node = node.left
+            elif k > left_size:
+                k -= left_size + 1
+                node = node.right
+            else:
+                return node.key
+
+    def rank(self, key):
+        """Quantidade de chaves estritamente menores que key."""
+        r = 0
+        node = self.root
+        while node is not self.NULL:
+            if node.key < key:
+                r += node.left.size + 1
+                node = node.right
+            else:
+                node = node.left
+        return r
+
+    def count_range(self, lo=None, hi=None):
+        """Quantidade de chaves em [lo, hi); None deixa o limite aberto."""
+        upper = self.root.size if hi is None else self.rank(hi)
+        lower = 0 if lo is None else self.rank(lo)
+        return max(upper - lower, 0)
+
+    def _lower_node(self, key):
+        # Último nó com chave < key (ou NULL)
+        node = self.root
+        best = self.NULL
+        while node is not self.NULL:
+            if node.key < key:
+                best = node
+                node = node.right
+            else:
+                node = node.left
+        return best
+
+    def irange(self, lo=None, hi=None, reverse=False):
+        """Itera apenas as chaves em [lo, hi); None deixa o limite aberto."""
+        if self.root is self.NULL:
+            return
+        if reverse:
+            node = self.maximum(self.root) if hi is None else self._lower_node(hi)
+            for node in self._walk(node, reverse=True):
+                if lo is not None and node.key < lo:
+                    return
+                yield node.key
+        else:
+            node = self.minimum(self.root) if lo is None else self._lower_bound(lo)
+            for node in self._walk(node):
+                if hi is not None and not node.key < hi:
+                    return
+                yield node.key
+
     def transplant(self, u, v):
-        if u.parent == None:
+        if u.parent is None:
             self.root = v
-        elif u == u.parent.left:
+        elif u is u.parent.left:
             u.parent.left = v
         else:
             u.parent.right = v
-        v.parent = u.parent
+        # NULL é compartilhado por todas as árvores: nunca recebe pai
+        if v is not self.NULL:
+            v.parent = u.parent
 
     def delete(self, key):
         z = self.search(self.root, key)
-        if z == self.NULL:
+        if z is self.NULL:
             print(f"Valor {key} não encontrado na árvore")
             return False
+        self._delete_node(z)
+        return True
 
+    def _delete_node(self, z):
         y = z
         y_original_color = y.color
-        
-        if z.left == self.NULL:
-            x = z.right
+
+        # Decrementa os tamanhos no caminho do nó fisicamente removido
+        if z.left is self.NULL or z.right is self.NULL:
+            p = z.parent
+        else:
+            p = self.minimum(z.right).parent
+        while p is not None:
+            p.size -= 1
+            p = p.parent
+
+        # x pode ser NULL, então o pai de x é guardado à parte em vez de
+        # ficar em x.parent (como no CLRS)
+        if z.left is self.NULL:
+            x, x_parent = z.right, z.parent
             self.transplant(z, z.right)
-        elif z.right == self.NULL:
-            x = z.left
+        elif z.right is self.NULL:
+            x, x_parent = z.left, z.parent
             self.transplant(z, z.left)
         else:
             y = self.minimum(z.right)
             y_original_color = y.color
             x = y.right
             
-            if y.parent == z:
-                x.parent = y
+            if y.parent is z:
+                x_parent = y
             else:
+                x_parent = y.parent
                 self.transplant(y, y.right)
                 y.right = z.right
                 y.right.parent = y
@@ -159,61 +496,677 @@ class RedBlackTree:
             y.left = z.left
             y.left.parent = y
             y.color = z.color
+            y.size = z.size
 
-        if y_original_color == "BLACK":
-            self.fix_delete(x)
-            
-        return True
+        if y_original_color == BLACK:
+            self.fix_delete(x, x_parent)
 
-    def fix_delete(self, x):
-        while x != self.root and x.color == "BLACK":
-            if x == x.parent.left:
-                w = x.parent.right
+    def fix_delete(self, x, parent):
+        # Trocas de cor, contadas como em fix_insert. No caso 4, w (preto)
+        # herda a cor do pai e o pai fica preto: duas trocas se o pai era
+        # vermelho (RED == 1), nenhuma se era preto
+        recolors = 0
+        while x is not self.root and x.color == BLACK:
+            if x is parent.left:
+                w = parent.right
                 
-                if w.color == "RED":
-                    w.color = "BLACK"
-                    x.parent.color = "RED"
-                    self.rotate_left(x.parent)
-                    w = x.parent.right
+                if w.color == RED:
+                    w.color = BLACK
+                    parent.color = RED
+                    recolors += 2
+                    self.rotate_left(parent)
+                    w = parent.right
                 
-                if w.left.color == "BLACK" and w.right.color == "BLACK":
-                    w.color = "RED"
-                    x = x.parent
+                if w.left.color == BLACK and w.right.color == BLACK:
+                    w.color = RED
+                    recolors += 1
+                    x, parent = parent, parent.parent
                 else:
-                    if w.right.color == "BLACK":
-                        w.left.color = "BLACK"
-                        w.color = "RED"
+                    if w.right.color == BLACK:
+                        w.left.color = BLACK
+                        w.color = RED
+                        recolors += 2
                         self.rotate_right(w)
-                        w = x.parent.right
+                        w = parent.right
                     
-                    w.color = x.parent.color
-                    x.parent.color = "BLACK"
-                    w.right.color = "BLACK"
-                    self.rotate_left(x.parent)
+                    recolors += 1 + 2 * parent.color
+                    w.color = parent.color
+                    parent.color = BLACK
+                    w.right.color = BLACK
+                    self.rotate_left(parent)
                     x = self.root
             else:
-                w = x.parent.left
+                w = parent.left
                 
-                if w.color == "RED":
-                    w.color = "BLACK"
-                    x.parent.color = "RED"
-                    self.rotate_right(x.parent)
-                    w = x.parent.left
+                if w.color == RED:
+                    w.color = BLACK
+                    parent.color = RED
+                    recolors += 2
+                    self.rotate_right(parent)
+                    w = parent.left
                 
-                if w.right.color == "BLACK" and w.left.color == "BLACK":
-                    w.color = "RED"
-                    x = x.parent
+                if w.right.color == BLACK and w.left.color == BLACK:
+                    w.color = RED
+                    recolors += 1
+                    x, parent = parent, parent.parent
                 else:
-                    if w.left.color == "BLACK":
-                        w.right.color = "BLACK"
-                        w.color = "RED"
+                    if w.left.color == BLACK:
+                        w.right.color = BLACK
+                        w.color = RED
+                        recolors += 2
                         self.rotate_left(w)
-                        w = x.parent.left
+                        w = parent.left
                     
-                    w.color = x.parent.color
-                    x.parent.color = "BLACK"
-                    w.left.color = "BLACK"
-                    self.rotate_right(x.parent)
+                    recolors += 1 + 2 * parent.color
+                    w.color = parent.color
+                    parent.color = BLACK
+                    w.left.color = BLACK
+                    self.rotate_right(parent)
                     x = self.root
                     
-        x.color = "BLACK"
\ No newline at end of file
+        if x is not self.NULL:
+            recolors += x.color
+            x.color = BLACK
+        self._recolors += recolors
+
+    # -------------------------
+    # Interface de mapa ordenado
+    # -------------------------
+    def __len__(self):
+        return self.root.size
+
+    def __contains__(self, key):
+        return self.search(self.root, key) is not self.NULL
+
+    def __getitem__(self, key):
+        node = self.search(self.root, key)
+        if node is self.NULL:
+            raise KeyError(key)
+        return node.value
+
+    def __setitem__(self, key, value):
+        self.insert(key, value)
+
+    def __delitem__(self, key):
+        node = self.search(self.root, key)
+        if node is self.NULL:
+            raise KeyError(key)
+        self._delete_node(node)
+
+    def get(self, key, default=None):
+        node = self.search(self.root, key)
+        if node is self.NULL:
+            return default
+        return node.value
+
+    def setdefault(self, key, default=None):
+        node = self.search(self.root, key)
+        if node is not self.NULL:
+            return node.value
+        self.insert(key, default)
+        return default
+
+    def pop(self, key, default=_MISSING):
+        node = self.search(self.root, key)
+        if node is self.NULL:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        value = node.value
+        self._delete_node(node)
+        return value
+
+    # -------------------------
+    # Operações em lote
+    # -------------------------
+    # Cada lote é ordenado uma vez. Lotes grandes em relação à árvore são
+    # executados como intercalação ordenada + reconstrução em O(n + m); lotes
+    # pequenos usam busca com "finger": cada chave parte do nó onde a chave
+    # anterior parou e só sobe até o ancestral cuja subárvore a contém, então
+    # chaves vizinhas reaproveitam o caminho.
+    def _prefers_rebuild(self, m):
+        # Reconstruir custa ~1 µs por nó; inserir/remover um a um, ~5 µs por chave
+        return 4 * m >= self.root.size
+
+    def _finger_climb(self, node, key):
+        # Sobe até o ancestral cuja subárvore contém key: para a direita, o
+        # primeiro que é filho esquerdo de um pai maior que key; para a
+        # esquerda, o simétrico. Subida e descida custam O(log d) no caso
+        # típico, com d a distância em chaves, mas O(log n) no pior: duas
+        # chaves vizinhas podem ter o ancestral comum na raiz (sem ligações
+        # entre nós do mesmo nível, nada encurta esse caminho)
+        parent = node.parent
+        if node.key < key:
+            while parent is not None and (node is parent.right or not key < parent.key):
+                node = parent
+                parent = node.parent
+        elif key < node.key:
+            while parent is not None and (node is parent.left or not parent.key < key):
+                node = parent
+                parent = node.parent
+        return node
+
+    def _finger_search(self, start, key):
+        # Devolve (nó com key ou NULL, último nó real visitado)
+        NULL = self.NULL
+        node = self._finger_climb(start, key)
+        last = node
+        while node is not NULL:
+            last = node
+            if key < node.key:
+                node = node.left
+            elif node.key < key:
+                node = node.right
+            else:
+                return node, node
+        return NULL, last
+
+    def _finger_insert(self, start, key, value):
+        # Como insert, mas descendo a partir do finger; devolve (nó, se é novo)
+        NULL = self.NULL
+        x = self._finger_climb(start, key)
+        y = None
+        while x is not NULL:
+            y = x
+            if key < x.key:
+                x = x.left
+            elif x.key < key:
+                x = x.right
+            else:
+                x.value = value
+                return x, False
+
+        node = self.node_class(key, value=value)
+        node.left = NULL
+        node.right = NULL
+        node.parent = y
+        if key < y.key:
+            y.left = node
+        else:
+            y.right = node
+        # Os ancestrais acima do finger não foram visitados na descida, mas
+        # os tamanhos mudam até a raiz: O(log n) passos por ponteiro de pai,
+        # sem comparações
+        p = y
+        while p is not None:
+            p.size += 1
+            p = p.parent
+        self.fix_insert(node)
+        return node, True
+
+    def insert_many(self, keys, values=None):
+        """Insere um lote de chaves (e valores); devolve quantas eram novas."""
+        keys, values = _sorted_unique(keys, values)
+        if not keys:
+            return 0
+        if self._prefers_rebuild(len(keys)):
+            old_keys, old_values = [], []
+            for node in self._nodes():
+                old_keys.append(node.key)
+                old_values.append(node.value)
+            merged_keys, merged_values, added = _merge_sorted(old_keys, old_values, keys, values)
+            self._load_sorted(merged_keys, merged_values)
+            return added
+        added = 0
+        finger = self.root
+        for key, value in zip(keys, values):
+            finger, new = self._finger_insert(finger, key, value)
+            added += new
+        return added
+
+    def delete_many(self, keys):
+        """Remove um lote de chaves; devolve quantas existiam."""
+        keys = _sorted_unique(keys)[0]
+        if not keys or self.root is self.NULL:
+            return 0
+        if self._prefers_rebuild(len(keys)):
+            old_keys, old_values = [], []
+            for node in self._nodes():
+                old_keys.append(node.key)
+                old_values.append(node.value)
+            kept_keys, kept_values, removed = _subtract_sorted(old_keys, old_values, keys)
+            self._load_sorted(kept_keys, kept_values)
+            return removed
+        removed = 0
+        finger = self.root
+        for key in keys:
+            node, finger = self._finger_search(finger, key)
+            if node is not self.NULL:
+                # O sucessor continua na árvore e sua subárvore cobre a próxima chave
+                following = self.successor(node)
+                self._delete_node(node)
+                removed += 1
+                if self.root is self.NULL:
+                    break
+                finger = following if following is not self.NULL else self.root
+        return removed
+
+    def get_many(self, keys, default=None):
+        """Devolve os valores do lote, na ordem original (default para as ausentes).
+
+        As chaves são visitadas em ordem crescente, cada uma partindo do nó da
+        anterior (finger), como em insert_many.
+        """
+        keys = list(keys)
+        result = [default] * len(keys)
+        if self.root is self.NULL:
+            return result
+        NULL = self.NULL
+        finger = self.root
+        for i in sorted(range(len(keys)), key=keys.__getitem__):
+            node, finger = self._finger_search(finger, keys[i])
+            if node is not NULL:
+                result[i] = node.value
+        return result
+
+    def contains_many(self, keys):
+        """Devolve uma máscara de booleanos, na ordem do lote, indicando quais chaves existem."""
+        return [value is not _MISSING for value in self.get_many(keys, _MISSING)]
+
+    # -------------------------
+    # Cursor
+    # -------------------------
+    def cursor(self, key=None):
+        """Cursor na primeira chave (ou na primeira >= key); ver RedBlackCursor."""
+        cur = RedBlackCursor(self)
+        if key is None:
+            cur.first()
+        else:
+            cur.seek(key)
+        return cur
+
+    # -------------------------
+    # Junção, divisão e operações de conjunto
+    # -------------------------
+    # Os métodos _*_nodes trabalham com subárvores avulsas (uma raiz ou NULL)
+    # e devolvem a raiz do resultado. O join por altura negra desce pela
+    # borda da subárvore mais alta até uma subárvore preta com a altura negra
+    # da outra, pendura as duas sob o pivô vermelho e deixa fix_insert
+    # consertar a subida: custa O(diferença de altura negra + 1). Usam
+    # self.root como área de trabalho das rotações, então só são chamados
+    # numa árvore auxiliar criada por _plain.
+    @classmethod
+    def _plain(cls, root=NULL):
+        # Árvore da classe base (sem instrumentação) com a subárvore como raiz
+        tree = getattr(cls, "_base_class", cls)()
+        tree.root = _detach(root)
+        return tree
+
+    def _join_nodes(self, left, hl, pivot, right, hr):
+        # Junta left < pivot < right, reaproveitando o nó pivot. hl e hr são
+        # as alturas negras das subárvores com as cores atuais; devolve
+        # (raiz, altura negra do resultado)
+        if left.color == RED:
+            hl += 1
+        if right.color == RED:
+            hr += 1
+        left = _detach(left)
+        right = _detach(right)
+        pivot.parent = None
+        if hl == hr:
+            pivot.color = BLACK
+            pivot.left = left
+            pivot.right = right
+            if left is not NULL:
+                left.parent = pivot
+            if right is not NULL:
+                right.parent = pivot
+            pivot.size = left.size + right.size + 1
+            return pivot, hl + 1
+
+        # h é a altura negra de node; a descida para na primeira subárvore
+        # preta com a altura negra da árvore mais baixa
+        if hl > hr:
+            root, other, grow = left, right, right.size + 1
+            parent, node, h = None, left, hl
+            while node.color == RED or h > hr:
+                if node.color == BLACK:
+                    h -= 1
+                parent, node = node, node.right
+            parent.right = pivot
+            pivot.left, pivot.right = node, right
+        else:
+            root, other, grow = right, left, left.size + 1
+            parent, node, h = None, right, hr
+            while node.color == RED or h > hl:
+                if node.color == BLACK:
+                    h -= 1
+                parent, node = node, node.left
+            parent.left = pivot
+            pivot.left, pivot.right = left, node
+        pivot.parent = parent
+        pivot.color = RED
+        if node is not NULL:
+            node.parent = pivot
+        if other is not NULL:
+            other.parent = pivot
+        pivot.size = node.size + other.size + 1
+        while parent is not None:
+            parent.size += grow
+            parent = parent.parent
+        self.root = root
+        grew = self.fix_insert(pivot)
+        return self.root, max(hl, hr) + grew
+
+    def _join2_nodes(self, left, hl, right, hr):
+        # Junta left < right sem pivô: o mínimo de right sai dela e vira o pivô
+        if right is NULL:
+            return left, hl
+        if left is NULL:
+            return right, hr
+        self.root = _detach(right)
+        pivot = self.minimum(right)
+        self._delete_node(pivot)
+        # A remoção pode baixar a altura negra; recalcular custa o mesmo que ela
+        right = self.root
+        return self._join_nodes(left, hl, pivot, right, _black_height(right))
+
+    def _split_nodes(self, node, h, key):
+        # Devolve (chaves < key, altura, nó com key ou None, chaves > key,
+        # altura); cada nó do caminho até key vira pivô de um join com o
+        # pedaço do seu lado
+        if node is NULL:
+            return NULL, 0, None, NULL, 0
+        left, right = node.left, node.right
+        h -= node.color == BLACK
+        if key < node.key:
+            lower, hl, found, upper, hu = self._split_nodes(left, h, key)
+            upper, hu = self._join_nodes(upper, hu, node, right, h)
+            return lower, hl, found, upper, hu
+        if node.key < key:
+            lower, hl, found, upper, hu = self._split_nodes(right, h, key)
+            lower, hl = self._join_nodes(left, h, node, lower, hl)
+            return lower, hl, found, upper, hu
+        return left, h, node, right, h
+
+    def _union_nodes(self, a, ha, b, hb):
+        # Divide a pela raiz de b e junta as metades recursivamente; em chave
+        # repetida fica o nó de b
+        if a is NULL:
+            return b, hb
+        if b is NULL:
+            return a, ha
+        left, right = b.left, b.right
+        hb -= b.color == BLACK
+        lower, hl, _, upper, hu = self._split_nodes(a, ha, b.key)
+        lower, hl = self._union_nodes(lower, hl, left, hb)
+        upper, hu = self._union_nodes(upper, hu, right, hb)
+        return self._join_nodes(lower, hl, b, upper, hu)
+
+    def _intersection_nodes(self, a, ha, b, hb):
+        if a is NULL or b is NULL:
+            return NULL, 0
+        left, right = b.left, b.right
+        hb -= b.color == BLACK
+        lower, hl, found, upper, hu = self._split_nodes(a, ha, b.key)
+        lower, hl = self._intersection_nodes(lower, hl, left, hb)
+        upper, hu = self._intersection_nodes(upper, hu, right, hb)
+        if found is None:
+            return self._join2_nodes(lower, hl, upper, hu)
+        return self._join_nodes(lower, hl, found, upper, hu)
+
+    def _difference_nodes(self, a, ha, b, hb):
+        if a is NULL or b is NULL:
+            return a, ha
+        left, right = b.left, b.right
+        hb -= b.color == BLACK
+        lower, hl, _, upper, hu = self._split_nodes(a, ha, b.key)
+        lower, hl = self._difference_nodes(lower, hl, left, hb)
+        upper, hu = self._difference_nodes(upper, hu, right, hb)
+        return self._join2_nodes(lower, hl, upper, hu)
+
+    @classmethod
+    def join(cls, left, key, right, value=None):
+        """Junta left, key e right numa árvore só, em O(log n).
+
+        Todas as chaves de left devem ser menores que key e todas as de right,
+        maiores. Os nós de left e right passam para o resultado e as duas
+        ficam vazias.
+        """
+        if left.root is not NULL and not left.maximum(left.root).key < key:
+            raise ValueError("join exige todas as chaves de left menores que key")
+        if right.root is not NULL and not key < right.minimum(right.root).key:
+            raise ValueError("join exige todas as chaves de right maiores que key")
+        work = cls._plain()
+        root, _ = work._join_nodes(left.root, _black_height(left.root), cls.node_class(key, value=value),
+                                   right.root, _black_height(right.root))
+        left.root = right.root = NULL
+        return cls._plain(root)
+
+    def split(self, key):
+        """Divide a árvore em (chaves < key, chaves >= key), em O(log n).
+
+        Os nós são reaproveitados nas duas árvores devolvidas e esta fica vazia.
+        """
+        work = self._plain()
+        lower, _, found, upper, hu = work._split_nodes(self.root, _black_height(self.root), key)
+        if found is not None:
+            upper, _ = work._join_nodes(NULL, 0, found, upper, hu)
+        self.root = NULL
+        return self._plain(lower), self._plain(upper)
+
+    def _set_operation(self, other, combine):
+        if other is self:
+            raise ValueError("as duas árvores devem ser distintas")
+        work = self._plain()
+        root, _ = combine(work, self.root, _black_height(self.root),
+                          other.root, _black_height(other.root))
+        self.root = other.root = NULL
+        return self._plain(root)
+
+    # As operações de conjunto custam O(m log(n/m + 1)), com m o tamanho da
+    # menor árvore: juntar um delta pequeno numa árvore grande só visita os
+    # caminhos que o delta toca. Consomem as duas árvores (ficam vazias).
+    def union(self, other):
+        """Árvore com as chaves das duas; em chave repetida fica o valor de other."""
+        return self._set_operation(other, RedBlackTree._union_nodes)
+
+    def intersection(self, other):
+        """Árvore com as chaves presentes nas duas, com os valores desta."""
+        return self._set_operation(other, RedBlackTree._intersection_nodes)
+
+    def difference(self, other):
+        """Árvore com as chaves desta que não estão em other."""
+        return self._set_operation(other, RedBlackTree._difference_nodes)
+
+    # -------------------------
+    # Verificação de invariantes
+    # -------------------------
+    def validate(self):
+        """Confere as propriedades da árvore em O(n) e devolve a altura negra.
+
+        Verifica a sentinela NULL, a raiz preta e sem pai, os ponteiros de
+        pai, a ordem estrita das chaves, que nenhum vermelho tem filho
+        vermelho, o campo size e a mesma altura negra em todos os caminhos.
+        A primeira violação levanta AssertionError (também com python -O).
+        """
+        NULL = self.NULL
+        if NULL.color != BLACK or NULL.size != 0:
+            raise AssertionError("sentinela NULL alterada")
+        root = self.root
+        if root is not NULL and (root.color != BLACK or root.parent is not None):
+            raise AssertionError(f"raiz {root.key!r} vermelha ou com pai")
+        last = [_MISSING]
+
+        def visit(node, parent):
+            if node is NULL:
+                return 1
+            if node.parent is not parent:
+                raise AssertionError(f"ponteiro de pai quebrado no nó {node.key!r}")
+            if node.color == RED and (node.left.color == RED or node.right.color == RED):
+                raise AssertionError(f"vermelho com filho vermelho no nó {node.key!r}")
+            if node.size != node.left.size + node.right.size + 1:
+                raise AssertionError(f"size inconsistente no nó {node.key!r}")
+            left = visit(node.left, node)
+            # Em ordem simétrica, cada chave é maior que a anterior
+            if last[0] is not _MISSING and not last[0] < node.key:
+                raise AssertionError(f"chave {node.key!r} fora de ordem depois de {last[0]!r}")
+            last[0] = node.key
+            right = visit(node.right, node)
+            if left != right:
+                raise AssertionError(f"alturas negras {left} e {right} no nó {node.key!r}")
+            return left + (node.color == BLACK)
+
+        return visit(root, None)
+
+    # -------------------------
+    # Estatísticas (opcionais)
+    # -------------------------
+    def enable_stats(self, log=False):
+        """Liga os contadores de comparações, profundidade, rotações e recolorações.
+
+        Devolve o TreeStats que acumula os totais e histogramas (ver
+        comum/estatisticas.py). Com log=True, guarda também um registro por
+        operação.
+        """
+        base = getattr(type(self), "_base_class", type(self))
+        self.stats = TreeStats(log=log)
+        self.__class__ = instrumented_class(base, _RedBlackStatsHooks)
+        return self.stats
+
+    def disable_stats(self):
+        """Desliga os contadores; a árvore volta a rodar o código sem instrumentação."""
+        self.__class__ = getattr(type(self), "_base_class", type(self))
+        stats, self.stats = self.stats, None
+        return stats
+
+
+class RedBlackCursor:
+    """Posição numa RedBlackTree, para acessos com localidade.
+
+    seek, insert e delete partem do nó atual (finger) e só sobem até o
+    ancestral cuja subárvore contém a chave: tipicamente O(log d)
+    comparações, com d a distância em chaves até a posição atual, e O(log n)
+    no pior caso (o ancestral comum de duas chaves vizinhas pode ser a
+    raiz). insert e delete ainda atualizam os tamanhos de subárvore até a
+    raiz, em O(log n) passos sem comparações. next e prev custam O(1)
+    amortizado. Alterações feitas por fora do cursor podem deixar a posição
+    num nó removido; seek reposiciona.
+    """
+
+    __slots__ = ("tree", "node")
+
+    def __init__(self, tree):
+        self.tree = tree
+        self.node = tree.NULL
+
+    @property
+    def valid(self):
+        return self.node is not self.tree.NULL
+
+    def __bool__(self):
+        return self.valid
+
+    def _current(self):
+        if self.node is self.tree.NULL:
+            raise ValueError("cursor fora da árvore")
+        return self.node
+
+    @property
+    def key(self):
+        return self._current().key
+
+    @property
+    def value(self):
+        return self._current().value
+
+    # -------------------------
+    # Movimento
+    # -------------------------
+    def first(self):
+        tree = self.tree
+        self.node = tree.root if tree.root is tree.NULL else tree.minimum(tree.root)
+        return self.valid
+
+    def last(self):
+        tree = self.tree
+        self.node = tree.root if tree.root is tree.NULL else tree.maximum(tree.root)
+        return self.valid
+
+    def next(self):
+        """Avança para a chave seguinte; devolve False ao passar da última."""
+        self.node = self.tree.successor(self._current())
+        return self.valid
+
+    def prev(self):
+        """Volta para a chave anterior; devolve False ao passar da primeira."""
+        self.node = self.tree.predecessor(self._current())
+        return self.valid
+
+    def seek(self, key):
+        """Vai para a primeira chave >= key; devolve True se key existe."""
+        tree = self.tree
+        NULL = tree.NULL
+        start = self.node if self.node is not NULL else tree.root
+        if start is NULL:
+            return False
+        node, last = tree._finger_search(start, key)
+        if node is not NULL:
+            self.node = node
+            return True
+        # A descida parou numa folha vizinha de key
+        self.node = last if key < last.key else tree.successor(last)
+        return False
+
+    # -------------------------
+    # Alterações na posição
+    # -------------------------
+    def insert(self, key, value=None):
+        """Insere (ou atualiza) key e posiciona o cursor nela; True se era nova."""
+        tree = self.tree
+        if tree.root is tree.NULL:
+            tree.insert(key, value)
+            self.node = tree.root
+            return True
+        start = self.node if self.node is not tree.NULL else tree.root
+        self.node, new = tree._finger_insert(start, key, value)
+        return new
+
+    def delete(self):
+        """Remove a chave atual, devolve o seu valor e avança para a seguinte."""
+        tree = self.tree
+        node = self._current()
+        # Com dois filhos, _delete_node move o próprio nó sucessor para o
+        # lugar do removido: a referência continua válida
+        following = tree.successor(node)
+        value = node.value
+        tree._delete_node(node)
+        self.node = following
+        return value
+
+
+class _RedBlackStatsHooks:
+    # Ganchos da subclasse instrumentada: contam rotações e recolorações e
+    # medem a descida de cada operação
+
+    def _trace(self, key):
+        # Busca espelho de search, com a chave embrulhada para contar comparações
+        probe = CountingKey(key)
+        NULL = self.NULL
+        node, depth = self.root, 0
+        while node is not NULL:
+            depth += 1
+            if probe == node.key:
+                break
+            node = node.left if probe < node.key else node.right
+        return depth, probe.comparisons
+
+    def fix_insert(self, k):
+        # fix_insert soma as próprias trocas de cor em _recolors
+        before = self._recolors
+        grew = super().fix_insert(k)
+        self.stats.count("recolors", self._recolors - before)
+        return grew
+
+    def fix_delete(self, x, parent):
+        before = self._recolors
+        super().fix_delete(x, parent)
+        self.stats.count("recolors", self._recolors - before)
+
+    def rotate_left(self, x):
+        self.stats.count("rotations")
+        super().rotate_left(x)
+
+    def rotate_right(self, y):
+        self.stats.count("rotations")
+        super().rotate_right(y)
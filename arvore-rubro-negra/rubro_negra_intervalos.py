@@ -0,0 +1,187 @@
+"""Árvore de intervalos: RedBlackTree com o maior fim de cada subárvore.
+
+As chaves são tuplas (início, fim, ...) ordenadas como tuplas, ou seja,
+pelo início; campos extras (um id, por exemplo) desempatam intervalos
+iguais. Os intervalos são fechados: [início, fim].
+
+Cada nó guarda max_end, o maior fim entre os intervalos da sua subárvore
+(o aumento do CLRS, seção 14.3). Com ele, uma consulta descarta de uma vez
+toda subárvore cujo max_end fica antes do começo da consulta, e a ordem
+por início descarta tudo à direita de um nó que começa depois do fim da
+consulta. stab e overlap visitam só os ancestrais dos k intervalos
+devolvidos mais a borda da consulta: O(log n + k log(n/k)) no pior caso,
+O(log n + k) quando os resultados são vizinhos na ordem.
+
+O aumento é mantido em O(log n) por alteração: as rotações (inclusive as
+de fix_insert e fix_delete) recalculam os dois nós girados, insert ajusta
+o caminho numa descida antes de inserir e a remoção recalcula o caminho do
+ponto alterado até a raiz. join, split e
+as operações de conjunto recalculam a árvore resultante inteira (O(n)).
+"""
+from rubro_negra import Node, RedBlackTree, NULL, RED
+
+
+class IntervalNode(Node):
+    __slots__ = ("max_end",)
+
+    def __init__(self, key, color=RED, value=None):
+        super().__init__(key, color, value)
+        self.max_end = key[1]
+
+
+def _update(node):
+    # max_end a partir do próprio intervalo e dos filhos (NULL não tem max_end)
+    end = node.key[1]
+    left, right = node.left, node.right
+    if left is not NULL and end < left.max_end:
+        end = left.max_end
+    if right is not NULL and end < right.max_end:
+        end = right.max_end
+    node.max_end = end
+
+
+def _update_upward(node):
+    while node is not None:
+        _update(node)
+        node = node.parent
+
+
+def _update_all(root):
+    # Pós-ordem iterativa: cada nó depois dos dois filhos
+    stack, order = [root], []
+    while stack:
+        node = stack.pop()
+        if node is not NULL:
+            order.append(node)
+            stack.append(node.left)
+            stack.append(node.right)
+    for node in reversed(order):
+        _update(node)
+
+
+class IntervalTree(RedBlackTree):
+    """Mapa (início, fim, ...) -> valor com consultas de sobreposição."""
+
+    node_class = IntervalNode
+
+    # -------------------------
+    # Manutenção do aumento
+    # -------------------------
+    def rotate_left(self, x):
+        super().rotate_left(x)
+        _update(x)
+        _update(x.parent)
+
+    def rotate_right(self, y):
+        super().rotate_right(y)
+        _update(y)
+        _update(y.parent)
+
+    def insert(self, key, value=None):
+        high = key[1]
+        if high < key[0]:
+            raise ValueError(f"intervalo com fim antes do início: {key!r}")
+        # Os futuros ancestrais do nó novo passam a cobrir o seu fim numa
+        # descida antes da inserção; as rotações de fix_insert recalculam os
+        # nós girados a partir de filhos já corretos
+        node = self.root
+        while node is not NULL:
+            if node.max_end < high:
+                node.max_end = high
+            if key < node.key:
+                node = node.left
+            elif node.key < key:
+                node = node.right
+            else:
+                break
+        return super().insert(key, value)
+
+    def _finger_insert(self, start, key, value):
+        if key[1] < key[0]:
+            raise ValueError(f"intervalo com fim antes do início: {key!r}")
+        node, new = super()._finger_insert(start, key, value)
+        if new:
+            _update_upward(node)
+        return node, new
+
+    def _delete_node(self, z):
+        # Ponto mais baixo cuja subárvore perde um intervalo: o pai de z, ou,
+        # com dois filhos, o pai do sucessor que sobe para o lugar de z. As
+        # rotações de fix_delete mantêm esse ponto abaixo de todos os nós
+        # desatualizados, então basta recalcular dele até a raiz no fim
+        if z.left is NULL or z.right is NULL:
+            start = z.parent
+        else:
+            successor = self.minimum(z.right)
+            start = successor if successor.parent is z else successor.parent
+        super()._delete_node(z)
+        _update_upward(start)
+
+    def _load_sorted(self, keys, values):
+        for key in keys:
+            if key[1] < key[0]:
+                raise ValueError(f"intervalo com fim antes do início: {key!r}")
+        super()._load_sorted(keys, values)
+        _update_all(self.root)
+
+    @classmethod
+    def join(cls, left, key, right, value=None):
+        tree = super().join(left, key, right, value)
+        _update_all(tree.root)
+        return tree
+
+    def split(self, key):
+        lower, upper = super().split(key)
+        _update_all(lower.root)
+        _update_all(upper.root)
+        return lower, upper
+
+    def _set_operation(self, other, combine):
+        tree = super()._set_operation(other, combine)
+        _update_all(tree.root)
+        return tree
+
+    # -------------------------
+    # Consultas
+    # -------------------------
+    def overlap(self, start, end):
+        """Itens (chave, valor) cujo intervalo toca [start, end], em ordem de início."""
+        stack = []
+        node = self.root
+        while stack or node is not NULL:
+            # Desce pela esquerda enquanto a subárvore pode ter algum fim >= start
+            while node is not NULL and not node.max_end < start:
+                stack.append(node)
+                node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            low, high = node.key[0], node.key[1]
+            if end < low:
+                # Este e tudo à direita (na pilha ou abaixo) começam depois de end
+                return
+            if not high < start:
+                yield node.key, node.value
+            node = node.right
+
+    def stab(self, point):
+        """Itens (chave, valor) cujo intervalo contém point, em ordem de início."""
+        return self.overlap(point, point)
+
+    # -------------------------
+    # Verificação de invariantes
+    # -------------------------
+    def validate(self):
+        """Como RedBlackTree.validate, conferindo também max_end em cada nó."""
+        height = super().validate()
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node is NULL:
+                continue
+            expected = max([node.key[1]] + [c.max_end for c in (node.left, node.right) if c is not NULL])
+            if node.max_end != expected:
+                raise AssertionError(f"max_end {node.max_end!r} no nó {node.key!r}, esperado {expected!r}")
+            stack.append(node.left)
+            stack.append(node.right)
+        return height
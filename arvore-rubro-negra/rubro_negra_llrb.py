@@ -0,0 +1,220 @@
+"""Rubro-negra inclinada à esquerda (LLRB, Sedgewick 2008).
+
+Cada nó vermelho é filho esquerdo: a árvore é a imagem exata de uma árvore
+2-3 (um nó 3 vira um preto com um filho esquerdo vermelho). Com essa
+restrição, insert e delete cabem em três regras aplicadas na volta da
+recursão (_balance), em vez dos casos de fix_insert e fix_delete de
+rubro_negra.py. O preço são mais rotações: a inclinação é refeita em
+quase toda a subida, e a remoção desce "emprestando" vermelhos
+(_move_red_left/_move_red_right) mesmo quando nada precisaria mudar.
+
+A recursão desce no máximo 2 log2(n) níveis, bem abaixo do limite de
+recursão do Python.
+"""
+from rubro_negra import RED, BLACK
+from arvore_binaria import BinarySearchTree
+from arvore_ordenada import _MISSING
+
+
+class LLRBNode:
+    __slots__ = ("key", "value", "left", "right", "color")
+
+    def __init__(self, key, value=None, color=RED):
+        self.key = key
+        self.value = value
+        self.left = None
+        self.right = None
+        self.color = color
+
+
+def _is_red(node):
+    return node is not None and node.color == RED
+
+
+class LeftLeaningRedBlackTree(BinarySearchTree):
+    """Árvore LLRB: a rubro-negra com vermelhos apenas à esquerda."""
+
+    def rotate_left(self, h):
+        x = h.right
+        h.right = x.left
+        x.left = h
+        x.color = h.color
+        h.color = RED
+        return x
+
+    def rotate_right(self, h):
+        x = h.left
+        h.left = x.right
+        x.right = h
+        x.color = h.color
+        h.color = RED
+        return x
+
+    def _flip_colors(self, h):
+        # Divide (ou, na remoção, junta) o nó 4 formado por h e seus filhos
+        h.color ^= 1
+        h.left.color ^= 1
+        h.right.color ^= 1
+
+    def _balance(self, h):
+        # Restaura a inclinação na volta da recursão
+        if _is_red(h.right) and not _is_red(h.left):
+            h = self.rotate_left(h)
+        if _is_red(h.left) and _is_red(h.left.left):
+            h = self.rotate_right(h)
+        if _is_red(h.left) and _is_red(h.right):
+            self._flip_colors(h)
+        return h
+
+    # -------------------------
+    # Inserção
+    # -------------------------
+    def insert(self, key, value=None):
+        size = self._len
+        self.root = self._insert(self.root, key, value)
+        self.root.color = BLACK
+        return self._len != size
+
+    def _insert(self, h, key, value):
+        if h is None:
+            self._len += 1
+            return LLRBNode(key, value)
+        if key < h.key:
+            h.left = self._insert(h.left, key, value)
+        elif h.key < key:
+            h.right = self._insert(h.right, key, value)
+        else:
+            # Chave já existe: substitui o valor, sem mudar a forma
+            h.value = value
+            return h
+        return self._balance(h)
+
+    # -------------------------
+    # Remoção
+    # -------------------------
+    # Na descida, o nó seguinte nunca é um nó 2: _move_red_* empresta uma
+    # chave do irmão ou junta os dois, como na remoção de cima para baixo
+    # da árvore B. A folha removida fica sempre num nó 3 ou 4.
+    def _move_red_left(self, h):
+        self._flip_colors(h)
+        if _is_red(h.right.left):
+            h.right = self.rotate_right(h.right)
+            h = self.rotate_left(h)
+            self._flip_colors(h)
+        return h
+
+    def _move_red_right(self, h):
+        self._flip_colors(h)
+        if _is_red(h.left.left):
+            h = self.rotate_right(h)
+            self._flip_colors(h)
+        return h
+
+    def _pop(self, key):
+        # Remove key e devolve o seu valor, ou _MISSING se não existir
+        node = self._find(key)
+        if node is None:
+            return _MISSING
+        value = node.value
+        root = self.root
+        if not _is_red(root.left) and not _is_red(root.right):
+            root.color = RED
+        self.root = self._delete(root, key)
+        if self.root is not None:
+            self.root.color = BLACK
+        self._len -= 1
+        return value
+
+    def _delete(self, h, key):
+        # key está na subárvore de h
+        if key < h.key:
+            if not _is_red(h.left) and not _is_red(h.left.left):
+                h = self._move_red_left(h)
+            h.left = self._delete(h.left, key)
+        else:
+            if _is_red(h.left):
+                h = self.rotate_right(h)
+            if h.right is None and not h.key < key:
+                return None
+            if not _is_red(h.right) and not _is_red(h.right.left):
+                h = self._move_red_right(h)
+            if h.key < key:
+                h.right = self._delete(h.right, key)
+            else:
+                # O mínimo da direita toma o lugar da chave removida
+                successor = h.right
+                while successor.left is not None:
+                    successor = successor.left
+                h.key, h.value = successor.key, successor.value
+                h.right = self._delete_min(h.right)
+        return self._balance(h)
+
+    def _delete_min(self, h):
+        if h.left is None:
+            return None
+        if not _is_red(h.left) and not _is_red(h.left.left):
+            h = self._move_red_left(h)
+        h.left = self._delete_min(h.left)
+        return self._balance(h)
+
+    # -------------------------
+    # Construção em O(n)
+    # -------------------------
+    def _load_sorted(self, keys, values):
+        # Substitui todo o conteúdo pela árvore 2-3 mais alta que comporta as
+        # chaves: com altura h, cada subárvore guarda entre 2^h - 1 (só nós 2)
+        # e 3^h - 1 (só nós 3) chaves, e n fica nesse intervalo com
+        # h = floor(log2(n + 1)). Cada nível usa nós 2 enquanto o que sobra
+        # cabe em dois filhos e nós 3 (preto com filho esquerdo vermelho) além
+        # disso, repartindo as chaves por igual entre os filhos
+        capacity = [0]
+        height = (len(keys) + 1).bit_length() - 1
+        for h in range(1, height + 1):
+            capacity.append(3 * capacity[-1] + 2)
+
+        def build(lo, hi, h):
+            if h == 0:
+                return None
+            n = hi - lo
+            if n - 1 <= 2 * capacity[h - 1]:
+                mid = lo + (n - 1) // 2
+                node = LLRBNode(keys[mid], values[mid], BLACK)
+                node.left = build(lo, mid, h - 1)
+                node.right = build(mid + 1, hi, h - 1)
+                return node
+            # Nó 3: as n - 2 chaves restantes em três filhos
+            part = (n - 2) // 3
+            extra = (n - 2) % 3
+            a = lo + part + (extra > 0)
+            b = a + 1 + part + (extra > 1)
+            red = LLRBNode(keys[a], values[a], RED)
+            red.left = build(lo, a, h - 1)
+            red.right = build(a + 1, b, h - 1)
+            node = LLRBNode(keys[b], values[b], BLACK)
+            node.left = red
+            node.right = build(b + 1, hi, h - 1)
+            return node
+
+        self.root = build(0, len(keys), height)
+        self._len = len(keys)
+
+    # -------------------------
+    # Verificação de invariantes
+    # -------------------------
+    def validate(self):
+        """Confere ordem, inclinação e altura negra em O(n); devolve a altura negra."""
+        if _is_red(self.root):
+            raise AssertionError(f"raiz {self.root.key!r} vermelha")
+        return super().validate()
+
+    def _check_node(self, node, left, right):
+        # Devolve a altura negra da subárvore (None conta 1)
+        if node is None:
+            return 1
+        if _is_red(node.right):
+            raise AssertionError(f"filho direito vermelho no nó {node.key!r}")
+        if _is_red(node) and _is_red(node.left):
+            raise AssertionError(f"vermelho com filho vermelho no nó {node.key!r}")
+        if left != right:
+            raise AssertionError(f"alturas negras {left} e {right} no nó {node.key!r}")
+        return left + (node.color == BLACK)
@@ -0,0 +1,718 @@
+import numpy as np
+
+from rubro_negra import RED, BLACK, COLOR_NAMES
+from arvore_ordenada import SortedTree, _MISSING, _merge_sorted, _sorted_unique, _subtract_sorted
+
+
+class NumpyRedBlackTree(SortedTree):
+    """Árvore rubro-negra com os nós em vetores NumPy pré-alocados.
+
+    Cada nó é um índice inteiro nos vetores de chave, cor, filhos, pai e
+    tamanho da subárvore; o índice 0 é a sentinela NULL. Não existe um objeto
+    Python por nó, então a memória por chave cai para poucos bytes, o coletor
+    de lixo não tem o que percorrer e o conteúdo da árvore é um conjunto de
+    vetores simples (ver `arrays`). A capacidade dobra quando se esgota e os
+    índices de nós removidos são reaproveitados.
+
+    A interface é a mesma de RedBlackTree, trocando nós por índices: search
+    devolve o índice do nó (ou NULL), e a comparação `res != arvore.NULL`
+    continua valendo. As chaves devem ser numéricas e caber em `dtype`; os
+    valores do modo mapa ficam numa lista Python à parte.
+    """
+
+    def __init__(self, capacity=16, dtype=np.int64):
+        self.NULL = 0
+        self.root = 0
+        self._dtype = np.dtype(dtype)
+        self._allocate(max(capacity, 2))
+        self._next = 1
+        self._free = []
+
+    def _allocate(self, capacity):
+        self._key = np.zeros(capacity, dtype=self._dtype)
+        self._color = np.zeros(capacity, dtype=np.uint8)
+        self._left = np.zeros(capacity, dtype=np.int64)
+        self._right = np.zeros(capacity, dtype=np.int64)
+        self._parent = np.zeros(capacity, dtype=np.int64)
+        self._size = np.zeros(capacity, dtype=np.int64)
+        self._value = [None] * capacity
+        self._color[0] = BLACK
+
+    def _grow(self):
+        # Dobra a capacidade copiando os vetores atuais
+        old = len(self._key)
+        for name in ("_key", "_color", "_left", "_right", "_parent", "_size"):
+            array = getattr(self, name)
+            grown = np.zeros(2 * old, dtype=array.dtype)
+            grown[:old] = array
+            setattr(self, name, grown)
+        self._value.extend([None] * old)
+
+    def _new_node(self, key, value):
+        if self._free:
+            x = self._free.pop()
+        else:
+            if self._next == len(self._key):
+                self._grow()
+            x = self._next
+            self._next += 1
+        # A conversão para dtype pode arredondar (2.5 vira 2 em int64) e
+        # colidir com outra chave: só aceita chaves guardadas sem perda
+        try:
+            self._key[x] = key
+            exact = self._key[x] == key
+        except (OverflowError, ValueError, TypeError):
+            self._free.append(x)
+            raise
+        if not exact:
+            self._free.append(x)
+            raise ValueError(f"a chave {key!r} não cabe sem perda em {self._dtype}")
+        self._color[x] = RED
+        self._left[x] = 0
+        self._right[x] = 0
+        self._parent[x] = 0
+        self._size[x] = 1
+        self._value[x] = value
+        return x
+
+    @property
+    def capacity(self):
+        return len(self._key)
+
+    def arrays(self):
+        """Vetores dos nós em uso (índices 0 a n); a raiz está em `root`."""
+        n = self._next
+        return {
+            "key": self._key[:n],
+            "color": self._color[:n],
+            "left": self._left[:n],
+            "right": self._right[:n],
+            "parent": self._parent[:n],
+            "size": self._size[:n],
+        }
+
+    @classmethod
+    def from_sorted(cls, keys, values=None, dtype=np.int64):
+        """Constrói a árvore em O(n) a partir de chaves ordenadas, sem rotações.
+
+        Mesma forma de RedBlackTree.from_sorted, mas montada nível a nível com
+        operações vetoriais: o nó da i-ésima menor chave é o índice i + 1.
+        """
+        keys, values = _sorted_unique(keys, values)
+        tree = cls(capacity=len(keys) + 1, dtype=dtype)
+        tree._load_sorted(keys, values)
+        return tree
+
+    def _load_sorted(self, keys, values):
+        n = len(keys)
+        # Converte e confere antes de descartar o conteúdo atual
+        stored = np.array(keys, dtype=self._dtype)
+        for converted, key in zip(stored.tolist(), keys):
+            if converted != key:
+                raise ValueError(f"a chave {key!r} não cabe sem perda em {self._dtype}")
+        self._allocate(max(n + 1, 2))
+        self._next = n + 1
+        self._free = []
+        self.root = 0
+        if n == 0:
+            return
+        self._key[1:n + 1] = stored
+        self._value[1:n + 1] = values
+        full_depth = (n + 1).bit_length() - 1
+
+        lo = np.array([0], dtype=np.int64)
+        hi = np.array([n], dtype=np.int64)
+        parent = np.array([0], dtype=np.int64)
+        is_left = np.array([False])
+        depth = 0
+        while lo.size:
+            mid = (lo + hi) // 2
+            node = mid + 1
+            self._parent[node] = parent
+            self._size[node] = hi - lo
+            self._color[node] = BLACK if depth < full_depth else RED
+            self._left[parent[is_left]] = node[is_left]
+            right_child = ~is_left & (parent != 0)
+            self._right[parent[right_child]] = node[right_child]
+
+            has_left = lo < mid
+            has_right = mid + 1 < hi
+            lo = np.concatenate((lo[has_left], mid[has_right] + 1))
+            hi = np.concatenate((mid[has_left], hi[has_right]))
+            parent = np.concatenate((node[has_left], node[has_right]))
+            is_left = np.concatenate((np.ones(has_left.sum(), dtype=bool),
+                                      np.zeros(has_right.sum(), dtype=bool)))
+            depth += 1
+        self.root = n // 2 + 1
+
+    def rotate_left(self, x):
+        left, right, parent, size = self._left, self._right, self._parent, self._size
+        y = right[x]
+        right[x] = left[y]
+        if left[y] != 0:
+            parent[left[y]] = x
+        parent[y] = parent[x]
+        if parent[x] == 0:
+            self.root = y
+        elif x == left[parent[x]]:
+            left[parent[x]] = y
+        else:
+            right[parent[x]] = y
+        left[y] = x
+        parent[x] = y
+        size[y] = size[x]
+        size[x] = size[left[x]] + size[right[x]] + 1
+
+    def rotate_right(self, y):
+        left, right, parent, size = self._left, self._right, self._parent, self._size
+        x = left[y]
+        left[y] = right[x]
+        if right[x] != 0:
+            parent[right[x]] = y
+        parent[x] = parent[y]
+        if parent[y] == 0:
+            self.root = x
+        elif y == right[parent[y]]:
+            right[parent[y]] = x
+        else:
+            left[parent[y]] = x
+        right[x] = y
+        parent[y] = x
+        size[x] = size[y]
+        size[y] = size[left[y]] + size[right[y]] + 1
+
+    def insert(self, key, value=None):
+        # Aloca antes de descer: um _grow troca os vetores
+        node = self._new_node(key, value)
+        K, left, right, size = self._key, self._left, self._right, self._size
+        key = K[node]
+        y = 0
+        x = self.root
+        while x != 0:
+            y = x
+            if key < K[x]:
+                size[x] += 1
+                x = left[x]
+            elif K[x] < key:
+                size[x] += 1
+                x = right[x]
+            else:
+                # Chave já existe: substitui o valor e desfaz os incrementos
+                self._value[x] = value
+                p = self._parent[x]
+                while p != 0:
+                    size[p] -= 1
+                    p = self._parent[p]
+                self._free.append(node)
+                self._value[node] = None
+                return False
+
+        self._parent[node] = y
+        if y == 0:
+            self.root = node
+        elif key < K[y]:
+            left[y] = node
+        else:
+            right[y] = node
+        self.fix_insert(node)
+        return True
+
+    def fix_insert(self, k):
+        color, left, right, parent = self._color, self._left, self._right, self._parent
+        while parent[k] != 0 and color[parent[k]] == RED:
+            p = parent[k]
+            g = parent[p]
+            if p == left[g]:
+                u = right[g]
+                if color[u] == RED:
+                    color[p] = BLACK
+                    color[u] = BLACK
+                    color[g] = RED
+                    k = g
+                else:
+                    if k == right[p]:
+                        k = p
+                        self.rotate_left(k)
+                    p = parent[k]
+                    g = parent[p]
+                    color[p] = BLACK
+                    color[g] = RED
+                    self.rotate_right(g)
+            else:
+                u = left[g]
+                if color[u] == RED:
+                    color[p] = BLACK
+                    color[u] = BLACK
+                    color[g] = RED
+                    k = g
+                else:
+                    if k == left[p]:
+                        k = p
+                        self.rotate_right(k)
+                    p = parent[k]
+                    g = parent[p]
+                    color[p] = BLACK
+                    color[g] = RED
+                    self.rotate_left(g)
+        color[self.root] = BLACK
+
+    def search(self, node, key):
+        K, left, right = self._key, self._left, self._right
+        while node != 0 and key != K[node]:
+            if key < K[node]:
+                node = left[node]
+            else:
+                node = right[node]
+        return node
+
+    def inorder(self, node):
+        stack = []
+        while stack or node != 0:
+            if node != 0:
+                stack.append(node)
+                node = self._left[node]
+            else:
+                node = stack.pop()
+                print(f"{self._key[node]}({COLOR_NAMES[self._color[node]]})", end=" ")
+                node = self._right[node]
+
+    def minimum(self, node):
+        left = self._left
+        while left[node] != 0:
+            node = left[node]
+        return node
+
+    def maximum(self, node):
+        right = self._right
+        while right[node] != 0:
+            node = right[node]
+        return node
+
+    def min(self):
+        if self.root == 0:
+            raise ValueError("árvore vazia")
+        return self._key[self.minimum(self.root)].item()
+
+    def max(self):
+        if self.root == 0:
+            raise ValueError("árvore vazia")
+        return self._key[self.maximum(self.root)].item()
+
+    def successor(self, node):
+        if self._right[node] != 0:
+            return self.minimum(self._right[node])
+        parent = self._parent[node]
+        while parent != 0 and node == self._right[parent]:
+            node = parent
+            parent = self._parent[parent]
+        return parent
+
+    def predecessor(self, node):
+        if self._left[node] != 0:
+            return self.maximum(self._left[node])
+        parent = self._parent[node]
+        while parent != 0 and node == self._left[parent]:
+            node = parent
+            parent = self._parent[parent]
+        return parent
+
+    # -------------------------
+    # Iteração preguiçosa
+    # -------------------------
+    def _walk(self, node, reverse=False):
+        step = self.predecessor if reverse else self.successor
+        while node != 0:
+            yield node
+            node = step(node)
+
+    def _lower_bound(self, key):
+        K, node, best = self._key, self.root, 0
+        while node != 0:
+            if K[node] < key:
+                node = self._right[node]
+            else:
+                best = node
+                node = self._left[node]
+        return best
+
+    def _floor_node(self, key):
+        K, node, best = self._key, self.root, 0
+        while node != 0:
+            if key < K[node]:
+                node = self._left[node]
+            else:
+                best = node
+                node = self._right[node]
+        return best
+
+    def _lower_node(self, key):
+        K, node, best = self._key, self.root, 0
+        while node != 0:
+            if K[node] < key:
+                best = node
+                node = self._right[node]
+            else:
+                node = self._left[node]
+        return best
+
+    def _nodes(self, reverse=False):
+        if self.root == 0:
+            return iter(())
+        if reverse:
+            return self._walk(self.maximum(self.root), reverse=True)
+        return self._walk(self.minimum(self.root))
+
+    def __iter__(self):
+        return (self._key[node].item() for node in self._nodes())
+
+    def __reversed__(self):
+        return (self._key[node].item() for node in self._nodes(reverse=True))
+
+    def keys(self, reverse=False):
+        return reversed(self) if reverse else iter(self)
+
+    def values(self, reverse=False):
+        return (self._value[node] for node in self._nodes(reverse))
+
+    def items(self, reverse=False):
+        return ((self._key[node].item(), self._value[node]) for node in self._nodes(reverse))
+
+    def _nodes_from(self, key, reverse=False):
+        start = self._floor_node(key) if reverse else self._lower_bound(key)
+        return self._walk(start, reverse)
+
+    def iter_from(self, key, reverse=False):
+        """Itera as chaves a partir da primeira >= key (ou <= key se reverse)."""
+        return (self._key[node].item() for node in self._nodes_from(key, reverse))
+
+    def items_from(self, key, reverse=False):
+        return ((self._key[node].item(), self._value[node]) for node in self._nodes_from(key, reverse))
+
+    # -------------------------
+    # Estatísticas de ordem e intervalos
+    # -------------------------
+    def select(self, k):
+        """Devolve a k-ésima menor chave (k começa em 0; negativo conta do fim)."""
+        n = len(self)
+        if k < 0:
+            k += n
+        if not 0 <= k < n:
+            raise IndexError("índice fora do intervalo da árvore")
+        node = self.root
+        while True:
+            left_size = self._size[self._left[node]]
+            if k < left_size:
+                node = self._left[node]
+            elif k > left_size:
+                k -= left_size + 1
+                node = self._right[node]
+            else:
+                return self._key[node].item()
+
+    def rank(self, key):
+        """Quantidade de chaves estritamente menores que key."""
+        r = 0
+        node = self.root
+        while node != 0:
+            if self._key[node] < key:
+                r += self._size[self._left[node]] + 1
+                node = self._right[node]
+            else:
+                node = self._left[node]
+        return int(r)
+
+    def count_range(self, lo=None, hi=None):
+        """Quantidade de chaves em [lo, hi); None deixa o limite aberto."""
+        upper = len(self) if hi is None else self.rank(hi)
+        lower = 0 if lo is None else self.rank(lo)
+        return max(upper - lower, 0)
+
+    def irange(self, lo=None, hi=None, reverse=False):
+        """Itera apenas as chaves em [lo, hi); None deixa o limite aberto."""
+        if self.root == 0:
+            return
+        if reverse:
+            node = self.maximum(self.root) if hi is None else self._lower_node(hi)
+            for node in self._walk(node, reverse=True):
+                key = self._key[node].item()
+                if lo is not None and key < lo:
+                    return
+                yield key
+        else:
+            node = self.minimum(self.root) if lo is None else self._lower_bound(lo)
+            for node in self._walk(node):
+                key = self._key[node].item()
+                if hi is not None and not key < hi:
+                    return
+                yield key
+
+    # -------------------------
+    # Remoção
+    # -------------------------
+    def transplant(self, u, v):
+        parent = self._parent
+        if parent[u] == 0:
+            self.root = v
+        elif u == self._left[parent[u]]:
+            self._left[parent[u]] = v
+        else:
+            self._right[parent[u]] = v
+        parent[v] = parent[u]
+
+    def delete(self, key):
+        z = self.search(self.root, key)
+        if z == 0:
+            print(f"Valor {key} não encontrado na árvore")
+            return False
+        self._delete_node(z)
+        return True
+
+    def _delete_node(self, z):
+        left, right, parent, color, size = (self._left, self._right, self._parent,
+                                            self._color, self._size)
+        y = z
+        y_original_color = color[y]
+
+        # Decrementa os tamanhos no caminho do nó fisicamente removido
+        if left[z] == 0 or right[z] == 0:
+            p = parent[z]
+        else:
+            p = parent[self.minimum(right[z])]
+        while p != 0:
+            size[p] -= 1
+            p = parent[p]
+
+        if left[z] == 0:
+            x = right[z]
+            self.transplant(z, right[z])
+        elif right[z] == 0:
+            x = left[z]
+            self.transplant(z, left[z])
+        else:
+            y = self.minimum(right[z])
+            y_original_color = color[y]
+            x = right[y]
+
+            if parent[y] == z:
+                parent[x] = y
+            else:
+                self.transplant(y, right[y])
+                right[y] = right[z]
+                parent[right[y]] = y
+
+            self.transplant(z, y)
+            left[y] = left[z]
+            parent[left[y]] = y
+            color[y] = color[z]
+            size[y] = size[z]
+
+        if y_original_color == BLACK:
+            self.fix_delete(x)
+
+        # O índice volta para a lista de livres
+        self._value[z] = None
+        self._free.append(z)
+
+    def fix_delete(self, x):
+        left, right, parent, color = self._left, self._right, self._parent, self._color
+        while x != self.root and color[x] == BLACK:
+            p = parent[x]
+            if x == left[p]:
+                w = right[p]
+
+                if color[w] == RED:
+                    color[w] = BLACK
+                    color[p] = RED
+                    self.rotate_left(p)
+                    w = right[parent[x]]
+
+                if color[left[w]] == BLACK and color[right[w]] == BLACK:
+                    color[w] = RED
+                    x = parent[x]
+                else:
+                    if color[right[w]] == BLACK:
+                        color[left[w]] = BLACK
+                        color[w] = RED
+                        self.rotate_right(w)
+                        w = right[parent[x]]
+
+                    p = parent[x]
+                    color[w] = color[p]
+                    color[p] = BLACK
+                    color[right[w]] = BLACK
+                    self.rotate_left(p)
+                    x = self.root
+            else:
+                w = left[p]
+
+                if color[w] == RED:
+                    color[w] = BLACK
+                    color[p] = RED
+                    self.rotate_right(p)
+                    w = left[parent[x]]
+
+                if color[right[w]] == BLACK and color[left[w]] == BLACK:
+                    color[w] = RED
+                    x = parent[x]
+                else:
+                    if color[left[w]] == BLACK:
+                        color[right[w]] = BLACK
+                        color[w] = RED
+                        self.rotate_left(w)
+                        w = left[parent[x]]
+
+                    p = parent[x]
+                    color[w] = color[p]
+                    color[p] = BLACK
+                    color[left[w]] = BLACK
+                    self.rotate_right(p)
+                    x = self.root
+
+        color[x] = BLACK
+
+    # -------------------------
+    # Interface de mapa ordenado
+    # -------------------------
+    def __len__(self):
+        return int(self._size[self.root])
+
+    def __contains__(self, key):
+        return self.search(self.root, key) != 0
+
+    def __getitem__(self, key):
+        node = self.search(self.root, key)
+        if node == 0:
+            raise KeyError(key)
+        return self._value[node]
+
+    def __setitem__(self, key, value):
+        self.insert(key, value)
+
+    def __delitem__(self, key):
+        node = self.search(self.root, key)
+        if node == 0:
+            raise KeyError(key)
+        self._delete_node(node)
+
+    def get(self, key, default=None):
+        node = self.search(self.root, key)
+        if node == 0:
+            return default
+        return self._value[node]
+
+    def setdefault(self, key, default=None):
+        node = self.search(self.root, key)
+        if node != 0:
+            return self._value[node]
+        self.insert(key, default)
+        return default
+
+    def pop(self, key, default=_MISSING):
+        node = self.search(self.root, key)
+        if node == 0:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        value = self._value[node]
+        self._delete_node(node)
+        return value
+
+    # -------------------------
+    # Operações em lote
+    # -------------------------
+    # Lotes grandes são intercalados com o conteúdo atual e a árvore é
+    # reconstruída com _load_sorted; lotes pequenos seguem chave a chave, em
+    # ordem crescente.
+    def _prefers_rebuild(self, m):
+        return 4 * m >= len(self)
+
+    def _sorted_contents(self):
+        nodes = list(self._nodes())
+        return self._key[nodes].tolist(), [self._value[node] for node in nodes]
+
+    def insert_many(self, keys, values=None):
+        """Insere um lote de chaves (e valores); devolve quantas eram novas."""
+        keys, values = _sorted_unique(keys, values)
+        if not keys:
+            return 0
+        if self._prefers_rebuild(len(keys)):
+            merged_keys, merged_values, added = _merge_sorted(*self._sorted_contents(), keys, values)
+            self._load_sorted(merged_keys, merged_values)
+            return added
+        return sum(self.insert(key, value) for key, value in zip(keys, values))
+
+    def delete_many(self, keys):
+        """Remove um lote de chaves; devolve quantas existiam."""
+        keys = _sorted_unique(keys)[0]
+        if not keys or self.root == 0:
+            return 0
+        if self._prefers_rebuild(len(keys)):
+            kept_keys, kept_values, removed = _subtract_sorted(*self._sorted_contents(), keys)
+            self._load_sorted(kept_keys, kept_values)
+            return removed
+        removed = 0
+        for key in keys:
+            node = self.search(self.root, key)
+            if node != 0:
+                self._delete_node(node)
+                removed += 1
+        return removed
+
+    def get_many(self, keys, default=None):
+        """Devolve os valores do lote, na ordem original (default para as ausentes).
+
+        Ao contrário de RedBlackTree.get_many, não há finger nem vetorização:
+        é um laço em Python com uma descida da raiz por chave, o mesmo custo
+        de chamar get para cada uma.
+        """
+        return [self.get(key, default) for key in keys]
+
+    def contains_many(self, keys):
+        """Máscara de booleanos, na ordem do lote, indicando quais chaves existem.
+
+        Uma descida da raiz por chave, como get_many.
+        """
+        return [self.search(self.root, key) != 0 for key in keys]
+
+    # -------------------------
+    # Verificação de invariantes
+    # -------------------------
+    def validate(self):
+        """Confere as propriedades da árvore em O(n) e devolve a altura negra.
+
+        As mesmas verificações de RedBlackTree.validate, sobre os vetores
+        (convertidos em listas uma vez) e com a sentinela no índice 0. Também
+        confere que nenhum índice da lista de livres está na árvore.
+        """
+        key, color = self._key.tolist(), self._color.tolist()
+        left, right = self._left.tolist(), self._right.tolist()
+        parent, size = self._parent.tolist(), self._size.tolist()
+        if color[0] != BLACK or size[0] != 0:
+            raise AssertionError("sentinela NULL alterada")
+        root = self.root
+        if root != 0 and (color[root] != BLACK or parent[root] != 0):
+            raise AssertionError(f"raiz {key[root]!r} vermelha ou com pai")
+        free = set(self._free)
+        last = [_MISSING]
+
+        def visit(node, up):
+            if node == 0:
+                return 1
+            if node in free:
+                raise AssertionError(f"índice livre {node} ainda na árvore")
+            if parent[node] != up:
+                raise AssertionError(f"ponteiro de pai quebrado no nó {key[node]!r}")
+            if color[node] == RED and (color[left[node]] == RED or color[right[node]] == RED):
+                raise AssertionError(f"vermelho com filho vermelho no nó {key[node]!r}")
+            if size[node] != size[left[node]] + size[right[node]] + 1:
+                raise AssertionError(f"size inconsistente no nó {key[node]!r}")
+            lh = visit(left[node], node)
+            if last[0] is not _MISSING and not last[0] < key[node]:
+                raise AssertionError(f"chave {key[node]!r} fora de ordem depois de {last[0]!r}")
+            last[0] = key[node]
+            rh = visit(right[node], node)
+            if lh != rh:
+                raise AssertionError(f"alturas negras {lh} e {rh} no nó {key[node]!r}")
+            return lh + (color[node] == BLACK)
+
+        return visit(root, 0)
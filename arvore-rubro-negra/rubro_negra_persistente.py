@@ -0,0 +1,343 @@
+"""Árvore rubro-negra persistente (imutável), com cópia de caminho.
+
+Os nós não têm ponteiro para o pai e nunca são alterados depois de criados.
+insert e delete devolvem uma nova árvore: só os O(log n) nós do caminho da
+raiz até a chave são copiados, e todo o resto é compartilhado com a versão
+anterior, que continua válida. Guardar uma versão ("snapshot") é guardar a
+referência, O(1).
+
+A inserção segue o balanceamento de Okasaki e a remoção o de Kahrs
+("Red-black trees with types", 2001), ambos expressos como funções que
+montam nós novos em vez de rotacionar os existentes.
+"""
+from rubro_negra import RED, BLACK, COLOR_NAMES
+from arvore_ordenada import _sorted_unique
+
+
+class PersistentNode:
+    __slots__ = ("key", "value", "color", "left", "right", "size")
+
+    def __init__(self, color, left, key, value, right):
+        self.color = color
+        self.left = left
+        self.key = key
+        self.value = value
+        self.right = right
+        self.size = 1 + (left.size if left else 0) + (right.size if right else 0)
+
+    def __repr__(self):
+        return f"PersistentNode({self.key!r}, {COLOR_NAMES[self.color]})"
+
+
+# -------------------------
+# Funções de balanceamento (sempre devolvem nós novos)
+# -------------------------
+def _is_red(node):
+    return node is not None and node.color == RED
+
+
+def _is_black_node(node):
+    return node is not None and node.color == BLACK
+
+
+def _balance(a, key, value, b):
+    # Nó preto com filho e neto vermelhos em qualquer das quatro posições vira
+    # um vermelho com dois filhos pretos; dois filhos vermelhos são recoloridos
+    N = PersistentNode
+    if _is_red(a) and _is_red(b):
+        return N(RED, N(BLACK, a.left, a.key, a.value, a.right), key, value,
+                 N(BLACK, b.left, b.key, b.value, b.right))
+    if _is_red(a):
+        if _is_red(a.left):
+            ll = a.left
+            return N(RED, N(BLACK, ll.left, ll.key, ll.value, ll.right), a.key, a.value,
+                     N(BLACK, a.right, key, value, b))
+        if _is_red(a.right):
+            lr = a.right
+            return N(RED, N(BLACK, a.left, a.key, a.value, lr.left), lr.key, lr.value,
+                     N(BLACK, lr.right, key, value, b))
+    if _is_red(b):
+        if _is_red(b.right):
+            rr = b.right
+            return N(RED, N(BLACK, a, key, value, b.left), b.key, b.value,
+                     N(BLACK, rr.left, rr.key, rr.value, rr.right))
+        if _is_red(b.left):
+            rl = b.left
+            return N(RED, N(BLACK, a, key, value, rl.left), rl.key, rl.value,
+                     N(BLACK, rl.right, b.key, b.value, b.right))
+    return N(BLACK, a, key, value, b)
+
+
+def _redden(node):
+    # Pinta de vermelho um nó preto (o "sub1" de Kahrs)
+    return PersistentNode(RED, node.left, node.key, node.value, node.right)
+
+
+def _blacken(node):
+    if node is None or node.color == BLACK:
+        return node
+    return PersistentNode(BLACK, node.left, node.key, node.value, node.right)
+
+
+def _bal_left(left, key, value, right):
+    # A subárvore esquerda perdeu uma unidade de altura negra
+    N = PersistentNode
+    if _is_red(left):
+        return N(RED, N(BLACK, left.left, left.key, left.value, left.right), key, value, right)
+    if _is_black_node(right):
+        return _balance(left, key, value, _redden(right))
+    # right é vermelho com filho esquerdo preto
+    rl = right.left
+    return N(RED, N(BLACK, left, key, value, rl.left), rl.key, rl.value,
+             _balance(rl.right, right.key, right.value, _redden(right.right)))
+
+
+def _bal_right(left, key, value, right):
+    # Simétrico de _bal_left: a subárvore direita perdeu altura negra
+    N = PersistentNode
+    if _is_red(right):
+        return N(RED, left, key, value, N(BLACK, right.left, right.key, right.value, right.right))
+    if _is_black_node(left):
+        return _balance(_redden(left), key, value, right)
+    lr = left.right
+    return N(RED, _balance(_redden(left.left), left.key, left.value, lr.left), lr.key, lr.value,
+             N(BLACK, lr.right, key, value, right))
+
+
+def _append(a, b):
+    # Junta as duas subárvores de um nó removido, que têm a mesma altura negra
+    N = PersistentNode
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if a.color == RED and b.color == RED:
+        mid = _append(a.right, b.left)
+        if _is_red(mid):
+            return N(RED, N(RED, a.left, a.key, a.value, mid.left), mid.key, mid.value,
+                     N(RED, mid.right, b.key, b.value, b.right))
+        return N(RED, a.left, a.key, a.value, N(RED, mid, b.key, b.value, b.right))
+    if a.color == BLACK and b.color == BLACK:
+        mid = _append(a.right, b.left)
+        if _is_red(mid):
+            return N(RED, N(BLACK, a.left, a.key, a.value, mid.left), mid.key, mid.value,
+                     N(BLACK, mid.right, b.key, b.value, b.right))
+        return _bal_left(a.left, a.key, a.value, N(BLACK, mid, b.key, b.value, b.right))
+    if b.color == RED:
+        return N(RED, _append(a, b.left), b.key, b.value, b.right)
+    return N(RED, a.left, a.key, a.value, _append(a.right, b))
+
+
+# -------------------------
+# Árvore
+# -------------------------
+class PersistentRedBlackTree:
+    """Árvore rubro-negra imutável: cada alteração devolve uma nova versão.
+
+    A interface de consulta é a de RedBlackTree (in, get, [], len, select,
+    rank, count_range, irange, iteração). insert e delete não alteram a
+    árvore: devolvem a nova versão, que compartilha com esta todos os nós
+    fora do caminho alterado.
+    """
+
+    __slots__ = ("root",)
+
+    def __init__(self, root=None):
+        self.root = root
+
+    @classmethod
+    def from_sorted(cls, keys, values=None):
+        """Constrói a árvore em O(n) a partir de chaves ordenadas.
+
+        Mesma forma de RedBlackTree.from_sorted: perfeitamente balanceada,
+        com apenas o último nível, se incompleto, vermelho.
+        """
+        keys, values = _sorted_unique(keys, values)
+        full_depth = (len(keys) + 1).bit_length() - 1
+
+        def build(lo, hi, depth):
+            if lo >= hi:
+                return None
+            mid = (lo + hi) // 2
+            return PersistentNode(BLACK if depth < full_depth else RED,
+                                  build(lo, mid, depth + 1), keys[mid], values[mid],
+                                  build(mid + 1, hi, depth + 1))
+
+        return cls(build(0, len(keys), 0))
+
+    # -------------------------
+    # Alterações (devolvem nova versão)
+    # -------------------------
+    def insert(self, key, value=None):
+        """Devolve uma nova árvore com key (substituindo o valor se já existir)."""
+
+        def ins(node):
+            if node is None:
+                return PersistentNode(RED, None, key, value, None)
+            if key < node.key:
+                if node.color == BLACK:
+                    return _balance(ins(node.left), node.key, node.value, node.right)
+                return PersistentNode(RED, ins(node.left), node.key, node.value, node.right)
+            if node.key < key:
+                if node.color == BLACK:
+                    return _balance(node.left, node.key, node.value, ins(node.right))
+                return PersistentNode(RED, node.left, node.key, node.value, ins(node.right))
+            return PersistentNode(node.color, node.left, key, value, node.right)
+
+        root = ins(self.root)
+        return PersistentRedBlackTree(_blacken(root))
+
+    def delete(self, key):
+        """Devolve uma nova árvore sem key; sem a chave, devolve a própria árvore."""
+        if key not in self:
+            return self
+
+        def delete_from(node):
+            if key < node.key:
+                if _is_black_node(node.left):
+                    return _bal_left(delete_from(node.left), node.key, node.value, node.right)
+                return PersistentNode(RED, delete_from(node.left), node.key, node.value, node.right)
+            if node.key < key:
+                if _is_black_node(node.right):
+                    return _bal_right(node.left, node.key, node.value, delete_from(node.right))
+                return PersistentNode(RED, node.left, node.key, node.value, delete_from(node.right))
+            return _append(node.left, node.right)
+
+        return PersistentRedBlackTree(_blacken(delete_from(self.root)))
+
+    # -------------------------
+    # Consultas
+    # -------------------------
+    def _find(self, key):
+        node = self.root
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            elif node.key < key:
+                node = node.right
+            else:
+                return node
+        return None
+
+    def __len__(self):
+        return self.root.size if self.root else 0
+
+    def __contains__(self, key):
+        return self._find(key) is not None
+
+    def __getitem__(self, key):
+        node = self._find(key)
+        if node is None:
+            raise KeyError(key)
+        return node.value
+
+    def get(self, key, default=None):
+        node = self._find(key)
+        return default if node is None else node.value
+
+    def min(self):
+        node = self.root
+        if node is None:
+            raise ValueError("árvore vazia")
+        while node.left:
+            node = node.left
+        return node.key
+
+    def max(self):
+        node = self.root
+        if node is None:
+            raise ValueError("árvore vazia")
+        while node.right:
+            node = node.right
+        return node.key
+
+    # -------------------------
+    # Iteração (pilha explícita: não há ponteiro para o pai)
+    # -------------------------
+    def _nodes(self, reverse=False, lo=None, hi=None):
+        # Nós com chave em [lo, hi), em ordem; a pilha guarda o caminho ainda
+        # por visitar e as subárvores fora do intervalo nem são empilhadas
+        stack = []
+        node = self.root
+        while True:
+            while node is not None:
+                if reverse:
+                    if hi is not None and not node.key < hi:
+                        node = node.left
+                        continue
+                    stack.append(node)
+                    node = node.right
+                else:
+                    if lo is not None and node.key < lo:
+                        node = node.right
+                        continue
+                    stack.append(node)
+                    node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            if reverse:
+                if lo is not None and node.key < lo:
+                    return
+            elif hi is not None and not node.key < hi:
+                return
+            yield node
+            node = node.left if reverse else node.right
+
+    def __iter__(self):
+        return (node.key for node in self._nodes())
+
+    def __reversed__(self):
+        return (node.key for node in self._nodes(reverse=True))
+
+    def keys(self, reverse=False):
+        return reversed(self) if reverse else iter(self)
+
+    def values(self, reverse=False):
+        return (node.value for node in self._nodes(reverse))
+
+    def items(self, reverse=False):
+        return ((node.key, node.value) for node in self._nodes(reverse))
+
+    def irange(self, lo=None, hi=None, reverse=False):
+        """Itera apenas as chaves em [lo, hi); None deixa o limite aberto."""
+        return (node.key for node in self._nodes(reverse, lo, hi))
+
+    # -------------------------
+    # Estatísticas de ordem
+    # -------------------------
+    def select(self, k):
+        """Devolve a k-ésima menor chave (k começa em 0; negativo conta do fim)."""
+        n = len(self)
+        if k < 0:
+            k += n
+        if not 0 <= k < n:
+            raise IndexError("índice fora do intervalo da árvore")
+        node = self.root
+        while True:
+            left_size = node.left.size if node.left else 0
+            if k < left_size:
+                node = node.left
+            elif k > left_size:
+                k -= left_size + 1
+                node = node.right
+            else:
+                return node.key
+
+    def rank(self, key):
+        """Quantidade de chaves estritamente menores que key."""
+        r = 0
+        node = self.root
+        while node is not None:
+            if node.key < key:
+                r += (node.left.size if node.left else 0) + 1
+                node = node.right
+            else:
+                node = node.left
+        return r
+
+    def count_range(self, lo=None, hi=None):
+        """Quantidade de chaves em [lo, hi); None deixa o limite aberto."""
+        upper = len(self) if hi is None else self.rank(hi)
+        lower = 0 if lo is None else self.rank(lo)
+        return max(upper - lower, 0)
@@ -0,0 +1,67 @@
+import asyncio
+import random
+import sys
+
+from rubro_negra import RedBlackTree
+from assincrono import AsyncTree
+
+
+async def erro_no_lote():
+    # Uma chave incomparável derruba o get_many do lote: as duas consultas
+    # precisam receber o erro, e a fachada continua funcionando depois
+    arvore = AsyncTree(RedBlackTree(), coalesce=True)
+    await arvore.put(1, "um")
+    resultados = await asyncio.wait_for(
+        asyncio.gather(arvore.get(1), arvore.get("x"), return_exceptions=True), timeout=5)
+    assert all(isinstance(r, TypeError) for r in resultados), f"lote com erro devolveu {resultados}"
+    assert await asyncio.wait_for(arvore.get(1), timeout=5) == "um"
+
+
+async def chaves_sem_hash():
+    # Listas se comparam, mas não têm hash: não podem entrar no dict do lote
+    arvore = AsyncTree(RedBlackTree(), coalesce=True)
+    await arvore.put([1, 2], "lista")
+    await arvore.put([3], "outra")
+    resultados = await asyncio.gather(arvore.get([1, 2]), arvore.get([0], "nada"),
+                                      arvore.contains([3]), arvore.get([3]))
+    assert resultados == ["lista", "nada", True, "outra"], f"chaves sem hash: {resultados}"
+    assert arvore.batches == 0 and not arvore._pending
+
+
+async def contra_dict(seed, operacoes):
+    rng = random.Random(seed)
+    arvore = AsyncTree(RedBlackTree(), coalesce=True, yield_every=16)
+    esperado = {}
+
+    async def cliente(n):
+        for passo in range(operacoes // 8):
+            chave = rng.randrange(300)
+            sorteio = rng.random()
+            if sorteio < 0.3:
+                await arvore.put(chave, (n, passo))
+                esperado[chave] = (n, passo)
+            elif sorteio < 0.45:
+                assert await arvore.delete(chave) == esperado.pop(chave, None), f"delete({chave})"
+            else:
+                # A resposta vem do lote, mas deve refletir a árvore no momento da consulta
+                visto = esperado.get(chave)
+                assert await arvore.get(chave) == visto, f"get({chave})"
+            if passo % 50 == 0:
+                await asyncio.sleep(0)
+
+    await asyncio.gather(*(cliente(n) for n in range(8)))
+    chaves = [k async for k in arvore.irange()]
+    assert chaves == sorted(esperado)
+    assert [item async for item in arvore.items(100, 200)] == \
+        sorted((k, v) for k, v in esperado.items() if 100 <= k < 200)
+    return arvore.batches
+
+
+seed = int(sys.argv[1]) if len(sys.argv) > 1 else 2024
+operacoes = int(sys.argv[2]) if len(sys.argv) > 2 else 8000
+print(f"AsyncTree com consultas agrupadas: seed={seed}, {operacoes} operações")
+asyncio.run(erro_no_lote())
+asyncio.run(chaves_sem_hash())
+lotes = asyncio.run(contra_dict(seed, operacoes))
+print(f"{lotes} lotes de get_many")
+print("✅ Erro num lote chega a todas as consultas, chaves sem hash vão direto à árvore e as respostas agrupadas concordam com um dict")
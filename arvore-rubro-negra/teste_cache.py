@@ -0,0 +1,184 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "arvore-2-3-4"))
+
+from rubro_negra import RedBlackTree
+from main import Tree234
+from cache import TreeCache
+
+NUNCA = float("inf")
+
+
+class Modelo:
+    """A mesma política do TreeCache, escrita com um dict e min() a cada despejo."""
+
+    def __init__(self, capacity, ttl, policy):
+        self.capacity, self.ttl, self.policy = capacity, ttl, policy
+        self.entradas = {}   # chave -> [valor, (vence, seq) ou None, uso ou None]
+        self.seq = self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def purge(self, agora, limite=None):
+        vencidas = sorted((e[1], c) for c, e in self.entradas.items()
+                          if e[1] is not None and e[1][0] <= agora)
+        for _, chave in vencidas[:limite]:
+            del self.entradas[chave]
+        self.expirations += len(vencidas[:limite])
+        return len(vencidas[:limite])
+
+    def viva(self, chave, agora):
+        entrada = self.entradas.get(chave)
+        if entrada is not None and entrada[1] is not None and entrada[1][0] <= agora:
+            del self.entradas[chave]
+            self.expirations += 1
+            return None
+        return entrada
+
+    def get(self, chave, agora):
+        entrada = self.viva(chave, agora)
+        if entrada is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if entrada[2] is not None:
+            self.seq += 1
+            entrada[2] = self.seq
+        return entrada[0]
+
+    def put(self, chave, valor, agora, ttl=None):
+        self.entradas.pop(chave, None)
+        self.purge(agora, 2)
+        while self.capacity is not None and len(self.entradas) >= self.capacity:
+            if self.purge(agora, 1):
+                continue
+            posicao = 2 if self.policy == "lru" else 1
+            del self.entradas[min(self.entradas, key=lambda c: self.entradas[c][posicao])]
+            self.evictions += 1
+        ttl = self.ttl if ttl is None else ttl
+        self.seq += 1
+        vence = None
+        if ttl is not None:
+            vence = (agora + ttl, self.seq)
+        elif self.policy == "ttl":
+            vence = (NUNCA, self.seq)
+        self.entradas[chave] = [valor, vence, self.seq if self.policy == "lru" else None]
+
+
+def consistente(cache, nome):
+    """O dict e as árvores de despejo descrevem as mesmas entradas."""
+    entradas = cache._entries
+    com_prazo = {e[1]: c for c, e in entradas.items() if e[1] is not None}
+    assert dict(cache._by_expiry.items()) == com_prazo, f"{nome}: árvore de expiração desalinhada"
+    if cache._by_use is not None:
+        assert dict(cache._by_use.items()) == {e[2]: c for c, e in entradas.items()}, \
+            f"{nome}: árvore de uso desalinhada"
+
+
+def contra_modelo(classe, policy, rng, operacoes):
+    relogio = [0.0]
+    capacidade = rng.choice((None, 8, 50))
+    ttl = rng.choice((None, 1.0, 5.0))
+    nome = f"{classe.__name__}/{policy}/capacity={capacidade}/ttl={ttl}"
+    cache = TreeCache(classe, capacity=capacidade, ttl=ttl, policy=policy,
+                      clock=lambda: relogio[0])
+    modelo = Modelo(capacidade, ttl, policy)
+    for passo in range(operacoes):
+        relogio[0] += rng.choice((0.0, 0.01, 0.1, 0.5))
+        agora = relogio[0]
+        chave = rng.randrange(80)
+        sorteio = rng.random()
+        if sorteio < 0.4:
+            prazo = rng.choice((None, None, 0.2, 3.0))
+            cache.put(chave, passo, ttl=prazo)
+            modelo.put(chave, passo, agora, ttl=prazo)
+        elif sorteio < 0.75:
+            assert cache.get(chave) == modelo.get(chave, agora), f"{nome}: get({chave})"
+        elif sorteio < 0.85:
+            entrada = modelo.viva(chave, agora)
+            assert cache.pop(chave) == (entrada[0] if entrada else None), f"{nome}: pop({chave})"
+            modelo.entradas.pop(chave, None)
+        elif sorteio < 0.95:
+            hits = cache.hits
+            assert (chave in cache) == (modelo.viva(chave, agora) is not None), f"{nome}: in"
+            assert cache.hits == hits, f"{nome}: 'in' contou como acesso"
+        else:
+            assert cache.expire() == modelo.purge(agora), f"{nome}: expire()"
+        esperado = (modelo.hits, modelo.misses, modelo.evictions, modelo.expirations)
+        obtido = (cache.hits, cache.misses, cache.evictions, cache.expirations)
+        assert obtido == esperado, f"{nome}, passo {passo}: contadores {obtido} != {esperado}"
+        assert set(cache._entries) == set(modelo.entradas), f"{nome}, passo {passo}: entradas"
+        if passo % 50 == 0:
+            consistente(cache, nome)
+    consistente(cache, nome)
+    return cache.counters()
+
+
+def cenarios(classe):
+    relogio = [0.0]
+    nome = classe.__name__
+
+    # put sobre uma chave existente troca o valor e renova o prazo
+    cache = TreeCache(classe, ttl=1.0, clock=lambda: relogio[0])
+    cache["a"] = 1
+    relogio[0] = 0.9
+    cache["a"] = 2
+    relogio[0] = 1.5
+    assert cache.get("a") == 2, f"{nome}: put não renovou o prazo"
+    relogio[0] = 1.9
+    assert "a" not in cache and len(cache) == 0, f"{nome}: entrada vencida ainda visível"
+    consistente(cache, nome)
+
+    # Muitas vencidas de uma vez (split na RedBlackTree, delete_many nas outras)
+    for k in range(300):
+        cache.put(k, k, ttl=1.0 if k % 3 else 10.0)
+    relogio[0] = 3.0
+    assert cache.expire() == 200 and len(cache) == 100, f"{nome}: expire() em massa"
+    consistente(cache, nome)
+    cache.put("novo", 0)
+    assert cache["novo"] == 0 and cache.get(1) is None and cache.get(3) == 3
+    consistente(cache, nome)
+
+    # pop, del e clear tiram a entrada das duas árvores
+    assert cache.pop(3) == 3 and cache.pop(3, "ausente") == "ausente"
+    del cache[6]
+    try:
+        del cache[6]
+        raise AssertionError(f"{nome}: del de chave removida sem KeyError")
+    except KeyError:
+        pass
+    consistente(cache, nome)
+    cache.clear()
+    assert len(cache) == 0 and not len(cache._by_expiry) and not len(cache._by_use)
+
+    # LRU: um get protege a chave do despejo; 'in' não
+    cache = TreeCache(classe, capacity=3, clock=lambda: relogio[0])
+    for k in "abc":
+        cache[k] = k
+    cache.get("a")
+    assert "b" in cache
+    cache["d"] = "d"
+    assert "b" not in cache and "a" in cache and cache.evictions == 1, f"{nome}: ordem LRU"
+    consistente(cache, nome)
+
+
+def main():
+    seed = int(sys.argv[1]) if len(sys.argv) > 1 else 2024
+    operacoes = int(sys.argv[2]) if len(sys.argv) > 2 else 3000
+    rng = random.Random(seed)
+    print(f"TreeCache contra um modelo com dict: seed={seed}, {operacoes} operações")
+    for classe in (RedBlackTree, Tree234):
+        cenarios(classe)
+        for policy in ("lru", "ttl"):
+            total = {"hits": 0, "evictions": 0, "expirations": 0}
+            for _ in range(3):
+                contadores = contra_modelo(classe, policy, rng, operacoes)
+                for nome in total:
+                    total[nome] += contadores[nome]
+            print(f"  {classe.__name__:<13} {policy}: {total['hits']} acertos, "
+                  f"{total['evictions']} despejos, {total['expirations']} expirações")
+    print("✅ Despejo, expiração e invalidação iguais às do modelo, com as árvores sempre alinhadas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import random
+import sys
+import threading
+
+from rubro_negra import RedBlackTree, RED, BLACK
+from concorrente import ConcurrentTree
+
+
+def altura_negra(tree):
+    """Confere as propriedades rubro-negras e os tamanhos das subárvores."""
+    NULL = tree.NULL
+
+    def visitar(node):
+        if node is NULL:
+            return 1
+        if node.color == RED:
+            assert node.left.color == BLACK and node.right.color == BLACK, "vermelho com filho vermelho"
+        assert node.left is NULL or node.left.parent is node, "ponteiro de pai quebrado"
+        assert node.right is NULL or node.right.parent is node, "ponteiro de pai quebrado"
+        assert node.size == node.left.size + node.right.size + 1, "tamanho inconsistente"
+        esquerda, direita = visitar(node.left), visitar(node.right)
+        assert esquerda == direita, "alturas negras diferentes"
+        return esquerda + (node.color == BLACK)
+
+    assert tree.root.color == BLACK
+    return visitar(tree.root)
+
+
+escritores = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+leitores = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+operacoes = int(sys.argv[3]) if len(sys.argv) > 3 else 5000
+
+compartilhada = ConcurrentTree(RedBlackTree())
+erros = []
+
+
+def escritor(indice):
+    # Cada escritor cuida das chaves congruentes a `indice` módulo o número
+    # de escritores, então o conjunto final de cada um é previsível
+    rng = random.Random(indice)
+    meu = set()
+    for _ in range(operacoes):
+        chave = rng.randrange(operacoes) * escritores + indice
+        if rng.random() < 0.6:
+            compartilhada.insert(chave, indice)
+            meu.add(chave)
+        else:
+            compartilhada.pop(chave, None)
+            meu.discard(chave)
+    finais[indice] = meu
+
+
+def leitor(indice):
+    rng = random.Random(1000 + indice)
+    try:
+        for _ in range(operacoes // 10):
+            chave = rng.randrange(operacoes * escritores)
+            valor = compartilhada.get(chave)
+            assert valor is None or chave % escritores == valor, "valor de outra chave"
+            # O snapshot deve estar sempre em ordem e sem repetições
+            chaves = list(compartilhada.irange(chave, chave + 500))
+            assert chaves == sorted(set(chaves)), "snapshot fora de ordem"
+            assert all(chave <= k < chave + 500 for k in chaves)
+    except AssertionError as e:
+        erros.append(e)
+
+
+finais = [None] * escritores
+threads = [threading.Thread(target=escritor, args=(i,)) for i in range(escritores)]
+threads += [threading.Thread(target=leitor, args=(i,)) for i in range(leitores)]
+
+print(f"{escritores} escritores e {leitores} leitores, {operacoes} operações por escritor")
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+
+assert not erros, erros
+esperado = sorted(set().union(*finais))
+assert list(compartilhada) == esperado
+with compartilhada.reading() as tree:
+    print(f"Altura negra final: {altura_negra(tree)}, {len(tree)} chaves")
+print("✅ Árvore consistente após escritas e leituras concorrentes")
@@ -0,0 +1,69 @@
+import os
+import random
+import sys
+from bisect import bisect_left
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "arvore-2-3-4"))
+
+from rubro_negra import RedBlackTree
+from main import BTree, Tree234
+
+
+def caminhar(tree, seed, operacoes):
+    """Caminhada com localidade pelo cursor, conferida contra uma lista ordenada."""
+    rng = random.Random(seed)
+    cursor = tree.cursor()
+    oraculo, valores = [], {}
+    pos = None  # índice do cursor no oráculo; None = fora da árvore
+    for passo in range(operacoes):
+        sorteio = rng.random()
+        if sorteio < 0.3:
+            # Chave perto da posição atual, às vezes um salto qualquer
+            perto = pos is not None and rng.random() < 0.7
+            chave = oraculo[pos] + rng.randint(-20, 20) if perto else rng.randrange(2000)
+            nova = cursor.insert(chave, passo)
+            pos = bisect_left(oraculo, chave)
+            assert nova == (pos == len(oraculo) or oraculo[pos] != chave), f"insert({chave})"
+            if nova:
+                oraculo.insert(pos, chave)
+            valores[chave] = passo
+        elif sorteio < 0.45:
+            if pos is not None:
+                assert cursor.delete() == valores.pop(oraculo.pop(pos))
+                if pos == len(oraculo):
+                    pos = None
+        elif sorteio < 0.6:
+            chave = rng.randrange(-5, 2005)
+            achou = cursor.seek(chave)
+            pos = bisect_left(oraculo, chave)
+            assert achou == (pos < len(oraculo) and oraculo[pos] == chave), f"seek({chave})"
+            if pos == len(oraculo):
+                pos = None
+        elif sorteio < 0.8:
+            if pos is not None:
+                pos = pos + 1 if pos + 1 < len(oraculo) else None
+                assert cursor.next() == (pos is not None)
+        elif sorteio < 0.95:
+            if pos is not None:
+                pos = pos - 1 if pos > 0 else None
+                assert cursor.prev() == (pos is not None)
+        else:
+            cursor.first()
+            pos = 0 if oraculo else None
+
+        assert cursor.valid == (pos is not None), f"validade divergiu no passo {passo}"
+        if pos is not None:
+            assert cursor.key == oraculo[pos] and cursor.value == valores[oraculo[pos]]
+        if passo % 1000 == 0:
+            assert list(tree) == oraculo, f"iteração divergiu no passo {passo}"
+    assert list(tree) == oraculo and len(tree) == len(oraculo)
+    return len(oraculo)
+
+
+seed = int(sys.argv[1]) if len(sys.argv) > 1 else 2024
+operacoes = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+
+print(f"Cursor contra uma lista ordenada: seed={seed}, {operacoes} operações")
+for nome, tree in (("RedBlackTree", RedBlackTree()), ("Tree234", Tree234()), ("BTree(8)", BTree(order=8))):
+    print(f"{nome}: {caminhar(tree, seed, operacoes)} chaves no fim")
+print("✅ seek, next, prev, insert e delete pelo cursor concordam com a lista ordenada")
@@ -0,0 +1,188 @@
+import os
+import pickle
+import random
+import shutil
+import sys
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "arvore-2-3-4"))
+
+from rubro_negra import RedBlackTree
+from main import Tree234
+from duravel import _INSERT, DurableTree
+
+
+def carga(arvore, rng, operacoes, universo):
+    """Inserções e remoções aleatórias; devolve as operações que foram para o log."""
+    registradas = []
+    for passo in range(operacoes):
+        chave = rng.randrange(universo)
+        if rng.random() < 0.65:
+            arvore.insert(chave, passo)
+            registradas.append(("insert", chave, passo))
+        elif arvore.delete(chave):
+            registradas.append(("delete", chave, None))
+    return registradas
+
+
+def esperado(registradas):
+    estado = {}
+    for op, chave, valor in registradas:
+        if op == "insert":
+            estado[chave] = valor
+        else:
+            del estado[chave]
+    return estado
+
+
+def queda(arvore):
+    """Abandona a árvore sem close(), como numa queda do processo."""
+    if arvore._checkpointing is not None:
+        arvore._checkpointing.join()
+    arvore._stop.set()
+    ultimo = arvore._log_path(arvore._segment)
+    arvore._file.close()
+    # Meio registro no fim do log: a escrita interrompida pela queda
+    with open(ultimo, "ab") as f:
+        f.write(b"\x30\x00\x00\x00\x99\x99")
+
+
+seed = int(sys.argv[1]) if len(sys.argv) > 1 else 2024
+operacoes = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+rng = random.Random(seed)
+pasta = tempfile.mkdtemp()
+
+print(f"Queda e recuperação: seed={seed}, {operacoes} operações")
+cenarios = (
+    ("RedBlackTree, sync=always", RedBlackTree, {"sync": "always"}),
+    ("Tree234, sync=batch(100)", Tree234, {"sync": "batch", "batch_size": 100}),
+    ("RedBlackTree, sync=none", RedBlackTree, {"sync": "none"}),
+)
+for nome, classe, opcoes in cenarios:
+    diretorio = os.path.join(pasta, nome.split(",")[0] + opcoes["sync"])
+    arvore = DurableTree(classe, diretorio, checkpoint_every=operacoes // 3, **opcoes)
+    registradas = carga(arvore, rng, operacoes, operacoes // 5)
+    # Só o que teve fsync (ou, em "none", foi entregue ao sistema) sobrevive
+    confirmadas = arvore._synced_lsn if opcoes["sync"] != "none" else arvore._written_lsn
+    queda(arvore)
+
+    recuperada = DurableTree(classe, diretorio, **opcoes)
+    estado = esperado(registradas[:confirmadas])
+    assert dict(recuperada.items()) == estado, f"{nome}: estado recuperado diverge"
+    recuperada.tree.validate()
+    info = recuperada.recovery
+    print(f"{nome}: {len(registradas) - confirmadas} operações sem fsync perdidas, "
+          f"{info['checkpoint_keys']} chaves do checkpoint + {info['replayed']} do log")
+
+    # Continua escrevendo depois da recuperação e fecha normalmente
+    registradas = registradas[:confirmadas] + carga(recuperada, rng, 1000, operacoes // 5)
+    recuperada.close()
+    with DurableTree(classe, diretorio, **opcoes) as reaberta:
+        assert dict(reaberta.items()) == esperado(registradas), f"{nome}: reabertura diverge"
+
+# Checkpoint interrompido: o .tmp fica para trás e some ao abrir
+diretorio = os.path.join(pasta, "tmp")
+with DurableTree(RedBlackTree, diretorio, sync="none") as arvore:
+    arvore.insert(-1, "base")
+    arvore.checkpoint()
+sobra = os.path.join(diretorio, "checkpoint.00000099.arv.tmp")
+with open(sobra, "wb") as f:
+    f.write(b"checkpoint pela metade")
+arvore = DurableTree(RedBlackTree, diretorio, sync="none")
+assert not os.path.exists(sobra), "checkpoint .tmp não foi apagado ao abrir"
+assert arvore.get(-1) == "base"
+
+# Leitores em outras threads durante as escritas: get, in e items passam
+# pela trava e nunca veem a árvore no meio de uma rotação
+erros = []
+fim = threading.Event()
+
+
+def leitor(semente):
+    sorteio = random.Random(semente)
+    try:
+        while not fim.is_set():
+            chave = sorteio.randrange(500)
+            assert arvore.get(chave, 2 * chave) == 2 * chave, f"get({chave})"
+            assert (chave in arvore) in (True, False)
+            chaves = [k for k, _ in arvore.items()]
+            assert all(a < b for a, b in zip(chaves, chaves[1:])), "items fora de ordem"
+    except Exception as erro:
+        erros.append(erro)
+
+
+leitores = [threading.Thread(target=leitor, args=(seed + n,)) for n in range(3)]
+for t in leitores:
+    t.start()
+for passo in range(operacoes):
+    chave = rng.randrange(500)
+    if passo % 3:
+        arvore.insert(chave, 2 * chave)
+    else:
+        arvore.delete(chave)
+fim.set()
+for t in leitores:
+    t.join()
+arvore.close()
+assert not erros, f"leitor concorrente falhou: {erros[0]!r}"
+print(f"Checkpoint .tmp apagado ao abrir; 3 leitores sem erro durante {operacoes} escritas")
+
+# Chave que o checkpoint não saberia gravar: recusada no insert, antes do log
+diretorio = os.path.join(pasta, "falhas")
+arvore = DurableTree(RedBlackTree, diretorio, sync="batch", checkpoint_every=5)
+arvore.insert(1, "um")
+for chave, erro in (((1, 2), TypeError), ("1", TypeError), (2**70, OverflowError)):
+    lsn = arvore._lsn
+    try:
+        arvore.insert(chave)
+        raise AssertionError(f"insert aceitou {chave!r}")
+    except erro:
+        pass
+    assert arvore._lsn == lsn and len(arvore) == 1, f"{chave!r} foi registrada"
+
+# Checkpoint em fundo que falha: o erro sobe em checkpoint(), flush() e
+# close(), e os segmentos do log continuam lá para a recuperação
+arvore._checkpoint_path = lambda segmento: os.path.join(diretorio, "sem-pasta", f"{segmento}.arv")
+proxima = 2
+for chamada in (arvore.flush, arvore.checkpoint, arvore.close):
+    for chave in range(proxima, proxima + 5):
+        arvore.insert(chave, chave)     # checkpoint_every=5 dispara em fundo
+    proxima += 5
+    arvore._checkpointing.join()
+    try:
+        chamada()
+        raise AssertionError(f"{chamada.__name__}() não acusou o checkpoint que falhou")
+    except FileNotFoundError:
+        pass
+segmentos = [n for n in os.listdir(diretorio) if n.endswith(".log")]
+assert len(segmentos) > 1 and not any(n.endswith(".arv") for n in os.listdir(diretorio))
+with DurableTree(RedBlackTree, diretorio) as reaberta:
+    assert dict(reaberta.items()) == {1: "um", **{k: k for k in range(2, proxima)}}
+    assert reaberta.checkpoint() is True
+assert [n for n in os.listdir(diretorio) if n.endswith(".log")] != segmentos
+print(f"Chaves de outro tipo recusadas; checkpoint que falhou acusado, {len(segmentos)} segmentos preservados")
+
+# Escritor parado entre soltar a trava e o fsync: em "always", a leitura
+# que vê a chave nova espera o fsync dela; em "batch", não espera
+consultas = {
+    "get": lambda arvore, k: arvore.get(k) == k,
+    "in": lambda arvore, k: k in arvore,
+    "[]": lambda arvore, k: arvore[k] == k,
+    "len": lambda arvore, k: len(arvore) >= 1,
+    "iter": lambda arvore, k: k in list(arvore),
+    "items": lambda arvore, k: (k, k) in list(arvore.items()),
+}
+for sync in ("always", "batch"):
+    with DurableTree(RedBlackTree, os.path.join(pasta, "leitura-" + sync), sync=sync) as arvore:
+        for chave, (nome, consulta) in enumerate(consultas.items()):
+            with arvore._lock:
+                arvore.tree.insert(chave, chave)
+                lsn = arvore._append(_INSERT, pickle.dumps((chave, chave)))
+            assert arvore._synced_lsn < lsn and consulta(arvore, chave), f"{sync}/{nome}"
+            assert (arvore._synced_lsn >= lsn) == (sync == "always"), \
+                f"{sync}/{nome}: leitura com fsync pendente: {arvore._synced_lsn} < {lsn}"
+print(f"Em sync=always, {len(consultas)} tipos de consulta esperam o fsync do que leem")
+
+shutil.rmtree(pasta)
+print("✅ Depois da queda, cada árvore voltou exatamente ao estado confirmado no log")
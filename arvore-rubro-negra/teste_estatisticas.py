@@ -0,0 +1,176 @@
+import json
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "arvore-2-3-4"))
+
+from rubro_negra import Node, RedBlackTree
+from main import BTree
+
+
+class NoConferido(Node):
+    """Nó que conta as próprias trocas de cor feitas dentro de um fix_*."""
+
+    __slots__ = ("_cor",)
+    # Árvore que está num fix_* agora (None fora deles)
+    contando = None
+
+    @property
+    def color(self):
+        return self._cor
+
+    @color.setter
+    def color(self, cor):
+        arvore = NoConferido.contando
+        if arvore is not None and cor != self._cor:
+            arvore.recoloracoes += 1
+        self._cor = cor
+
+
+class Conferida(RedBlackTree):
+    """Conta rotações e recolorações por fora dos ganchos, nos próprios nós."""
+
+    node_class = NoConferido
+
+    def __init__(self):
+        super().__init__()
+        self.rotacoes = 0
+        self.recoloracoes = 0
+
+    def fix_insert(self, k):
+        NoConferido.contando = self
+        try:
+            return super().fix_insert(k)
+        finally:
+            NoConferido.contando = None
+
+    def fix_delete(self, x, parent):
+        NoConferido.contando = self
+        try:
+            super().fix_delete(x, parent)
+        finally:
+            NoConferido.contando = None
+
+    def rotate_left(self, x):
+        self.rotacoes += 1
+        super().rotate_left(x)
+
+    def rotate_right(self, y):
+        self.rotacoes += 1
+        super().rotate_right(y)
+
+
+def descida(arvore, chave):
+    """(profundidade, comparações) da busca por chave, contadas aqui."""
+    no, profundidade = arvore.root, 0
+    while no is not arvore.NULL:
+        profundidade += 1
+        if chave == no.key:
+            return profundidade, 2 * profundidade - 1
+        no = no.left if chave < no.key else no.right
+    return profundidade, 2 * profundidade
+
+
+def rubro_negra(rng, operacoes):
+    arvore = Conferida()
+    stats = arvore.enable_stats(log=True)
+    assert type(arvore).__name__ == "Conferida" and isinstance(arvore, Conferida)
+    esperado = {}
+    contagem = {"insert": 0, "delete": 0, "search": 0}
+    for passo in range(operacoes):
+        chave = rng.randrange(operacoes // 4)
+        sorteio = rng.random()
+        profundidade, comparacoes = descida(arvore, chave)
+        if sorteio < 0.4:
+            arvore[chave] = passo              # __setitem__ -> insert conta uma vez
+            esperado[chave] = passo
+            contagem["insert"] += 1
+        elif sorteio < 0.7:
+            assert arvore.pop(chave, None) == esperado.pop(chave, None)
+            contagem["delete"] += 1
+        else:
+            assert arvore.get(chave) == esperado.get(chave)
+            contagem["search"] += 1
+        registro = stats.log[-1]
+        assert (registro["depth"], registro["comparisons"]) == (profundidade, comparacoes), \
+            f"passo {passo}: descida {registro} != {(profundidade, comparacoes)}"
+
+    for op, n in contagem.items():
+        assert stats.totals[op] == n, f"totals[{op!r}] = {stats.totals[op]}, esperado {n}"
+        for metrica in ("depth", "ns", "rotations"):
+            assert sum(c for _, c in stats.histogram(op, metrica)) == n, f"histograma {op}/{metrica}"
+    assert all(v & (v - 1) == 0 for v, _ in stats.histogram("insert", "ns")), "faixas de ns"
+    assert stats.totals["rotations"] == arvore.rotacoes, \
+        f"rotações: {stats.totals['rotations']} contadas, {arvore.rotacoes} reais"
+    assert stats.totals["recolors"] == arvore.recoloracoes, \
+        f"recolorações: {stats.totals['recolors']} contadas, {arvore.recoloracoes} reais"
+    assert sum(r["rotations"] for r in stats.log) == arvore.rotacoes, "registro por operação"
+    assert stats.totals["comparisons"] == sum(r["comparisons"] for r in stats.log)
+
+    # JSON, reset e desligamento
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "stats.json")
+        stats.save_json(caminho)
+        with open(caminho, encoding="utf-8") as f:
+            salvo = json.load(f)
+    assert salvo["totals"]["insert"] == contagem["insert"] and len(salvo["log"]) == operacoes
+    assert stats.summary().count("\n") == 2
+    stats.reset()
+    assert not stats.totals and not stats.histograms and not stats.log
+    assert arvore.disable_stats() is stats and type(arvore) is Conferida and arvore.stats is None
+    arvore.insert(-1)
+    assert not stats.totals, "árvore com estatísticas desligadas ainda conta"
+    arvore.validate()
+    assert list(arvore.items())[1:] == sorted(esperado.items())
+    return arvore.rotacoes, arvore.recoloracoes
+
+
+def contar_nos(arvore):
+    total, pilha = 0, [arvore.root]
+    while pilha:
+        no = pilha.pop()
+        total += 1
+        pilha += no.children
+    return total
+
+
+def arvore_b(rng, operacoes, ordem):
+    # Cada split cria um nó e cada fusão elimina um; o crescimento e a
+    # redução da raiz mudam a altura. Logo nós - altura = splits - fusões
+    arvore = BTree(order=ordem)
+    stats = arvore.enable_stats()
+    esperado = {}
+    for passo in range(operacoes):
+        chave = rng.randrange(operacoes // 4)
+        if rng.random() < 0.55:
+            arvore.insert(chave, passo)
+            esperado[chave] = passo
+        else:
+            assert arvore.pop(chave, None) == esperado.pop(chave, None)
+        if passo % 100 == 0:
+            altura = arvore.validate()
+            assert contar_nos(arvore) - altura == stats.totals["splits"] - stats.totals["merges"], \
+                f"ordem {ordem}, passo {passo}: nós e splits/fusões não batem"
+    assert stats.totals["borrows"] > 0 and stats.totals["merges"] > 0
+    arvore.disable_stats()
+    assert type(arvore) is BTree
+    return stats.totals["splits"], stats.totals["merges"], stats.totals["borrows"]
+
+
+def main():
+    seed = int(sys.argv[1]) if len(sys.argv) > 1 else 2024
+    operacoes = int(sys.argv[2]) if len(sys.argv) > 2 else 4000
+    rng = random.Random(seed)
+    print(f"Contadores de TreeStats: seed={seed}, {operacoes} operações")
+    rotacoes, recoloracoes = rubro_negra(rng, operacoes)
+    print(f"RedBlackTree: {rotacoes} rotações e {recoloracoes} recolorações, iguais às contadas por fora")
+    for ordem in (4, 8):
+        splits, fusoes, emprestimos = arvore_b(rng, operacoes, ordem)
+        print(f"BTree(order={ordem}): {splits} splits, {fusoes} fusões, {emprestimos} empréstimos")
+    print("✅ Profundidade, comparações e eventos de rebalanceamento batem com a árvore")
+
+
+if __name__ == "__main__":
+    main()
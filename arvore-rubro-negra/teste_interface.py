@@ -0,0 +1,103 @@
+import os
+import random
+import sys
+import tempfile
+from itertools import islice
+
+import rubro_negra  # noqa: F401 (coloca ../comum no caminho de importação)
+from arvore_ordenada import ENGINES, SortedTree, engine_class, make_tree
+
+
+def conferir(arvore, esperado, nome):
+    chaves = sorted(esperado)
+    assert len(arvore) == len(esperado), f"{nome}: len"
+    assert list(arvore.items()) == sorted(esperado.items()), f"{nome}: items"
+    assert list(arvore.keys(reverse=True)) == chaves[::-1], f"{nome}: keys(reverse=True)"
+    if chaves:
+        assert (arvore.min(), arvore.max()) == (chaves[0], chaves[-1]), f"{nome}: min/max"
+    arvore.validate()
+
+
+seed = int(sys.argv[1]) if len(sys.argv) > 1 else 2024
+operacoes = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+
+print(f"Interface SortedTree em todos os motores: seed={seed}, {operacoes} operações")
+for motor in ENGINES:
+    try:
+        classe = engine_class(motor)
+    except ImportError as erro:
+        print(f"  {motor:<6} pulado ({erro})")
+        continue
+    rng = random.Random(seed)
+    arvore = make_tree(motor)
+    assert isinstance(arvore, SortedTree)
+    try:
+        arvore.min()
+        raise AssertionError(f"{motor}: min() de árvore vazia")
+    except ValueError:
+        pass
+    esperado = {}
+
+    for passo in range(operacoes):
+        chave = rng.randrange(operacoes // 5 + 1)
+        sorteio = rng.random()
+        if sorteio < 0.3:
+            assert arvore.insert(chave, passo) == (chave not in esperado), f"{motor}: insert({chave})"
+            esperado[chave] = passo
+        elif sorteio < 0.4:
+            arvore[chave] = -passo
+            esperado[chave] = -passo
+        elif sorteio < 0.5:
+            assert arvore.setdefault(chave, passo) == esperado.setdefault(chave, passo), f"{motor}: setdefault"
+        elif sorteio < 0.65:
+            assert arvore.pop(chave, None) == esperado.pop(chave, None), f"{motor}: pop({chave})"
+        elif sorteio < 0.7:
+            presente = chave in esperado
+            try:
+                del arvore[chave]
+            except KeyError:
+                assert not presente, f"{motor}: KeyError em del de chave presente"
+            else:
+                assert presente, f"{motor}: del de chave ausente sem KeyError"
+                del esperado[chave]
+        elif sorteio < 0.85:
+            menores = [k for k in esperado if k <= chave]
+            maiores = [k for k in esperado if k >= chave]
+            assert arvore.floor(chave) == (max(menores) if menores else None), f"{motor}: floor({chave})"
+            assert arvore.ceiling(chave) == (min(maiores) if maiores else None), f"{motor}: ceiling({chave})"
+            assert list(arvore.iter_from(chave))[:5] == sorted(maiores)[:5], f"{motor}: iter_from({chave})"
+            assert list(islice(arvore.items_from(chave), 5)) == \
+                [(k, esperado[k]) for k in sorted(maiores)[:5]], f"{motor}: items_from({chave})"
+            assert list(islice(arvore.items_from(chave, reverse=True), 5)) == \
+                [(k, esperado[k]) for k in sorted(menores, reverse=True)[:5]], f"{motor}: items_from reverso"
+        else:
+            assert arvore.get(chave) == esperado.get(chave), f"{motor}: get({chave})"
+            assert (chave in arvore) == (chave in esperado), f"{motor}: in"
+        if passo % 500 == 0:
+            arvore.validate()
+    conferir(arvore, esperado, motor)
+
+    # Lotes
+    lote = [rng.randrange(operacoes) for _ in range(300)]
+    novas = len(set(lote) - set(esperado))
+    assert arvore.insert_many(lote, lote) == novas, f"{motor}: insert_many"
+    esperado.update(zip(lote, lote))
+    consulta = lote[:50] + [-1, -2]
+    assert arvore.get_many(consulta) == [esperado.get(k) for k in consulta], f"{motor}: get_many"
+    assert arvore.contains_many(consulta) == [k in esperado for k in consulta], f"{motor}: contains_many"
+    removidas = rng.sample(sorted(esperado), len(esperado) // 3) + [-1]
+    assert arvore.delete_many(removidas) == len(removidas) - 1, f"{motor}: delete_many"
+    for chave in removidas[:-1]:
+        del esperado[chave]
+    conferir(arvore, esperado, motor)
+
+    # from_sorted e disco
+    copia = classe.from_sorted(list(esperado), list(esperado.values()))
+    conferir(copia, esperado, motor)
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "arvore.arv")
+        arvore.save(caminho)
+        conferir(classe.load(caminho), esperado, motor)
+    print(f"  {motor:<6} {classe.__name__:<24} {len(arvore):>5} chaves no fim")
+
+print("✅ Todos os motores seguem a interface SortedTree e concordam com um dict")
@@ -0,0 +1,63 @@
+import random
+import sys
+
+from rubro_negra_intervalos import IntervalTree
+
+
+def sobrepostos(intervalos, inicio, fim):
+    """Força bruta: todos os intervalos que tocam [inicio, fim], em ordem."""
+    return sorted((k, v) for k, v in intervalos.items() if k[0] <= fim and inicio <= k[1])
+
+
+seed = int(sys.argv[1]) if len(sys.argv) > 1 else 2024
+operacoes = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+rng = random.Random(seed)
+
+
+def sortear():
+    inicio = rng.randrange(10_000)
+    return (inicio, inicio + int(rng.expovariate(1 / 100)), rng.randrange(3))
+
+
+arvore = IntervalTree()
+intervalos = {}
+consultas = 0
+print(f"Árvore de intervalos contra força bruta: seed={seed}, {operacoes} operações")
+for passo in range(operacoes):
+    sorteio = rng.random()
+    if sorteio < 0.55:
+        chave = sortear()
+        arvore.insert(chave, passo)
+        intervalos[chave] = passo
+    elif sorteio < 0.75:
+        chave = rng.choice(list(intervalos)) if intervalos and rng.random() < 0.8 else sortear()
+        assert arvore.pop(chave, None) == intervalos.pop(chave, None), f"pop({chave})"
+    elif sorteio < 0.8:
+        # Lotes e cursor passam por _finger_insert e _delete_node
+        lote = [sortear() for _ in range(rng.randrange(1, 30))]
+        arvore.insert_many(lote, [passo] * len(lote))
+        intervalos.update(dict.fromkeys(lote, passo))
+        removidas = rng.sample(list(intervalos), min(len(intervalos), 3))
+        arvore.delete_many(removidas)
+        for chave in removidas:
+            del intervalos[chave]
+    else:
+        inicio = rng.randrange(-50, 10_200)
+        fim = inicio + rng.choice((0, 0, 10, 500))
+        assert list(arvore.overlap(inicio, fim)) == sobrepostos(intervalos, inicio, fim), \
+            f"overlap({inicio}, {fim}) divergiu no passo {passo}"
+        consultas += 1
+    if passo % 500 == 0:
+        arvore.validate()
+
+arvore.validate()
+assert dict(arvore.items()) == intervalos
+# split e union recalculam o aumento dos pedaços
+menores, maiores = arvore.split((5_000,))
+menores.validate()
+maiores.validate()
+assert list(maiores.stab(6_000)) == sobrepostos(intervalos, 6_000, 6_000)
+arvore = menores.union(maiores)
+arvore.validate()
+print(f"{len(arvore)} intervalos no fim, {consultas} consultas conferidas")
+print("✅ stab e overlap concordam com a força bruta e max_end confere em todos os nós")
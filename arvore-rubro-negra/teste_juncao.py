@@ -0,0 +1,79 @@
+import random
+import sys
+
+from rubro_negra import RedBlackTree, RED, BLACK
+
+
+def altura_negra(tree):
+    """Confere ordem, cores, pais, tamanhos e altura negra da árvore."""
+    NULL = tree.NULL
+
+    def visitar(node, pai, lo, hi):
+        if node is NULL:
+            return 1
+        assert node.parent is pai, "ponteiro de pai quebrado"
+        assert (lo is None or lo < node.key) and (hi is None or node.key < hi), "fora de ordem"
+        if node.color == RED:
+            assert node.left.color == BLACK and node.right.color == BLACK, "vermelho com filho vermelho"
+        assert node.size == node.left.size + node.right.size + 1, "tamanho inconsistente"
+        esquerda = visitar(node.left, node, lo, node.key)
+        direita = visitar(node.right, node, node.key, hi)
+        assert esquerda == direita, "alturas negras diferentes"
+        return esquerda + (node.color == BLACK)
+
+    assert tree.root is NULL or tree.root.color == BLACK
+    return visitar(tree.root, None, None, None)
+
+
+def montar(chaves, rotulo):
+    arvore = RedBlackTree()
+    for chave in chaves:
+        arvore.insert(chave, (rotulo, chave))
+    return arvore
+
+
+seed = int(sys.argv[1]) if len(sys.argv) > 1 else 2024
+rodadas = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+rng = random.Random(seed)
+
+print(f"split, join e operações de conjunto contra set: seed={seed}, {rodadas} rodadas")
+for _ in range(rodadas):
+    a = set(rng.sample(range(500), rng.randrange(200)))
+    b = set(rng.sample(range(500), rng.randrange(200)))
+    corte = rng.randrange(-10, 510)
+
+    menores, maiores = montar(a, "a").split(corte)
+    altura_negra(menores)
+    altura_negra(maiores)
+    assert list(menores) == sorted(k for k in a if k < corte)
+    assert list(maiores) == sorted(k for k in a if k >= corte)
+
+    # join com alturas negras bem diferentes dos dois lados
+    lado = set(rng.sample(range(500), rng.randrange(5)))
+    esquerda = montar((k for k in a | lado if k < corte), "a")
+    direita = montar((k for k in b if k > corte), "b")
+    juntas = RedBlackTree.join(esquerda, corte, direita, "pivô")
+    altura_negra(juntas)
+    assert len(esquerda) == len(direita) == 0
+    assert list(juntas) == sorted({k for k in a | lado if k < corte} | {corte} | {k for k in b if k > corte})
+    assert juntas[corte] == "pivô"
+
+    uniao = montar(a, "a").union(montar(b, "b"))
+    intersecao = montar(a, "a").intersection(montar(b, "b"))
+    diferenca = montar(a, "a").difference(montar(b, "b"))
+    for arvore in (uniao, intersecao, diferenca):
+        altura_negra(arvore)
+    assert list(uniao.items()) == sorted({**{k: ("a", k) for k in a}, **{k: ("b", k) for k in b}}.items())
+    assert list(intersecao.items()) == sorted((k, ("a", k)) for k in a & b)
+    assert list(diferenca) == sorted(a - b)
+
+    # O resultado continua sendo uma árvore comum
+    for chave in rng.sample(range(500), 50):
+        if rng.random() < 0.5:
+            uniao.insert(chave)
+        else:
+            uniao.pop(chave, None)
+    altura_negra(uniao)
+
+print(f"Última união: {len(uniao)} chaves, altura negra {altura_negra(uniao)}")
+print("✅ split, join, union, intersection e difference concordam com set em todas as rodadas")
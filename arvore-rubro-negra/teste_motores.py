@@ -0,0 +1,88 @@
+import random
+import sys
+
+from rubro_negra import RedBlackTree, BLACK
+from rubro_negra_numpy import NumpyRedBlackTree
+
+
+def altura_negra(tree):
+    """Confere as propriedades rubro-negras do motor NumPy e devolve a altura negra."""
+    color, left, right = tree._color, tree._left, tree._right
+
+    def visitar(node):
+        if node == 0:
+            return 1
+        if color[node] != BLACK:
+            assert color[left[node]] == BLACK and color[right[node]] == BLACK, "vermelho com filho vermelho"
+        esquerda, direita = visitar(left[node]), visitar(right[node])
+        assert esquerda == direita, "alturas negras diferentes"
+        return esquerda + (color[node] == BLACK)
+
+    assert color[tree.root] == BLACK
+    return visitar(tree.root)
+
+
+seed = int(sys.argv[1]) if len(sys.argv) > 1 else 2024
+operacoes = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+rng = random.Random(seed)
+
+objetos = RedBlackTree()
+vetores = NumpyRedBlackTree(capacity=4)
+
+print(f"Comparando RedBlackTree e NumpyRedBlackTree: seed={seed}, {operacoes} operações")
+for passo in range(operacoes):
+    chave = rng.randrange(operacoes // 10 + 1)
+    sorteio = rng.random()
+
+    if sorteio < 0.4:
+        assert objetos.insert(chave, passo) == vetores.insert(chave, passo)
+    elif sorteio < 0.7:
+        assert objetos.pop(chave, None) == vetores.pop(chave, None)
+    elif sorteio < 0.8:
+        lote = [rng.randrange(operacoes // 10 + 1) for _ in range(rng.randrange(1, 50))]
+        assert objetos.contains_many(lote) == vetores.contains_many(lote)
+        if sorteio < 0.75:
+            assert objetos.insert_many(lote, lote) == vetores.insert_many(lote, lote)
+        else:
+            assert objetos.delete_many(lote) == vetores.delete_many(lote)
+    else:
+        assert (chave in objetos) == (chave in vetores)
+        assert objetos.get(chave) == vetores.get(chave)
+        assert objetos.rank(chave) == vetores.rank(chave)
+        assert objetos.count_range(chave, chave + 50) == vetores.count_range(chave, chave + 50)
+        assert list(objetos.irange(chave, chave + 20)) == list(vetores.irange(chave, chave + 20))
+        assert list(objetos.iter_from(chave, reverse=True))[:10] == \
+            list(vetores.iter_from(chave, reverse=True))[:10]
+        if len(objetos):
+            k = rng.randrange(len(objetos))
+            assert objetos.select(k) == vetores.select(k)
+
+    assert len(objetos) == len(vetores)
+    if passo % 1000 == 0:
+        assert list(objetos.items()) == list(vetores.items())
+        altura_negra(vetores)
+
+copia = NumpyRedBlackTree.from_sorted(objetos.keys(), objetos.values())
+assert list(copia.items()) == list(objetos.items())
+altura_negra(copia)
+
+# Chaves que não cabem sem perda no dtype são recusadas sem tocar na árvore
+antes = list(vetores.items())
+for ruim in (2.5, 2 ** 70, "x"):
+    try:
+        vetores.insert(ruim, "ruim")
+        raise AssertionError(f"insert({ruim!r}) aceito num vetor int64")
+    except (ValueError, OverflowError, TypeError):
+        pass
+    try:
+        vetores.insert_many(list(range(len(vetores) * 4)) + [ruim])
+        raise AssertionError(f"insert_many com {ruim!r} aceito num vetor int64")
+    except (ValueError, OverflowError, TypeError):
+        pass
+assert list(vetores.items()) == antes
+# Todo índice já usado está na árvore ou na lista de livres
+assert len(vetores) + len(vetores._free) == vetores._next - 1, "índice de chave recusada perdido"
+vetores.validate()
+
+print(f"Tamanho final: {len(objetos)} chaves, capacidade dos vetores: {vetores.capacity}")
+print("✅ Os dois motores produziram os mesmos resultados em todas as operações")
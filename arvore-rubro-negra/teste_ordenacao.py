@@ -0,0 +1,138 @@
+import os
+import random
+import sys
+from collections import namedtuple
+from operator import attrgetter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "arvore-2-3-4"))
+
+from rubro_negra import RedBlackTree
+from main import BTree, Tree234
+from ordenacao import KeyedTree
+
+Evento = namedtuple("Evento", "instante id nome")
+
+
+class SemOrdem:
+    """Registro sem __lt__ nem __eq__ úteis: só a chave derivada ordena."""
+
+    __slots__ = ("peso", "rotulo")
+
+    def __init__(self, peso, rotulo):
+        self.peso = peso
+        self.rotulo = rotulo
+
+    def __lt__(self, other):
+        raise AssertionError("a árvore comparou registros em vez das chaves derivadas")
+
+    __gt__ = __le__ = __ge__ = __lt__
+
+
+def conferir(arvore, esperado, reverse, nome):
+    """Compara toda a ordem com a de sorted(key=..., reverse=...) sobre o dict."""
+    em_ordem = sorted(esperado.items(), reverse=reverse)
+    itens = [entrada for _, entrada in em_ordem]
+    assert len(arvore) == len(esperado), f"{nome}: len"
+    assert list(arvore.items()) == itens, f"{nome}: items"
+    assert list(arvore) == [r for r, _ in itens], f"{nome}: iteração"
+    assert list(reversed(arvore)) == [r for r, _ in itens][::-1], f"{nome}: reversed"
+    assert list(arvore.values(reverse=True)) == [v for _, v in itens][::-1], f"{nome}: values(reverse)"
+    if itens:
+        assert arvore.min() is itens[0][0] and arvore.max() is itens[-1][0], f"{nome}: min/max"
+    chaves = [k for k, _ in em_ordem]
+    for lo, hi in ((None, None), (chaves[len(chaves) // 3] if chaves else 0, None),
+                   (None, (50, 0)), ((20, 0), (80, 0)), ((90, 0), (10, 0))):
+        dentro = [e for k, e in em_ordem if (lo is None or k >= lo) and (hi is None or k < hi)]
+        assert list(arvore.irange(lo, hi)) == dentro, f"{nome}: irange({lo}, {hi})"
+
+
+def contra_dict(classe, reverse, rng, operacoes):
+    nome = f"{classe.__name__}, reverse={reverse}"
+    chave = attrgetter("instante", "id")
+    arvore = KeyedTree(classe(), key=chave, reverse=reverse)
+    esperado = {}   # chave derivada -> (registro, valor)
+    for passo in range(operacoes):
+        registro = Evento(rng.randrange(100), rng.randrange(3), f"e{passo}")
+        derivada = chave(registro)
+        sorteio = rng.random()
+        if sorteio < 0.4:
+            # Mesmo (instante, id) com outro nome: substitui, como num dict por chave
+            assert arvore.insert(registro, passo) == (derivada not in esperado), f"{nome}: insert"
+            esperado[derivada] = (registro, passo)
+        elif sorteio < 0.6:
+            assert arvore.pop(registro, None) == esperado.pop(derivada, (None, None))[1], f"{nome}: pop"
+        elif sorteio < 0.8:
+            assert arvore.get(registro) == esperado.get(derivada, (None, None))[1], f"{nome}: get"
+            assert (registro in arvore) == (derivada in esperado), f"{nome}: in"
+            guardado = esperado.get(derivada, (None,))[0]
+            assert arvore.find(derivada) is guardado, f"{nome}: find"
+        else:
+            lote = [Evento(rng.randrange(100), rng.randrange(3), f"l{passo}.{i}") for i in range(20)]
+            if rng.random() < 0.5:
+                novas = len({chave(r) for r in lote} - set(esperado))
+                assert arvore.insert_many(lote, range(20)) == novas, f"{nome}: insert_many"
+                for i, r in enumerate(lote):
+                    esperado[chave(r)] = (r, i)
+            else:
+                consulta = lote + [r for r, _ in list(esperado.values())[:5]]
+                assert arvore.get_many(consulta, -1) == \
+                    [esperado.get(chave(r), (None, -1))[1] for r in consulta], f"{nome}: get_many"
+                assert arvore.contains_many(consulta) == [chave(r) in esperado for r in consulta]
+                existentes = len({chave(r) for r in lote} & set(esperado))
+                assert arvore.delete_many(lote) == existentes, f"{nome}: delete_many"
+                for r in lote:
+                    esperado.pop(chave(r), None)
+        if passo % 200 == 0:
+            conferir(arvore, esperado, reverse, nome)
+    conferir(arvore, esperado, reverse, nome)
+    arvore.tree.validate()
+    return len(arvore)
+
+
+def casos_de_borda(classe):
+    nome = classe.__name__
+    for reverse in (False, True):
+        vazia = KeyedTree(classe(), key=attrgetter("peso"), reverse=reverse)
+        assert list(vazia.irange()) == [] and list(vazia.irange((5,), (1,))) == []
+        try:
+            vazia.min()
+            raise AssertionError(f"{nome}: min() de árvore vazia")
+        except ValueError:
+            pass
+        try:
+            vazia.pop(SemOrdem(1, "x"))
+            raise AssertionError(f"{nome}: pop sem default de registro ausente")
+        except KeyError:
+            pass
+
+    # Registros que não se comparam: só a chave derivada entra nas descidas
+    pesos = KeyedTree(classe(), key=attrgetter("peso"), reverse=True)
+    registros = [SemOrdem(p, f"r{p}") for p in (5, 1, 9, 3, 7)]
+    for r in registros:
+        pesos[r] = r.rotulo
+    assert [r.peso for r in pesos] == [9, 7, 5, 3, 1], f"{nome}: reverse"
+    assert [r.peso for r, _ in pesos.irange(2, 8)] == [7, 5, 3], f"{nome}: irange reverso"
+    assert pesos.find(3).rotulo == "r3" and pesos[SemOrdem(9, "outro")] == "r9"
+    del pesos[SemOrdem(9, "outro")]
+    assert pesos.min().peso == 7 and pesos.max().peso == 1
+
+    # Sem key: o próprio registro é a chave, como em sorted()
+    simples = KeyedTree(classe())
+    simples.insert_many(["b", "a", "c", "a"], [1, 2, 3, 4])
+    assert list(simples.items()) == [("a", 4), ("b", 1), ("c", 3)], f"{nome}: chave identidade"
+
+
+def main():
+    seed = int(sys.argv[1]) if len(sys.argv) > 1 else 2024
+    operacoes = int(sys.argv[2]) if len(sys.argv) > 2 else 3000
+    rng = random.Random(seed)
+    print(f"KeyedTree contra sorted(key=..., reverse=...): seed={seed}, {operacoes} operações")
+    for classe in (RedBlackTree, Tree234, BTree):
+        casos_de_borda(classe)
+        tamanhos = [contra_dict(classe, reverse, rng, operacoes) for reverse in (False, True)]
+        print(f"  {classe.__name__:<13} {tamanhos[0]} e {tamanhos[1]} registros no fim (reverse=False/True)")
+    print("✅ KeyedTree ordena, busca e intervala só pelas chaves derivadas, nos dois sentidos")
+
+
+if __name__ == "__main__":
+    main()
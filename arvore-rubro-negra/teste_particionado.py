@@ -0,0 +1,68 @@
+import os
+import random
+import sys
+
+from rubro_negra import RedBlackTree
+from particionado import ShardedTree
+
+PROCESSO_PRINCIPAL = os.getpid()
+
+
+class ChaveQuebrada(int):
+    """Chave que se compara normalmente aqui e falha dentro do processo de trabalho."""
+
+    def __lt__(self, other):
+        if os.getpid() != PROCESSO_PRINCIPAL:
+            raise TypeError("comparação recusada no processo de trabalho")
+        return int(self) < other
+
+
+def main():
+    seed = int(sys.argv[1]) if len(sys.argv) > 1 else 2024
+    rng = random.Random(seed)
+    print(f"ShardedTree contra um dict: seed={seed}")
+
+    with ShardedTree(RedBlackTree, shards=2, split_points=[50]) as arvore:
+        esperado = {k: 10 * k for k in range(100)}
+        arvore.insert_many(list(esperado), list(esperado.values()))
+
+        # Erro numa partição: a outra já respondeu e a resposta não pode
+        # ficar no pipe para a chamada seguinte
+        try:
+            arvore.get_many([ChaveQuebrada(7), 99])
+            raise AssertionError("erro na partição 0 não chegou ao chamador")
+        except TypeError:
+            pass
+        for chave in (98, 97, 3):
+            assert arvore.get(chave) == esperado[chave], f"get({chave}) desalinhado depois do erro"
+        assert arvore.get_many([1, 60]) == [10, 600]
+
+        # pop: KeyError sem padrão, padrão quando pedido, tamanho atualizado
+        assert arvore.pop(60) == 600
+        del esperado[60]
+        try:
+            arvore.pop(60)
+            raise AssertionError("pop de chave ausente sem padrão não levantou KeyError")
+        except KeyError:
+            pass
+        assert arvore.pop(60, None) is None
+        assert len(arvore) == len(esperado)
+
+        for passo in range(2000):
+            chave = rng.randrange(200)
+            sorteio = rng.random()
+            if sorteio < 0.4:
+                assert arvore.insert(chave, passo) == (chave not in esperado)
+                esperado[chave] = passo
+            elif sorteio < 0.7:
+                assert arvore.pop(chave, "ausente") == esperado.pop(chave, "ausente"), f"pop({chave})"
+            else:
+                assert arvore.get(chave) == esperado.get(chave), f"get({chave})"
+        assert list(arvore.items()) == sorted(esperado.items())
+        assert len(arvore) == len(esperado)
+        print(f"{len(arvore)} chaves em {arvore.shards} partições, tamanhos {arvore.shard_sizes()}")
+    print("✅ Respostas alinhadas depois de erro numa partição e pop igual ao de um dict")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import os
+import pickle
+import random
+import shutil
+import struct
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "arvore-2-3-4"))
+
+from rubro_negra import RedBlackTree
+from main import BTree
+from persistencia import HEADER_SIZE, MappedTree
+
+ARQUIVOS_ABERTOS = "/proc/self/fd"
+
+
+def descritores():
+    """Quantidade de arquivos abertos pelo processo (None fora do Linux)."""
+    if not os.path.isdir(ARQUIVOS_ABERTOS):
+        return None
+    return len(os.listdir(ARQUIVOS_ABERTOS))
+
+
+def conferir_mapeada(mapeada, esperado):
+    chaves = sorted(esperado)
+    assert len(mapeada) == len(chaves)
+    assert list(mapeada.items()) == sorted(esperado.items()), "items"
+    assert list(mapeada.keys(reverse=True)) == chaves[::-1], "keys(reverse=True)"
+    if not chaves:
+        return
+    assert (mapeada.min(), mapeada.max()) == (chaves[0], chaves[-1]), "min/max"
+    meio = chaves[len(chaves) // 2]
+    assert mapeada[meio] == esperado[meio] and meio in mapeada, f"[{meio!r}]"
+    assert mapeada.rank(meio) == len(chaves) // 2 and mapeada.select(len(chaves) // 2) == meio
+    assert list(mapeada.iter_from(meio))[:3] == chaves[len(chaves) // 2:][:3], "iter_from"
+    assert list(mapeada.iter_from(meio, reverse=True))[:3] == chaves[:len(chaves) // 2 + 1][::-1][:3]
+    assert list(mapeada.items_from(meio))[:3] == [(k, esperado[k]) for k in chaves[len(chaves) // 2:][:3]]
+    assert list(mapeada.irange(chaves[1], meio)) == chaves[1:len(chaves) // 2], "irange"
+
+
+def ida_e_volta(pasta, rng):
+    """Grava e relê cada tipo de chave, com e sem valores, nas duas árvores."""
+    geradores = {
+        "int": lambda: rng.randrange(-10**12, 10**12),
+        "float": lambda: rng.uniform(-1e6, 1e6),
+        "str": lambda: "".join(rng.choice("abcçãé🌳") for _ in range(rng.randrange(0, 12))),
+        "bytes": lambda: bytes(rng.randrange(256) for _ in range(rng.randrange(0, 12))),
+    }
+    caminho = os.path.join(pasta, "arvore.arv")
+    for classe in (RedBlackTree, BTree):
+        for tipo, gerar in geradores.items():
+            for com_valores in (True, False):
+                esperado = {}
+                for passo in range(500):
+                    esperado[gerar()] = (passo, tipo) if com_valores else None
+                arvore = classe.from_sorted(list(esperado), list(esperado.values()))
+                arvore.save(caminho)
+                assert not os.path.exists(caminho + ".tmp"), "save deixou o .tmp para trás"
+                with classe.open_mmap(caminho) as mapeada:
+                    conferir_mapeada(mapeada, esperado)
+                relida = classe.load(caminho)
+                relida.validate()
+                assert list(relida.items()) == sorted(esperado.items()), f"{classe.__name__}/{tipo}: load"
+        # Árvore vazia
+        classe().save(caminho)
+        with classe.open_mmap(caminho) as mapeada:
+            conferir_mapeada(mapeada, {})
+        assert len(classe.load(caminho)) == 0
+
+    # Chaves e valores que o formato não aceita: erro claro, o arquivo
+    # anterior intacto e nenhum .tmp para trás
+    RedBlackTree.from_sorted([1, 2]).save(caminho)
+    with open(caminho, "rb") as f:
+        anterior = f.read()
+    recusados = (
+        ([1, "a"], None, TypeError),
+        ([True, False], None, TypeError),
+        ([(1, 2)], None, TypeError),
+        ([2**70], None, OverflowError),
+        ([-2**63 - 1, 0], None, OverflowError),
+        (["ok", "\ud800"], None, UnicodeEncodeError),
+        ([1, 2], [None, lambda: None], (pickle.PicklingError, AttributeError)),
+    )
+    for chaves, valores, erro in recusados:
+        try:
+            RedBlackTree.from_sorted(chaves, valores).save(caminho)
+            raise AssertionError(f"save aceitou {chaves!r} / {valores!r}")
+        except erro:
+            pass
+        assert not os.path.exists(caminho + ".tmp"), f"save de {chaves!r} deixou o .tmp para trás"
+        with open(caminho, "rb") as f:
+            assert f.read() == anterior, f"save de {chaves!r} alterou o arquivo anterior"
+
+
+def corrompidos(pasta):
+    """Cabeçalhos inválidos e arquivos cortados: ValueError, sem deixar o arquivo aberto."""
+    original = os.path.join(pasta, "original.arv")
+    arvore = RedBlackTree()
+    for k in range(1000):
+        arvore.insert(f"chave {k:04d}", k)
+    arvore.save(original)
+    with open(original, "rb") as f:
+        dados = f.read()
+
+    casos = {
+        "arquivo vazio": b"",
+        "menor que o cabeçalho": dados[:10],
+        "só o cabeçalho": dados[:HEADER_SIZE],
+        "número mágico errado": b"XXXXXXXX" + dados[8:],
+        "versão desconhecida": dados[:8] + struct.pack("<I", 99) + dados[12:],
+        "tipo de chave inválido": dados[:12] + b"z" + dados[13:],
+        "flag de valores inválida": dados[:13] + b"\x07" + dados[14:],
+        "chaves cortadas": dados[:HEADER_SIZE + 100],
+        "valores cortados": dados[:len(dados) - 50],
+        "seção fora do arquivo": dados[:24] + struct.pack("<Q", 1 << 40) + dados[32:],
+    }
+    caminho = os.path.join(pasta, "corrompido.arv")
+    antes = descritores()
+    for nome, conteudo in casos.items():
+        with open(caminho, "wb") as f:
+            f.write(conteudo)
+        try:
+            MappedTree(caminho)
+            raise AssertionError(f"{nome}: arquivo aceito")
+        except ValueError:
+            pass
+        try:
+            RedBlackTree.load(caminho)
+            raise AssertionError(f"{nome}: load aceitou o arquivo")
+        except ValueError:
+            pass
+    depois = descritores()
+    assert antes == depois, f"{depois - antes} arquivos ficaram abertos depois dos erros"
+    return len(casos)
+
+
+def main():
+    seed = int(sys.argv[1]) if len(sys.argv) > 1 else 2024
+    rng = random.Random(seed)
+    pasta = tempfile.mkdtemp()
+    try:
+        print(f"Formato em disco: seed={seed}")
+        ida_e_volta(pasta, rng)
+        print("Ida e volta de int, float, str e bytes, com e sem valores, em RedBlackTree e BTree")
+        casos = corrompidos(pasta)
+        print(f"{casos} arquivos corrompidos recusados com ValueError, sem vazar descritores")
+    finally:
+        shutil.rmtree(pasta)
+    print("✅ save/open_mmap/load preservam a árvore e recusam arquivos inválidos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import random
+import sys
+
+from rubro_negra import RED, BLACK
+from rubro_negra_persistente import PersistentRedBlackTree
+
+
+def altura_negra(tree):
+    """Confere ordem, cores, tamanhos e altura negra de uma versão."""
+
+    def visitar(node, lo, hi):
+        if node is None:
+            return 1
+        assert (lo is None or lo < node.key) and (hi is None or node.key < hi), "fora de ordem"
+        if node.color == RED:
+            for filho in (node.left, node.right):
+                assert filho is None or filho.color == BLACK, "vermelho com filho vermelho"
+        tamanho = 1 + sum(filho.size for filho in (node.left, node.right) if filho)
+        assert node.size == tamanho, "tamanho inconsistente"
+        esquerda, direita = visitar(node.left, lo, node.key), visitar(node.right, node.key, hi)
+        assert esquerda == direita, "alturas negras diferentes"
+        return esquerda + (node.color == BLACK)
+
+    assert tree.root is None or tree.root.color == BLACK
+    return visitar(tree.root, None, None)
+
+
+seed = int(sys.argv[1]) if len(sys.argv) > 1 else 2024
+operacoes = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+rng = random.Random(seed)
+
+print(f"Árvore persistente contra um dict: seed={seed}, {operacoes} operações")
+arvore = PersistentRedBlackTree()
+oraculo = {}
+versoes = []
+for passo in range(operacoes):
+    chave = rng.randrange(operacoes // 10 + 1)
+    if rng.random() < 0.55:
+        arvore = arvore.insert(chave, passo)
+        oraculo[chave] = passo
+    else:
+        arvore = arvore.delete(chave)
+        oraculo.pop(chave, None)
+    if passo % 1000 == 0:
+        # Guarda a versão: é só a referência, os nós são compartilhados
+        versoes.append((arvore, dict(oraculo)))
+
+# Todas as versões antigas continuam intactas depois das alterações seguintes
+for versao, esperado in versoes:
+    altura_negra(versao)
+    assert list(versao.items()) == sorted(esperado.items())
+
+print(f"{len(versoes)} versões conferidas; versão final com {len(arvore)} chaves, "
+      f"altura negra {altura_negra(arvore)}")
+print("✅ Todas as versões continuam válidas e iguais ao dict da época")
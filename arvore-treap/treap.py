@@ -0,0 +1,142 @@
+import os
+import random
+import sys
+
+# Módulos compartilhados pelas árvores ficam em ../comum
+_COMUM = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "comum")
+if _COMUM not in sys.path:
+    sys.path.append(_COMUM)
+
+from arvore_binaria import BinarySearchTree
+from arvore_ordenada import _MISSING
+
+
+class TreapNode:
+    __slots__ = ("key", "value", "left", "right", "priority")
+
+    def __init__(self, key, value, priority):
+        self.key = key
+        self.value = value
+        self.left = None
+        self.right = None
+        self.priority = priority
+
+
+class Treap(BinarySearchTree):
+    """Treap: árvore de busca pelas chaves e heap (máximo) por prioridades sorteadas.
+
+    Com prioridades aleatórias, a forma da árvore é a de uma árvore de busca
+    com inserções em ordem aleatória, qualquer que seja a ordem real: altura
+    esperada ~3 log2(n) no pior nó e profundidade média ~1,39 log2(n). Não
+    há garantia de pior caso, em troca de um balanceamento simples: insert
+    sobe o nó novo por rotações enquanto a prioridade dele for maior que a
+    do pai (2 rotações em média) e pop desce o nó por rotações até virar
+    folha. `seed` fixa o sorteio, para reproduzir uma forma.
+    """
+
+    def __init__(self, seed=None):
+        super().__init__()
+        self._random = random.Random(seed).random
+
+    def rotate_left(self, x):
+        y = x.right
+        x.right = y.left
+        y.left = x
+        return y
+
+    def rotate_right(self, y):
+        x = y.left
+        y.left = x.right
+        x.right = y
+        return x
+
+    def _replace(self, path, old, new):
+        # Pendura new no lugar de old, filho do último nó do caminho
+        if not path:
+            self.root = new
+        elif path[-1].left is old:
+            path[-1].left = new
+        else:
+            path[-1].right = new
+
+    def insert(self, key, value=None):
+        path = []
+        node = self.root
+        while node is not None:
+            if key < node.key:
+                path.append(node)
+                node = node.left
+            elif node.key < key:
+                path.append(node)
+                node = node.right
+            else:
+                # Chave já existe: substitui o valor no próprio nó
+                node.value = value
+                return False
+
+        self._len += 1
+        new = TreapNode(key, value, self._random())
+        if not path:
+            self.root = new
+            return True
+        parent = path[-1]
+        if key < parent.key:
+            parent.left = new
+        else:
+            parent.right = new
+        # Sobe o nó novo enquanto ele tiver prioridade maior que a do pai
+        while path and path[-1].priority < new.priority:
+            parent = path.pop()
+            top = self.rotate_right(parent) if parent.left is new else self.rotate_left(parent)
+            self._replace(path, parent, top)
+        return True
+
+    def _pop(self, key):
+        # Remove key e devolve o seu valor, ou _MISSING se não existir
+        path = []
+        node = self.root
+        while node is not None and key != node.key:
+            path.append(node)
+            node = node.left if key < node.key else node.right
+        if node is None:
+            return _MISSING
+
+        # Desce o nó girando para cima o filho de maior prioridade, até que
+        # reste no máximo um filho
+        while node.left is not None and node.right is not None:
+            if node.left.priority > node.right.priority:
+                top = self.rotate_right(node)
+            else:
+                top = self.rotate_left(node)
+            self._replace(path, node, top)
+            path.append(top)
+        self._replace(path, node, node.left if node.left is not None else node.right)
+        self._len -= 1
+        return node.value
+
+    def _load_sorted(self, keys, values):
+        # Substitui todo o conteúdo em O(n): árvore cartesiana pelas
+        # prioridades sorteadas, montada pela borda direita (uma pilha com
+        # prioridades decrescentes). O resultado tem a mesma distribuição de
+        # forma que inserir as chaves uma a uma
+        spine = []
+        for key, value in zip(keys, values):
+            node = TreapNode(key, value, self._random())
+            last = None
+            while spine and spine[-1].priority < node.priority:
+                last = spine.pop()
+            node.left = last
+            if spine:
+                spine[-1].right = node
+            spine.append(node)
+        self.root = spine[0] if spine else None
+        self._len = len(keys)
+
+    def _check_node(self, node, left, right):
+        # Devolve a altura da subárvore (sem garantia de balanceamento)
+        if node is None:
+            return 0
+        for child in (node.left, node.right):
+            if child is not None and node.priority < child.priority:
+                raise AssertionError(f"prioridade do filho {child.key!r} maior que a do pai {node.key!r}")
+        return max(left, right) + 1
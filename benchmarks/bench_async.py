@@ -0,0 +1,92 @@
+"""AsyncTree: efeito do agrupamento de consultas e das varreduras cooperativas.
+
+Uso:
+    python benchmarks/bench_async.py [n] [--clientes 1000] [--consultas 50]
+
+Dispara `clientes` tarefas, cada uma fazendo `consultas` awaits de get
+intercalados com uma pausa (como um handler que espera I/O entre
+requisições), e mede a latência de cada get (do await até a resposta) e a
+vazão total, com e sem agrupamento. Na segunda rodada de cada modo, uma
+tarefa de fundo varre a árvore com `async for` enquanto os clientes
+consultam, o que mostra quanto a varredura pesa no p99.
+
+Com --particionado, a árvore é uma ShardedTree: cada get é uma ida e volta
+entre processos, e o agrupamento troca centenas delas por um único lote.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "arvore-rubro-negra"))
+
+from rubro_negra import RedBlackTree
+from assincrono import AsyncTree
+from particionado import ShardedTree
+
+
+def percentil(amostras, p):
+    return amostras[(len(amostras) - 1) * p // 100]
+
+
+async def rodar(arvore, n, clientes, consultas, varrer):
+    latencias = []
+    relogio = time.perf_counter_ns
+
+    async def cliente(indice):
+        rng = random.Random(indice)
+        for _ in range(consultas):
+            inicio = relogio()
+            await arvore.get(rng.randrange(2 * n))
+            latencias.append(relogio() - inicio)
+            await asyncio.sleep(0)
+
+    async def varredura():
+        # Varre a árvore de ponta a ponta, repetidamente, até os clientes terminarem
+        while True:
+            async for _ in arvore.irange():
+                pass
+
+    fundo = asyncio.create_task(varredura()) if varrer else None
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente(i) for i in range(clientes)))
+    duracao = time.perf_counter() - inicio
+    if fundo is not None:
+        fundo.cancel()
+    latencias.sort()
+    return len(latencias) / duracao, latencias
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("n", nargs="?", type=int, default=200_000)
+    parser.add_argument("--clientes", type=int, default=1000)
+    parser.add_argument("--consultas", type=int, default=50)
+    parser.add_argument("--yield-every", type=int, default=256)
+    parser.add_argument("--particionado", type=int, metavar="SHARDS",
+                        help="usa uma ShardedTree com este número de partições")
+    args = parser.parse_args()
+
+    if args.particionado:
+        tree = ShardedTree(RedBlackTree, shards=args.particionado)
+        tree.insert_many(range(0, 2 * args.n, 2), range(args.n))
+    else:
+        tree = RedBlackTree.from_sorted(range(0, 2 * args.n, 2), range(args.n))
+    print(f"{type(tree).__name__}, n = {args.n:,}, {args.clientes} clientes x {args.consultas} consultas")
+    print(f"{'modo':<24} {'gets/s':>10} {'p50 µs':>8} {'p99 µs':>8} {'max µs':>9} {'lotes':>7}")
+    for agrupar in (False, True):
+        for varrer in (False, True):
+            arvore = AsyncTree(tree, yield_every=args.yield_every, coalesce=agrupar)
+            vazao, lat = asyncio.run(rodar(arvore, args.n, args.clientes, args.consultas, varrer))
+            nome = ("agrupado" if agrupar else "um a um") + (" + varredura" if varrer else "")
+            print(f"{nome:<24} {vazao:>10,.0f} {percentil(lat, 50) / 1000:>8,.0f} "
+                  f"{percentil(lat, 99) / 1000:>8,.0f} {lat[-1] / 1000:>9,.0f} {arvore.batches:>7,}")
+    if args.particionado:
+        tree.close()
+
+
+if __name__ == "__main__":
+    main()
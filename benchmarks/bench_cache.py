@@ -0,0 +1,112 @@
+"""TreeCache: taxa de acerto, custo por operação e limpeza de vencidas.
+
+Uso:
+    python benchmarks/bench_cache.py [n] [--capacidade 10000] [--ttl 50]
+
+Roda n operações (70% get, 30% put) com chaves Zipf sobre um relógio
+simulado que avança uma unidade por operação, para cada política e árvore,
+e reporta operações por segundo, taxa de acerto e despejos.
+
+Depois compara dois jeitos de remover as entradas vencidas de um cache
+cheio: a varredura completa em ordem (o que se fazia antes, com inorder)
+seguida da remoção, e expire(), que só visita as vencidas a partir do
+mínimo da árvore de expiração.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "arvore-rubro-negra"))
+sys.path.insert(0, os.path.join(RAIZ, "arvore-2-3-4"))
+
+from rubro_negra import RedBlackTree
+from main import BTree
+from cache import TreeCache
+
+
+class Relogio:
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+
+def chaves_zipf(n, universo, s=1.1, seed=1):
+    rng = random.Random(seed)
+    pesos = [1 / (i + 1) ** s for i in range(universo)]
+    return rng.choices(range(universo), weights=pesos, k=n)
+
+
+def rodar(tree_class, kwargs, politica, capacidade, ttl, chaves):
+    relogio = Relogio()
+    cache = TreeCache(tree_class, capacity=capacidade, ttl=ttl, policy=politica,
+                      clock=relogio, **kwargs)
+    rng = random.Random(2)
+    inicio = time.perf_counter()
+    for chave in chaves:
+        relogio.agora += 1
+        if rng.random() < 0.7:
+            if cache.get(chave) is None:
+                cache.put(chave, chave)
+        else:
+            cache.put(chave, chave)
+    duracao = time.perf_counter() - inicio
+    return len(chaves) / duracao, cache
+
+
+def limpeza(n, vencidas):
+    # Cache cheio com n entradas, das quais `vencidas` já passaram do prazo
+    relogio = Relogio()
+    cache = TreeCache(RedBlackTree, policy="ttl", clock=relogio)
+    for chave in range(n):
+        cache.put(chave, chave, ttl=chave)
+    agora = vencidas - 0.5
+
+    # A varredura usa uma cópia: visita todas as entradas e remove as vencidas
+    copia = TreeCache(RedBlackTree, policy="ttl", clock=relogio)
+    for chave in range(n):
+        copia.put(chave, chave, ttl=chave)
+    inicio = time.perf_counter()
+    achadas = [chave for (prazo, _), chave in copia._by_expiry.items() if prazo <= agora]
+    for chave in achadas:
+        copia._discard(chave)
+    varredura = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    removidas = cache.expire(agora)
+    expire = time.perf_counter() - inicio
+    assert removidas == len(achadas)
+    return varredura, expire
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("n", nargs="?", type=int, default=200_000)
+    parser.add_argument("--capacidade", type=int, default=10_000)
+    parser.add_argument("--ttl", type=float, default=50_000)
+    parser.add_argument("--universo", type=int, default=100_000)
+    args = parser.parse_args()
+
+    chaves = chaves_zipf(args.n, args.universo)
+    print(f"{args.n:,} operações, capacidade {args.capacidade:,}, ttl {args.ttl:,.0f}, "
+          f"universo {args.universo:,} (Zipf 1,1)")
+    print(f"{'árvore':<14} {'política':<8} {'ops/s':>10} {'acerto':>7} {'despejos':>9} {'vencidas':>9}")
+    for nome, classe, kwargs in (("RedBlackTree", RedBlackTree, {}), ("BTree(32)", BTree, {"order": 32})):
+        for politica in ("lru", "ttl"):
+            vazao, cache = rodar(classe, kwargs, politica, args.capacidade, args.ttl, chaves)
+            print(f"{nome:<14} {politica:<8} {vazao:>10,.0f} {cache.hit_rate:>7.1%} "
+                  f"{cache.evictions:>9,} {cache.expirations:>9,}")
+
+    print()
+    print(f"{'entradas':>10} {'vencidas':>9} {'varredura ms':>13} {'expire ms':>10}")
+    for n, vencidas in ((100_000, 10), (100_000, 1_000), (100_000, 50_000)):
+        varredura, expire = limpeza(n, vencidas)
+        print(f"{n:>10,} {vencidas:>9,} {varredura * 1000:>13,.1f} {expire * 1000:>10,.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark de carga a frio: from_sorted contra um insert por chave.
+
+Uso:
+    python benchmarks/bench_carga.py [n] [--insert-ate N]
+
+Mede, para as duas árvores, o tempo de carga de n chaves ordenadas e de n
+chaves embaralhadas (caminho que ordena antes de construir). O laço de
+insert por chave é medido só até --insert-ate chaves, porque em 10M ele
+leva minutos.
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "arvore-rubro-negra"))
+sys.path.insert(0, os.path.join(RAIZ, "arvore-2-3-4"))
+
+from rubro_negra import RedBlackTree
+from main import Tree234
+
+
+def cronometrar(funcao):
+    gc.collect()
+    gc.disable()
+    try:
+        inicio = time.perf_counter()
+        resultado = funcao()
+        return time.perf_counter() - inicio, resultado
+    finally:
+        gc.enable()
+
+
+def carregar_por_insert(cls, chaves):
+    arvore = cls()
+    for k in chaves:
+        arvore.insert(k)
+    return arvore
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("n", nargs="?", type=int, default=10_000_000)
+    parser.add_argument("--insert-ate", type=int, default=1_000_000,
+                        help="maior n para o qual o laço de insert é medido")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    ordenadas = list(range(args.n))
+    embaralhadas = ordenadas[:]
+    random.Random(args.seed).shuffle(embaralhadas)
+
+    print(f"n = {args.n:,} chaves")
+    print(f"{'árvore':<14} {'entrada':<12} {'método':<12} {'segundos':>10} {'chaves/s':>14}")
+    for cls in (RedBlackTree, Tree234):
+        for nome_entrada, chaves in (("ordenada", ordenadas), ("embaralhada", embaralhadas)):
+            metodos = [("from_sorted", lambda: cls.from_sorted(chaves))]
+            if args.n <= args.insert_ate:
+                metodos.append(("insert", lambda: carregar_por_insert(cls, chaves)))
+            for nome_metodo, funcao in metodos:
+                segundos, arvore = cronometrar(funcao)
+                assert len(arvore) == args.n
+                del arvore
+                print(f"{cls.__name__:<14} {nome_entrada:<12} {nome_metodo:<12} "
+                      f"{segundos:>10.2f} {args.n / segundos:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
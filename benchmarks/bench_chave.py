@@ -0,0 +1,105 @@
+"""Ordem por função de chave: KeyedTree contra registros com __lt__ em Python.
+
+Uso:
+    python benchmarks/bench_chave.py [n] [--ordem 32]
+
+Os registros são eventos (instante, id, nome) ordenados por (instante, id).
+Compara três jeitos de guardá-los numa árvore:
+
+- embrulho: dataclass(order=True), cujos __lt__ e __eq__ gerados rodam em
+  Python a cada comparação da descida;
+- embrulho invertido: uma classe com __lt__ trocado, para ordem decrescente;
+- KeyedTree(key=attrgetter("instante", "id")), com reverse=False e True: a
+  tupla é montada uma vez por operação e as descidas comparam tuplas em C.
+
+Mede inserção de n registros em ordem aleatória e busca de todos eles.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from operator import attrgetter
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "arvore-rubro-negra"))
+sys.path.insert(0, os.path.join(RAIZ, "arvore-2-3-4"))
+
+from rubro_negra import RedBlackTree
+from main import BTree
+from ordenacao import KeyedTree
+
+
+@dataclass(order=True)
+class Evento:
+    instante: float
+    id: int
+    nome: str = field(compare=False)
+
+
+class EventoInvertido:
+    """Embrulho com a comparação trocada, para ordem decrescente."""
+
+    __slots__ = ("evento",)
+
+    def __init__(self, evento):
+        self.evento = evento
+
+    def __lt__(self, other):
+        return other.evento < self.evento
+
+    def __eq__(self, other):
+        return self.evento == other.evento
+
+    def __ne__(self, other):
+        return not self.evento == other.evento
+
+
+def medir(tree_factory, registros, consultas, embrulhar=None):
+    tree = tree_factory()
+    if embrulhar is not None:
+        registros = [embrulhar(r) for r in registros]
+        consultas = [embrulhar(r) for r in consultas]
+    inicio = time.perf_counter()
+    for i, registro in enumerate(registros):
+        tree.insert(registro, i)
+    meio = time.perf_counter()
+    get = tree.get
+    for registro in consultas:
+        get(registro)
+    fim = time.perf_counter()
+    return meio - inicio, fim - meio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("n", nargs="?", type=int, default=100_000)
+    parser.add_argument("--ordem", type=int, default=32)
+    args = parser.parse_args()
+    n = args.n
+    rng = random.Random(1)
+    registros = [Evento(rng.randrange(n // 10), i, f"e{i}") for i in range(n)]
+    rng.shuffle(registros)
+    consultas = registros[:]
+    rng.shuffle(consultas)
+    chave = attrgetter("instante", "id")
+
+    print(f"n = {n:,} eventos, ordem por (instante, id)")
+    print(f"{'árvore':<14} {'ordenação':<26} {'insert µs':>10} {'get µs':>8}")
+    estruturas = (("RedBlackTree", RedBlackTree),
+                  (f"BTree({args.ordem})", lambda: BTree(order=args.ordem)))
+    for nome, classe in estruturas:
+        variantes = (
+            ("dataclass(order=True)", classe, None),
+            ("embrulho invertido", classe, EventoInvertido),
+            ("KeyedTree", lambda: KeyedTree(classe(), key=chave), None),
+            ("KeyedTree(reverse=True)", lambda: KeyedTree(classe(), key=chave, reverse=True), None),
+        )
+        for ordenacao, fabrica, embrulhar in variantes:
+            t_insert, t_get = medir(fabrica, registros, consultas, embrulhar=embrulhar)
+            print(f"{nome:<14} {ordenacao:<26} {t_insert / n * 1e6:>10.2f} {t_get / n * 1e6:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
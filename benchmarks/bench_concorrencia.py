@@ -0,0 +1,91 @@
+"""Contenção na ConcurrentTree: vazão de leitura por número de threads.
+
+Uso:
+    python benchmarks/bench_concorrencia.py [n] [--threads 1 2 4 8] [--escritor]
+
+Carrega n chaves, dispara k threads leitoras fazendo get em chaves
+aleatórias por alguns segundos e reporta a vazão total e o ganho sobre uma
+thread. Com --escritor, uma thread extra insere e remove chaves o tempo todo.
+
+Só há ganho com mais threads num CPython sem GIL (3.13t ou mais novo, com
+PYTHON_GIL=0); com o GIL, as leituras se revezam no interpretador e a
+vazão total fica no mesmo patamar de uma thread.
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "arvore-rubro-negra"))
+sys.path.insert(0, os.path.join(RAIZ, "arvore-2-3-4"))
+
+from rubro_negra import RedBlackTree
+from main import BTree
+from concorrente import ConcurrentTree
+
+
+def gil_ligado():
+    verificar = getattr(sys, "_is_gil_enabled", None)
+    return True if verificar is None else verificar()
+
+
+def rodar(arvore, n, threads, duracao, escritor):
+    parar = threading.Event()
+    leituras = [0] * threads
+
+    def ler(indice):
+        rng = random.Random(indice)
+        chaves = [rng.randrange(2 * n) for _ in range(4096)]
+        feitas = 0
+        while not parar.is_set():
+            for k in chaves:
+                arvore.get(k)
+            feitas += len(chaves)
+        leituras[indice] = feitas
+
+    def escrever():
+        rng = random.Random(-1)
+        while not parar.is_set():
+            k = rng.randrange(2 * n)
+            arvore.insert(k)
+            arvore.pop(k, None)
+
+    trabalhadores = [threading.Thread(target=ler, args=(i,)) for i in range(threads)]
+    if escritor:
+        trabalhadores.append(threading.Thread(target=escrever))
+    inicio = time.perf_counter()
+    for t in trabalhadores:
+        t.start()
+    time.sleep(duracao)
+    parar.set()
+    for t in trabalhadores:
+        t.join()
+    return sum(leituras) / (time.perf_counter() - inicio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("n", nargs="?", type=int, default=100_000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--duracao", type=float, default=2.0, help="segundos por medição")
+    parser.add_argument("--escritor", action="store_true", help="uma thread escrevendo durante as leituras")
+    args = parser.parse_args()
+
+    print(f"Python {sys.version.split()[0]}, GIL {'ligado' if gil_ligado() else 'desligado'}, "
+          f"n = {args.n:,} chaves")
+    print(f"{'árvore':<14} {'threads':>8} {'leituras/s':>14} {'ganho':>7}")
+    for nome, fabrica in (("RedBlackTree", RedBlackTree), ("BTree128", lambda: BTree(order=128))):
+        arvore = ConcurrentTree(fabrica())
+        arvore.insert_many(range(0, 2 * args.n, 2))
+        base = None
+        for threads in args.threads:
+            vazao = rodar(arvore, args.n, threads, args.duracao, args.escritor)
+            base = base or vazao
+            print(f"{nome:<14} {threads:>8} {vazao:>14,.0f} {vazao / base:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Cursor: acessos com localidade, partindo da raiz ou da posição anterior.
+
+Uso:
+    python benchmarks/bench_cursor.py [n] [--passos 200000] [--salto 8]
+
+Carrega n chaves pares e faz `passos` acessos numa caminhada: cada chave
+fica a até `salto` posições da anterior (para frente ou para trás). Mede
+três cargas, cada uma da raiz (get/insert/pop da árvore) e pelo cursor
+(seek/insert/delete):
+
+- busca: get da chave vizinha;
+- inserção: insere a chave ímpar vizinha (que ainda não existe);
+- varredura: next até o fim, contra iter_from da árvore, só para referência.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "arvore-rubro-negra"))
+sys.path.insert(0, os.path.join(RAIZ, "arvore-2-3-4"))
+
+from rubro_negra import RedBlackTree
+from main import BTree, Tree234
+
+
+def caminhada(n, passos, salto, seed=1):
+    rng = random.Random(seed)
+    pos = n // 2
+    chaves = []
+    for _ in range(passos):
+        pos = min(max(pos + rng.randint(-salto, salto), 0), n - 1)
+        chaves.append(2 * pos)
+    return chaves
+
+
+def medir(funcao):
+    inicio = time.perf_counter()
+    funcao()
+    return time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("n", nargs="?", type=int, default=1_000_000)
+    parser.add_argument("--passos", type=int, default=200_000)
+    parser.add_argument("--salto", type=int, default=8)
+    args = parser.parse_args()
+
+    chaves = caminhada(args.n, args.passos, args.salto)
+    impares = [k + 1 for k in chaves]
+    print(f"n = {args.n:,}, {args.passos:,} passos, salto até {args.salto}")
+    print(f"{'árvore':<14} {'carga':<10} {'raiz µs':>9} {'cursor µs':>10} {'ganho':>7}")
+    estruturas = (
+        ("RedBlackTree", lambda: RedBlackTree.from_sorted(range(0, 2 * args.n, 2))),
+        ("Tree234", lambda: Tree234.from_sorted(range(0, 2 * args.n, 2))),
+        ("BTree(32)", lambda: BTree.from_sorted(range(0, 2 * args.n, 2), order=32)),
+    )
+    for nome, construir in estruturas:
+        arvore = construir()
+        cursor = arvore.cursor()
+
+        def busca_raiz():
+            get = arvore.get
+            for k in chaves:
+                get(k)
+
+        def busca_cursor():
+            seek = cursor.seek
+            for k in chaves:
+                seek(k)
+
+        def insercao_raiz():
+            insert, pop = arvore.insert, arvore.pop
+            for k in impares:
+                insert(k)
+            for k in impares:
+                pop(k, None)
+
+        def insercao_cursor():
+            for k in impares:
+                cursor.insert(k)
+            for k in impares:
+                if cursor.seek(k):
+                    cursor.delete()
+
+        cargas = (("busca", busca_raiz, busca_cursor, args.passos),
+                  ("inserção", insercao_raiz, insercao_cursor, 2 * args.passos))
+        for carga, raiz, pelo_cursor, operacoes in cargas:
+            t_raiz = medir(raiz) / operacoes * 1e6
+            t_cursor = medir(pelo_cursor) / operacoes * 1e6
+            print(f"{nome:<14} {carga:<10} {t_raiz:>9.2f} {t_cursor:>10.2f} {t_raiz / t_cursor:>6.1f}x")
+
+        def varredura_iter():
+            for _ in arvore.iter_from(0):
+                pass
+
+        def varredura_cursor():
+            cursor.first()
+            while cursor.next():
+                pass
+
+        t_iter = medir(varredura_iter) / args.n * 1e6
+        t_cursor = medir(varredura_cursor) / args.n * 1e6
+        print(f"{nome:<14} {'varredura':<10} {t_iter:>9.2f} {t_cursor:>10.2f} {t_iter / t_cursor:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
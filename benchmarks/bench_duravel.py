@@ -0,0 +1,116 @@
+"""DurableTree: vazão por política de fsync e tempo de recuperação.
+
+Uso:
+    python benchmarks/bench_duravel.py [n] [--chaves 200000] [--pasta DIR]
+
+Primeiro insere n chaves aleatórias numa RedBlackTree sem log e através de
+DurableTree com cada política de fsync, e com 4 threads em sync="always"
+para mostrar o commit em grupo. Reporta operações por segundo e quantos
+fsync foram feitos.
+
+Depois carrega --chaves chaves, escreve um trecho final de T operações e
+mede quanto a reabertura leva com um checkpoint antes do trecho e sem
+nenhum checkpoint (o log inteiro é reaplicado).
+
+--pasta escolhe onde ficam os arquivos; fsync num tmpfs não custa nada.
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "arvore-rubro-negra"))
+sys.path.insert(0, os.path.join(RAIZ, "arvore-2-3-4"))
+
+from rubro_negra import RedBlackTree
+from duravel import DurableTree
+
+
+def vazao(pasta, chaves, threads=1, **opcoes):
+    diretorio = tempfile.mkdtemp(dir=pasta)
+    arvore = DurableTree(RedBlackTree, diretorio, **opcoes) if opcoes else RedBlackTree()
+    partes = [chaves[i::threads] for i in range(threads)]
+
+    def escrever(parte):
+        insert = arvore.insert
+        for chave in parte:
+            insert(chave, chave)
+
+    inicio = time.perf_counter()
+    if threads == 1:
+        escrever(chaves)
+    else:
+        trabalhadores = [threading.Thread(target=escrever, args=(p,)) for p in partes]
+        for t in trabalhadores:
+            t.start()
+        for t in trabalhadores:
+            t.join()
+    if opcoes:
+        arvore.close()
+    duracao = time.perf_counter() - inicio
+    fsyncs = arvore.fsyncs if opcoes else 0
+    shutil.rmtree(diretorio)
+    return len(chaves) / duracao, fsyncs
+
+
+def recuperacao(pasta, chaves, cauda, checkpoint):
+    diretorio = tempfile.mkdtemp(dir=pasta)
+    with DurableTree(RedBlackTree, diretorio, sync="none") as arvore:
+        for chave in chaves:
+            arvore.insert(chave, chave)
+        if checkpoint:
+            arvore.checkpoint()
+        rng = random.Random(3)
+        for _ in range(cauda):
+            arvore.insert(rng.randrange(4 * len(chaves)), 0)
+    inicio = time.perf_counter()
+    reaberta = DurableTree(RedBlackTree, diretorio, sync="none")
+    duracao = time.perf_counter() - inicio
+    info = reaberta.recovery
+    reaberta.close()
+    shutil.rmtree(diretorio)
+    return duracao, info
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("n", nargs="?", type=int, default=20_000)
+    parser.add_argument("--chaves", type=int, default=200_000)
+    parser.add_argument("--pasta", default=None)
+    args = parser.parse_args()
+    pasta = tempfile.mkdtemp(dir=args.pasta)
+
+    rng = random.Random(1)
+    chaves = rng.sample(range(10 * args.n), args.n)
+    print(f"{args.n:,} inserções em RedBlackTree, arquivos em {pasta}")
+    print(f"{'política':<26} {'ops/s':>10} {'fsyncs':>8}")
+    politicas = (
+        ("sem log", 1, {}),
+        ("none", 1, {"sync": "none"}),
+        ("interval (50 ms)", 1, {"sync": "interval", "interval": 0.05}),
+        ("batch (1024)", 1, {"sync": "batch", "batch_size": 1024}),
+        ("batch (64)", 1, {"sync": "batch", "batch_size": 64}),
+        ("always", 1, {"sync": "always"}),
+        ("always, 4 threads", 4, {"sync": "always"}),
+    )
+    for nome, threads, opcoes in politicas:
+        ops, fsyncs = vazao(pasta, chaves, threads, **opcoes)
+        print(f"{nome:<26} {ops:>10,.0f} {fsyncs:>8,}")
+
+    carga = rng.sample(range(4 * args.chaves), args.chaves)
+    print(f"\nReabertura com {args.chaves:,} chaves e T operações depois do último checkpoint")
+    print(f"{'T':>8} {'com checkpoint s':>17} {'log inteiro s':>14}")
+    for cauda in (0, 10_000, 100_000):
+        com, _ = recuperacao(pasta, carga, cauda, checkpoint=True)
+        sem, _ = recuperacao(pasta, carga, cauda, checkpoint=False)
+        print(f"{cauda:>8,} {com:>17.2f} {sem:>14.2f}")
+    shutil.rmtree(pasta)
+
+
+if __name__ == "__main__":
+    main()
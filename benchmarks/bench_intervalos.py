@@ -0,0 +1,77 @@
+"""Árvore de intervalos: consultas de sobreposição contra força bruta.
+
+Uso:
+    python benchmarks/bench_intervalos.py [n] [--consultas 2000] [--duracao 100]
+
+Gera n intervalos [início, início + duração] com início uniforme em
+[0, 100 n) e duração exponencial de média --duracao. Mede:
+
+- construção: insert um a um na IntervalTree e na RedBlackTree (o custo
+  de manter max_end) e from_sorted;
+- stab(t) e overlap(a, a + 1000) contra a varredura de uma lista de
+  tuplas e a varredura em ordem da própria árvore (items()).
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "arvore-rubro-negra"))
+
+from rubro_negra import RedBlackTree
+from rubro_negra_intervalos import IntervalTree
+
+
+def medir(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return time.perf_counter() - inicio, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("n", nargs="?", type=int, default=200_000)
+    parser.add_argument("--consultas", type=int, default=2000)
+    parser.add_argument("--duracao", type=float, default=100)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    n = args.n
+    intervalos = []
+    for i in range(n):
+        inicio = rng.randrange(100 * n)
+        intervalos.append((inicio, inicio + int(rng.expovariate(1 / args.duracao)), i))
+
+    print(f"n = {n:,} intervalos, duração média {args.duracao:g}")
+    for nome, classe in (("RedBlackTree", RedBlackTree), ("IntervalTree", IntervalTree)):
+        arvore = classe()
+        t, _ = medir(lambda: [arvore.insert(k) for k in intervalos])
+        print(f"  insert um a um em {nome:<13} {t / n * 1e6:6.2f} µs por intervalo")
+    t, arvore = medir(lambda: IntervalTree.from_sorted(intervalos))
+    print(f"  IntervalTree.from_sorted          {t / n * 1e6:6.2f} µs por intervalo")
+
+    pontos = [rng.randrange(100 * n) for _ in range(args.consultas)]
+    cargas = (
+        ("stab(t)", [(p, p) for p in pontos]),
+        ("overlap(a, a + 1000)", [(p, p + 1000) for p in pontos]),
+    )
+    print(f"\n{'consulta':<22} {'achados':>8} {'árvore µs':>10} {'lista µs':>10} {'items() µs':>11} {'ganho':>8}")
+    q = args.consultas
+    for nome, janelas in cargas:
+        t_arvore, achados = medir(lambda: sum(sum(1 for _ in arvore.overlap(a, b)) for a, b in janelas))
+        # As varreduras são lentas: rodam em 1/20 das consultas
+        amostra = janelas[: max(q // 20, 1)]
+        t_lista, _ = medir(lambda: [[k for k in intervalos if k[0] <= b and a <= k[1]] for a, b in amostra])
+        t_items, _ = medir(lambda: [[k for k, _ in arvore.items() if k[0] <= b and a <= k[1]]
+                                    for a, b in amostra])
+        por_arvore = t_arvore / q * 1e6
+        por_lista = t_lista / len(amostra) * 1e6
+        por_items = t_items / len(amostra) * 1e6
+        print(f"{nome:<22} {achados / q:>8.1f} {por_arvore:>10.2f} {por_lista:>10,.0f} {por_items:>11,.0f} "
+              f"{por_lista / por_arvore:>7,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark das operações em lote contra o laço de uma chave por vez.
+
+Uso:
+    python benchmarks/bench_lote.py [n] [--lotes 10000 100000]
+
+Para cada árvore, parte de n chaves já carregadas e mede um lote de
+lookups, de inserções e de remoções, primeiro com o laço por chave e
+depois com contains_many / insert_many / delete_many.
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "arvore-rubro-negra"))
+sys.path.insert(0, os.path.join(RAIZ, "arvore-2-3-4"))
+
+from rubro_negra import RedBlackTree
+from main import Tree234
+
+
+def cronometrar(funcao):
+    inicio = time.perf_counter()
+    funcao()
+    return time.perf_counter() - inicio
+
+
+def medir(cls, base, lote):
+    resultados = {}
+
+    tree = cls.from_sorted(base)
+    if cls is RedBlackTree:
+        por_chave = lambda: [tree.search(tree.root, k) is not tree.NULL for k in lote]
+    else:
+        por_chave = lambda: [tree.search(tree.root, k) for k in lote]
+    resultados["lookup"] = (cronometrar(por_chave), cronometrar(lambda: tree.contains_many(lote)))
+
+    novos = [k + 0.5 for k in lote]
+    tree = cls.from_sorted(base)
+    t_laco = cronometrar(lambda: [tree.insert(k) for k in novos])
+    tree = cls.from_sorted(base)
+    resultados["insert"] = (t_laco, cronometrar(lambda: tree.insert_many(novos)))
+
+    tree = cls.from_sorted(base)
+    t_laco = cronometrar(lambda: [tree.pop(k, None) for k in lote])
+    tree = cls.from_sorted(base)
+    resultados["delete"] = (t_laco, cronometrar(lambda: tree.delete_many(lote)))
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("n", nargs="?", type=int, default=1_000_000)
+    parser.add_argument("--lotes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    base = list(range(0, 2 * args.n, 2))
+
+    print(f"árvore com n = {args.n:,} chaves")
+    print(f"{'árvore':<14} {'lote':>8} {'operação':<8} {'por chave/s':>13} {'em lote/s':>13} {'ganho':>7}")
+    gc.disable()
+    try:
+        for cls in (RedBlackTree, Tree234):
+            for m in args.lotes:
+                # Metade das chaves do lote existe na árvore, metade não
+                lote = [rng.randrange(2 * args.n) for _ in range(m)]
+                for operacao, (t_laco, t_lote) in medir(cls, base, lote).items():
+                    print(f"{cls.__name__:<14} {m:>8,} {operacao:<8} {m / t_laco:>13,.0f} "
+                          f"{m / t_lote:>13,.0f} {t_laco / t_lote:>6.2f}x")
+                gc.collect()
+    finally:
+        gc.enable()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""Matriz motor x carga de trabalho, pela interface comum (make_tree).
+
+Uso:
+    python benchmarks/bench_motores.py [n] [--operacoes 100000]
+        [--motores rb llrb avl treap 234 btree] [--ordem 32] [--repeticoes 3]
+
+Cada motor começa com n chaves aleatórias (universo 2n) e roda a mesma
+sequência sorteada de cada carga:
+
+- leitura: 95% get, 5% insert/pop;
+- misto: 50% get, 50% insert/pop;
+- escrita: só insert e pop;
+- crescente: n inserções em ordem numa árvore vazia;
+- varredura: iter_from(k) lendo 50 chaves.
+
+Reporta µs por operação, a melhor de --repeticoes (cada uma numa árvore
+nova). Depois, a forma das árvores: profundidade média e altura (em nós; na
+árvore B, em níveis) depois das n inserções aleatórias, profundidade média
+depois das n inserções em ordem e rotações por insert/pop da carga de
+escrita.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from itertools import islice
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "comum"))
+
+from arvore_ordenada import engine_class, make_tree
+
+CARGAS = (("leitura", 0.95), ("misto", 0.5), ("escrita", 0.0))
+
+
+def construir(motor, chaves, ordem):
+    kwargs = {"order": ordem} if motor == "btree" else {}
+    arvore = make_tree(motor, **kwargs)
+    for chave in chaves:
+        arvore.insert(chave, chave)
+    return arvore
+
+
+def sortear(rng, n, operacoes, leitura):
+    """Sequência de (operação, chave): get com chance `leitura`, senão insert ou pop."""
+    sequencia = []
+    for _ in range(operacoes):
+        chave = rng.randrange(2 * n)
+        if rng.random() < leitura:
+            sequencia.append(("get", chave))
+        else:
+            sequencia.append(("insert" if rng.random() < 0.5 else "pop", chave))
+    return sequencia
+
+
+def rodar(arvore, sequencia):
+    get, insert, pop = arvore.get, arvore.insert, arvore.pop
+    inicio = time.perf_counter()
+    for op, chave in sequencia:
+        if op == "get":
+            get(chave)
+        elif op == "insert":
+            insert(chave, chave)
+        else:
+            pop(chave, None)
+    return time.perf_counter() - inicio
+
+
+def varrer(arvore, inicios):
+    inicio = time.perf_counter()
+    for chave in inicios:
+        for _ in islice(arvore.iter_from(chave), 50):
+            pass
+    return time.perf_counter() - inicio
+
+
+def forma(arvore):
+    """(profundidade média das chaves, altura), ou None se os nós não são objetos."""
+    nulo = getattr(arvore, "NULL", None)
+    if not hasattr(arvore.root, "key") and not hasattr(arvore.root, "keys"):
+        return None
+    soma = chaves = altura = 0
+    pilha = [(arvore.root, 1)]
+    while pilha:
+        no, nivel = pilha.pop()
+        if no is None or no is nulo:
+            continue
+        altura = max(altura, nivel)
+        if hasattr(no, "children"):
+            soma += nivel * len(no.keys)
+            chaves += len(no.keys)
+            pilha.extend((filho, nivel + 1) for filho in no.children)
+        else:
+            soma += nivel
+            chaves += 1
+            pilha.append((no.left, nivel + 1))
+            pilha.append((no.right, nivel + 1))
+    return soma / max(chaves, 1), altura
+
+
+def contar_rotacoes(motor, chaves, sequencia):
+    """Rotações por insert/pop da sequência, numa subclasse que conta rotate_*."""
+    classe = engine_class(motor)
+    if not hasattr(classe, "rotate_left"):
+        return None
+
+    class Contada(classe):
+        rotacoes = 0
+
+        def rotate_left(self, no):
+            Contada.rotacoes += 1
+            return super().rotate_left(no)
+
+        def rotate_right(self, no):
+            Contada.rotacoes += 1
+            return super().rotate_right(no)
+
+    arvore = Contada()
+    for chave in chaves:
+        arvore.insert(chave, chave)
+    Contada.rotacoes = 0
+    rodar(arvore, sequencia)
+    return Contada.rotacoes / len(sequencia)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("n", nargs="?", type=int, default=100_000)
+    parser.add_argument("--operacoes", type=int, default=100_000)
+    parser.add_argument("--motores", nargs="+", default=["rb", "llrb", "avl", "treap", "234", "btree"])
+    parser.add_argument("--ordem", type=int, default=32, help="ordem do motor btree")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+    n, operacoes = args.n, args.operacoes
+
+    rng = random.Random(1)
+    chaves = [rng.randrange(2 * n) for _ in range(n)]
+    sequencias = {nome: sortear(rng, n, operacoes, leitura) for nome, leitura in CARGAS}
+    inicios = [rng.randrange(2 * n) for _ in range(operacoes // 10)]
+    crescentes = list(range(n))
+
+    nomes = [m if m != "btree" else f"btree({args.ordem})" for m in args.motores]
+    print(f"n = {n:,} chaves, {operacoes:,} operações por carga (µs por operação)")
+    print(f"{'carga':<10}" + "".join(f"{nome:>11}" for nome in nomes))
+    linhas = {nome: [] for nome, _ in CARGAS}
+    linhas["crescente"], linhas["varredura"] = [], []
+    repeticoes = range(args.repeticoes)
+    for motor in args.motores:
+        for nome, _ in CARGAS:
+            melhor = min(rodar(construir(motor, chaves, args.ordem), sequencias[nome]) for _ in repeticoes)
+            linhas[nome].append(melhor / operacoes * 1e6)
+        melhor = float("inf")
+        for _ in repeticoes:
+            inicio = time.perf_counter()
+            construir(motor, crescentes, args.ordem)
+            melhor = min(melhor, time.perf_counter() - inicio)
+        linhas["crescente"].append(melhor / n * 1e6)
+        arvore = construir(motor, chaves, args.ordem)
+        linhas["varredura"].append(min(varrer(arvore, inicios) for _ in repeticoes) / len(inicios) * 1e6)
+    for nome, tempos in linhas.items():
+        melhor = min(tempos)
+        print(f"{nome:<10}" + "".join(f"{t:>10.2f}{'*' if t == melhor else ' '}" for t in tempos))
+    print("* mais rápido da linha")
+
+    print(f"\n{'motor':<11} {'prof. média':>11} {'altura':>7} {'prof. (crescente)':>18} {'rotações/op':>12}")
+    for motor, nome in zip(args.motores, nomes):
+        media, altura = forma(construir(motor, chaves, args.ordem)) or (float("nan"), 0)
+        em_ordem, _ = forma(construir(motor, crescentes, args.ordem)) or (float("nan"), 0)
+        rotacoes = contar_rotacoes(motor, chaves, sequencias["escrita"])
+        texto = f"{rotacoes:>12.2f}" if rotacoes is not None else f"{'-':>12}"
+        print(f"{nome:<11} {media:>11.2f} {altura:>7} {em_ordem:>18.2f} {texto}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Varredura da ordem da árvore B: vazão de insert, search e delete por ordem.
+
+Uso:
+    python benchmarks/bench_ordem_b.py [n] [--ordens 4 8 16 ...]
+
+A ordem 4 é a própria Tree234. Ordens maiores deixam a árvore mais rasa
+(menos saltos de ponteiro) mas aumentam o custo de inserir/remover no meio
+da lista de cada nó; o pico de vazão fica entre os dois extremos.
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "arvore-2-3-4"))
+
+from main import BTree
+
+
+def altura(tree):
+    h = 1
+    node = tree.root
+    while node.children:
+        node = node.children[0]
+        h += 1
+    return h
+
+
+def vazao(funcao, chaves):
+    inicio = time.perf_counter()
+    for k in chaves:
+        funcao(k)
+    return len(chaves) / (time.perf_counter() - inicio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("n", nargs="?", type=int, default=200_000)
+    parser.add_argument("--ordens", type=int, nargs="+",
+                        default=[4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    chaves = list(range(args.n))
+    rng.shuffle(chaves)
+    buscas = [rng.randrange(2 * args.n) for _ in range(args.n)]
+
+    print(f"n = {args.n:,} chaves aleatórias")
+    print(f"{'ordem':>6} {'altura':>7} {'insert/s':>12} {'search/s':>12} {'delete/s':>12}")
+    melhor = {}
+    gc.disable()
+    try:
+        for ordem in args.ordens:
+            tree = BTree(ordem)
+            ins = vazao(tree.insert, chaves)
+            h = altura(tree)
+            sea = vazao(lambda k: tree.search(tree.root, k), buscas)
+            rem = vazao(tree.pop, chaves)
+            print(f"{ordem:>6} {h:>7} {ins:>12,.0f} {sea:>12,.0f} {rem:>12,.0f}")
+            for nome, valor in (("insert", ins), ("search", sea), ("delete", rem)):
+                if valor > melhor.get(nome, (0, 0))[1]:
+                    melhor[nome] = (ordem, valor)
+            gc.collect()
+    finally:
+        gc.enable()
+
+    print()
+    for nome, (ordem, valor) in melhor.items():
+        print(f"pico de {nome}: ordem {ordem} ({valor:,.0f} ops/s)")
+
+
+if __name__ == "__main__":
+    main()
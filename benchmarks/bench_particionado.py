@@ -0,0 +1,65 @@
+"""ShardedTree: vazão de operações em lote por número de processos.
+
+Uso:
+    python benchmarks/bench_particionado.py [n] [--shards 1 2 4 8]
+
+Carrega n chaves aleatórias em lotes, faz um contains_many de n chaves e
+um irange de toda a árvore, para cada número de partições, e compara com
+uma RedBlackTree no próprio processo. O ganho depende de ter um núcleo livre
+por partição: com menos núcleos que partições, os processos se revezam e o
+custo de serializar os lotes entre processos passa a dominar.
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "arvore-rubro-negra"))
+
+from rubro_negra import RedBlackTree
+from particionado import ShardedTree
+
+
+def cronometrar(funcao):
+    inicio = time.perf_counter()
+    funcao()
+    return time.perf_counter() - inicio
+
+
+def medir(arvore, lotes, consultas):
+    t_insert = sum(cronometrar(lambda: arvore.insert_many(lote)) for lote in lotes)
+    t_busca = cronometrar(lambda: arvore.contains_many(consultas))
+    t_varredura = cronometrar(lambda: sum(1 for _ in arvore.irange()))
+    return t_insert, t_busca, t_varredura
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("n", nargs="?", type=int, default=1_000_000)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--lote", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    chaves = [rng.randrange(4 * args.n) for _ in range(args.n)]
+    lotes = [chaves[i:i + args.lote] for i in range(0, args.n, args.lote)]
+    consultas = [rng.randrange(4 * args.n) for _ in range(args.n)]
+
+    print(f"{multiprocessing.cpu_count()} núcleos, n = {args.n:,}, lotes de {args.lote:,}")
+    print(f"{'configuração':<18} {'insert/s':>12} {'busca/s':>12} {'varredura/s':>12} {'ganho busca':>12}")
+    base = medir(RedBlackTree(), lotes, consultas)
+    linhas = [("1 processo", base)]
+    for shards in args.shards:
+        with ShardedTree(RedBlackTree, shards=shards) as arvore:
+            linhas.append((f"{shards} partições", medir(arvore, lotes, consultas)))
+    for nome, (t_insert, t_busca, t_varredura) in linhas:
+        print(f"{nome:<18} {args.n / t_insert:>12,.0f} {args.n / t_busca:>12,.0f} "
+              f"{args.n / t_varredura:>12,.0f} {base[1] / t_busca:>11.2f}x")
+
+
+if __name__ == "__main__":
+    main()
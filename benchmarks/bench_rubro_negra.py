@@ -0,0 +1,95 @@
+"""Benchmark da árvore rubro-negra: memória por chave e vazão de insert/delete.
+
+Uso:
+    python benchmarks/bench_rubro_negra.py [n]
+
+Para comparar com outra versão da implementação (por exemplo, a classe
+antiga com __dict__ e cores em string):
+    git show <commit>:arvore-rubro-negra/rubro_negra.py > /tmp/rubro_negra_antigo.py
+    python benchmarks/bench_rubro_negra.py 200000 --referencia /tmp/rubro_negra_antigo.py
+"""
+import argparse
+import gc
+import importlib.util
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "arvore-rubro-negra"))
+
+import rubro_negra
+
+
+def carregar_modulo(caminho):
+    spec = importlib.util.spec_from_file_location("rubro_negra_referencia", caminho)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def memoria_por_chave(modulo, chaves):
+    gc.collect()
+    tracemalloc.start()
+    arvore = modulo.RedBlackTree()
+    for k in chaves:
+        arvore.insert(k)
+    atual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return atual / len(chaves)
+
+
+def medir(modulo, chaves):
+    # GC desligado durante a medição para não misturar pausas de coleta
+    gc.collect()
+    gc.disable()
+    try:
+        arvore = modulo.RedBlackTree()
+        inicio = time.perf_counter()
+        for k in chaves:
+            arvore.insert(k)
+        t_insert = time.perf_counter() - inicio
+
+        ordem_remocao = list(chaves)
+        random.Random(1).shuffle(ordem_remocao)
+        inicio = time.perf_counter()
+        for k in ordem_remocao:
+            arvore.delete(k)
+        t_delete = time.perf_counter() - inicio
+    finally:
+        gc.enable()
+    return len(chaves) / t_insert, len(chaves) / t_delete
+
+
+def relatorio(nome, modulo, chaves):
+    mem = memoria_por_chave(modulo, chaves)
+    ins, rem = medir(modulo, chaves)
+    print(f"{nome:<12} {mem:>10.1f} {ins:>14,.0f} {rem:>14,.0f}")
+    return mem, ins, rem
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("n", nargs="?", type=int, default=100_000)
+    parser.add_argument("--referencia", help="caminho de outro rubro_negra.py para comparar")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    chaves = list(range(args.n))
+    random.Random(args.seed).shuffle(chaves)
+
+    print(f"n = {args.n:,} chaves aleatórias")
+    print(f"{'versão':<12} {'bytes/chave':>10} {'insert/s':>14} {'delete/s':>14}")
+    atual = relatorio("atual", rubro_negra, chaves)
+
+    if args.referencia:
+        ref = relatorio("referência", carregar_modulo(args.referencia), chaves)
+        print(f"\nmemória: {ref[0] / atual[0]:.2f}x menor")
+        print(f"insert:  {atual[1] / ref[1]:.2f}x mais rápido")
+        print(f"delete:  {atual[2] / ref[2]:.2f}x mais rápido")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""Suíte de benchmarks: árvores do repositório contra estruturas de referência.
+
+Uso:
+    python benchmarks/bench_suite.py [--tamanhos 1000 10000 100000]
+                                     [--cargas sequencial aleatoria zipf adversarial]
+                                     [--estruturas RedBlackTree Tree234 ...]
+                                     [--json resultados.json]
+
+Para cada estrutura, carga e tamanho, mede três fases: inserir as n chaves
+da carga, fazer n consultas e remover as n chaves. Cada fase reporta:
+- ops/s, medidas num laço sem instrumentação;
+- percentis de latência (p50, p90, p99 e máximo), medidos numa segunda
+  execução que cronometra cada operação;
+- o pico de memória da construção, medido com tracemalloc numa terceira
+  execução.
+
+As cargas são:
+- sequencial: 0, 1, 2, ...
+- aleatoria: n chaves distintas em ordem aleatória;
+- zipf: n sorteios com expoente 1.1, com muitas repetições das chaves quentes;
+- adversarial: zigue-zague 0, n-1, 1, n-2, ..., que força rebalanceamento nas
+  duas bordas da árvore ao mesmo tempo.
+
+As referências são um dict com uma lista ordenada mantida por bisect e, se
+o pacote sortedcontainers estiver instalado, SortedDict. Com --json, o
+resultado completo é gravado com os metadados da máquina, para comparar
+execuções ao longo do tempo.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from bisect import bisect_left, bisect_right, insort
+from itertools import accumulate
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "arvore-rubro-negra"))
+sys.path.insert(0, os.path.join(RAIZ, "arvore-2-3-4"))
+
+from rubro_negra import RedBlackTree
+from main import BTree, Tree234
+
+try:
+    from rubro_negra_numpy import NumpyRedBlackTree
+except ImportError:
+    NumpyRedBlackTree = None
+
+try:
+    from sortedcontainers import SortedDict
+except ImportError:
+    SortedDict = None
+
+
+# -------------------------
+# Estruturas de referência
+# -------------------------
+class DictBisect:
+    """Mapa ordenado ingênuo: dict para as consultas e lista ordenada com bisect."""
+
+    def __init__(self):
+        self._dict = {}
+        self._keys = []
+
+    def insert(self, key, value=None):
+        if key in self._dict:
+            self._dict[key] = value
+            return False
+        insort(self._keys, key)
+        self._dict[key] = value
+        return True
+
+    def __contains__(self, key):
+        return key in self._dict
+
+    def pop(self, key, default=None):
+        if key not in self._dict:
+            return default
+        del self._keys[bisect_left(self._keys, key)]
+        return self._dict.pop(key)
+
+
+class SortedDictAdapter:
+    """SortedDict do sortedcontainers com a mesma interface das árvores."""
+
+    def __init__(self):
+        self._sd = SortedDict()
+
+    def insert(self, key, value=None):
+        novo = key not in self._sd
+        self._sd[key] = value
+        return novo
+
+    def __contains__(self, key):
+        return key in self._sd
+
+    def pop(self, key, default=None):
+        return self._sd.pop(key, default)
+
+
+ESTRUTURAS = {
+    "RedBlackTree": RedBlackTree,
+    "Tree234": Tree234,
+    "BTree128": lambda: BTree(order=128),
+    "DictBisect": DictBisect,
+}
+if NumpyRedBlackTree is not None:
+    ESTRUTURAS["NumpyRedBlackTree"] = NumpyRedBlackTree
+if SortedDict is not None:
+    ESTRUTURAS["SortedDict"] = SortedDictAdapter
+
+
+# -------------------------
+# Cargas
+# -------------------------
+def _espalhar(k):
+    # Espalha a posição no ranking pelo universo de chaves, para que as chaves
+    # quentes não sejam justamente as menores
+    return (k * 2654435761) % (1 << 32)
+
+
+def _zipf(rng, n, universo, s=1.1):
+    acumulado = list(accumulate(1.0 / (k ** s) for k in range(1, universo + 1)))
+    total = acumulado[-1]
+    return [_espalhar(bisect_right(acumulado, rng.random() * total)) for _ in range(n)]
+
+
+def gerar_carga(nome, n, rng):
+    """Devolve (chaves a inserir, chaves a consultar) da carga `nome`."""
+    if nome == "sequencial":
+        return list(range(n)), list(range(n))
+    if nome == "aleatoria":
+        chaves = rng.sample(range(4 * n), n)
+        # Metade das consultas acerta, metade cai fora da árvore
+        return chaves, [rng.choice(chaves) if rng.random() < 0.5 else rng.randrange(4 * n)
+                        for _ in range(n)]
+    if nome == "zipf":
+        return _zipf(rng, n, n), _zipf(rng, n, n)
+    if nome == "adversarial":
+        zigue = [k for par in zip(range(n // 2), range(n - 1, n // 2 - 1, -1)) for k in par]
+        if n % 2:
+            zigue.append(n // 2)
+        return zigue, list(zigue)
+    raise ValueError(f"carga desconhecida: {nome}")
+
+
+CARGAS = ["sequencial", "aleatoria", "zipf", "adversarial"]
+
+
+# -------------------------
+# Medição
+# -------------------------
+def _fases(fabrica, inserir, consultar):
+    # Sequência de fases sobre uma mesma estrutura; cada fase é (nome, função, chaves)
+    estrutura = fabrica()
+    return [
+        ("insert", estrutura.insert, inserir),
+        ("search", estrutura.__contains__, consultar),
+        ("delete", lambda k: estrutura.pop(k, None), inserir),
+    ]
+
+
+def vazao(fabrica, inserir, consultar):
+    resultado = {}
+    for nome, operacao, chaves in _fases(fabrica, inserir, consultar):
+        inicio = time.perf_counter()
+        for k in chaves:
+            operacao(k)
+        resultado[nome] = len(chaves) / (time.perf_counter() - inicio)
+    return resultado
+
+
+def _percentis(amostras):
+    amostras.sort()
+    ultimo = len(amostras) - 1
+    return {
+        "p50": amostras[ultimo * 50 // 100],
+        "p90": amostras[ultimo * 90 // 100],
+        "p99": amostras[ultimo * 99 // 100],
+        "max": amostras[ultimo],
+    }
+
+
+def latencias(fabrica, inserir, consultar):
+    resultado = {}
+    relogio = time.perf_counter_ns
+    for nome, operacao, chaves in _fases(fabrica, inserir, consultar):
+        amostras = []
+        for k in chaves:
+            inicio = relogio()
+            operacao(k)
+            amostras.append(relogio() - inicio)
+        resultado[nome] = _percentis(amostras)
+    return resultado
+
+
+def pico_memoria(fabrica, inserir):
+    gc.collect()
+    tracemalloc.start()
+    estrutura = fabrica()
+    for k in inserir:
+        estrutura.insert(k)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return pico
+
+
+def medir(fabrica, inserir, consultar):
+    # GC desligado durante a medição para não misturar pausas de coleta
+    gc.collect()
+    gc.disable()
+    try:
+        ops = vazao(fabrica, inserir, consultar)
+        gc.collect()
+        lat = latencias(fabrica, inserir, consultar)
+    finally:
+        gc.enable()
+    return ops, lat, pico_memoria(fabrica, inserir)
+
+
+def metadados(args):
+    return {
+        "data": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "implementacao": platform.python_implementation(),
+        "plataforma": platform.platform(),
+        "processador": platform.processor() or platform.machine(),
+        "seed": args.seed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--cargas", nargs="+", choices=CARGAS, default=CARGAS)
+    parser.add_argument("--estruturas", nargs="+", choices=list(ESTRUTURAS), default=list(ESTRUTURAS))
+    parser.add_argument("--json", help="grava os resultados neste arquivo")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if SortedDict is None:
+        print("sortedcontainers não instalado: SortedDict fica de fora da comparação")
+
+    resultados = []
+    print(f"{'estrutura':<18} {'carga':<12} {'n':>10} {'fase':<7} {'ops/s':>12} "
+          f"{'p50 ns':>8} {'p99 ns':>8} {'max ns':>10} {'pico KiB':>9}")
+    for n in args.tamanhos:
+        for carga in args.cargas:
+            inserir, consultar = gerar_carga(carga, n, random.Random(args.seed))
+            for nome in args.estruturas:
+                ops, lat, pico = medir(ESTRUTURAS[nome], inserir, consultar)
+                for fase in ops:
+                    resultados.append({
+                        "estrutura": nome, "carga": carga, "n": n, "fase": fase,
+                        "ops_por_s": ops[fase], "latencia_ns": lat[fase], "pico_memoria_bytes": pico,
+                    })
+                    print(f"{nome:<18} {carga:<12} {n:>10,} {fase:<7} {ops[fase]:>12,.0f} "
+                          f"{lat[fase]['p50']:>8,} {lat[fase]['p99']:>8,} {lat[fase]['max']:>10,} "
+                          f"{pico / 1024:>9,.0f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"meta": metadados(args), "resultados": resultados}, f, indent=2, ensure_ascii=False)
+        print(f"\nresultados gravados em {args.json}")
+
+
+if __name__ == "__main__":
+    main()
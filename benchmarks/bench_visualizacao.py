@@ -0,0 +1,102 @@
+"""Desenho de árvores grandes: plot_rbt antigo contra comum/visualizacao.py.
+
+Uso:
+    python benchmarks/bench_visualizacao.py [--tamanhos 1000 4000 100000] [--antigo-ate 4000]
+
+Para cada tamanho grava um PNG e um SVG da RedBlackTree (e um PNG da
+BTree de ordem 4), medindo layout e exportação. O desenho antigo (uma
+chamada ax.plot por aresta e um ax.text por nó, posições que se dividem por
+dois a cada nível) só roda até --antigo-ate nós: acima disso ele leva
+minutos. Por fim, exporta a maior árvore com max_nodes=300 (resumo das
+subárvores profundas).
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "arvore-rubro-negra"))
+sys.path.insert(0, os.path.join(RAIZ, "arvore-2-3-4"))
+
+from rubro_negra import RedBlackTree, RED
+from main import BTree
+from visualizacao import export, layout
+
+
+def desenho_antigo(tree, caminho):
+    # O plot_rbt dos scripts de teste, sem a janela
+    positions = {}
+
+    def calculate_positions(node, x, y, x_offset):
+        if node == tree.NULL:
+            return
+        positions[node.key] = (x, y)
+        calculate_positions(node.left, x - x_offset, y - 1, x_offset / 2)
+        calculate_positions(node.right, x + x_offset, y - 1, x_offset / 2)
+
+    def get_height(node):
+        if node == tree.NULL:
+            return 0
+        return 1 + max(get_height(node.left), get_height(node.right))
+
+    calculate_positions(tree.root, 0, get_height(tree.root), 4)
+    fig, ax = plt.subplots(1, 1, figsize=(15, 10))
+    stack = [tree.root]
+    while stack:
+        node = stack.pop()
+        x, y = positions[node.key]
+        for child in (node.left, node.right):
+            if child != tree.NULL:
+                cx, cy = positions[child.key]
+                ax.plot([x, cx], [y, cy], "k-", linewidth=1.5, alpha=0.7)
+                stack.append(child)
+        color = "red" if node.color == RED else "black"
+        ax.add_patch(plt.Circle((x, y), 0.3, facecolor=color, edgecolor="black", linewidth=2))
+        ax.text(x, y, str(node.key), ha="center", va="center", fontsize=12, color="white")
+    ax.axis("off")
+    fig.savefig(caminho)
+    plt.close(fig)
+
+
+def medir(funcao, *args, **kwargs):
+    inicio = time.perf_counter()
+    funcao(*args, **kwargs)
+    return time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[1000, 4000, 100_000])
+    parser.add_argument("--antigo-ate", type=int, default=4000)
+    args = parser.parse_args()
+
+    pasta = tempfile.mkdtemp()
+    print(f"{'árvore':<14} {'nós':>8} {'antigo s':>9} {'layout s':>9} {'PNG s':>7} {'SVG s':>7}")
+    for n in args.tamanhos:
+        estruturas = (("RedBlackTree", RedBlackTree.from_sorted(range(n))),
+                      ("BTree(4)", BTree.from_sorted(range(n), order=4)))
+        for nome, arvore in estruturas:
+            antigo = "-"
+            if nome == "RedBlackTree" and n <= args.antigo_ate:
+                antigo = f"{medir(desenho_antigo, arvore, os.path.join(pasta, 'antigo.png')):.2f}"
+            t_layout = medir(layout, arvore)
+            t_png = medir(export, arvore, os.path.join(pasta, "arvore.png"))
+            t_svg = "-"
+            if nome == "RedBlackTree":
+                t_svg = f"{medir(export, arvore, os.path.join(pasta, 'arvore.svg')):.2f}"
+            nos = len(layout(arvore))
+            print(f"{nome:<14} {nos:>8,} {antigo:>9} {t_layout:>9.2f} {t_png:>7.2f} {t_svg:>7}")
+
+    maior = RedBlackTree.from_sorted(range(max(args.tamanhos)))
+    t_resumo = medir(export, maior, os.path.join(pasta, "resumo.png"), max_nodes=300)
+    print(f"\nRedBlackTree com {len(maior):,} chaves e max_nodes=300: PNG em {t_resumo:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
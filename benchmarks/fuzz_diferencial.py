@@ -0,0 +1,207 @@
+"""Fuzz diferencial das árvores contra uma lista ordenada, com trava de desempenho.
+
+Uso:
+    python benchmarks/fuzz_diferencial.py [--seed 2024] [--operacoes 50000]
+        [--arvores RedBlackTree Tree234 ...] [--validar-cada 500]
+        [--baseline base.json [--gravar-baseline] [--tolerancia 0.2]]
+
+Cada árvore passa por duas fases com a mesma sequência sorteada (pela seed)
+de insert, pop, get, in, iter_from (nos dois sentidos) e min/max:
+
+1. diferencial: cada resposta é comparada com uma lista ordenada e um dict,
+   e tree.validate() confere as invariantes a cada --validar-cada passos e
+   no fim. A primeira divergência para o script com a seed e o passo, para
+   reproduzir.
+2. desempenho: a mesma sequência roda numa árvore nova, sem oráculo, e a
+   melhor de --repeticoes dá as operações por segundo.
+
+Com --gravar-baseline, as vazões são gravadas no JSON de --baseline. Sem
+ele, o script falha (código de saída 1) se alguma árvore ficar mais de
+--tolerancia abaixo da vazão gravada. Vazão depende da máquina: grave a
+baseline na mesma máquina em que a trava vai rodar.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from bisect import bisect_left, bisect_right
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "arvore-rubro-negra"))
+sys.path.insert(0, os.path.join(RAIZ, "arvore-2-3-4"))
+sys.path.insert(0, os.path.join(RAIZ, "arvore-avl"))
+sys.path.insert(0, os.path.join(RAIZ, "arvore-treap"))
+
+from rubro_negra import RedBlackTree
+from rubro_negra_llrb import LeftLeaningRedBlackTree
+from main import BTree, Tree234
+from avl import AVLTree
+from treap import Treap
+
+try:
+    from rubro_negra_numpy import NumpyRedBlackTree
+except ImportError:
+    NumpyRedBlackTree = None
+
+ARVORES = {
+    "RedBlackTree": RedBlackTree,
+    "LeftLeaningRedBlackTree": LeftLeaningRedBlackTree,
+    "AVLTree": AVLTree,
+    "Treap": lambda: Treap(seed=1),
+    "Tree234": Tree234,
+    "BTree(32)": lambda: BTree(order=32),
+}
+if NumpyRedBlackTree is not None:
+    ARVORES["NumpyRedBlackTree"] = NumpyRedBlackTree
+
+# Operações e seus pesos no sorteio
+PESOS = (("insert", 40), ("pop", 25), ("get", 15), ("in", 8), ("iter_from", 5),
+         ("iter_from_reverso", 5), ("min_max", 2))
+
+
+class Divergencia(Exception):
+    pass
+
+
+def sortear(seed, operacoes):
+    """Sequência de (operação, chave), com chaves num universo de operacoes // 4."""
+    rng = random.Random(seed)
+    nomes = [nome for nome, _ in PESOS]
+    pesos = [peso for _, peso in PESOS]
+    universo = max(operacoes // 4, 10)
+    return [(op, rng.randrange(universo)) for op in rng.choices(nomes, weights=pesos, k=operacoes)]
+
+
+def diferencial(tree, sequencia, validar_cada):
+    oraculo, valores = [], {}
+    for passo, (op, chave) in enumerate(sequencia):
+        if op == "insert":
+            nova = chave not in valores
+            obtido, esperado = bool(tree.insert(chave, passo)), nova
+            if nova:
+                oraculo.insert(bisect_left(oraculo, chave), chave)
+            valores[chave] = passo
+        elif op == "pop":
+            obtido, esperado = tree.pop(chave, None), valores.pop(chave, None)
+            if esperado is not None:
+                oraculo.pop(bisect_left(oraculo, chave))
+        elif op == "get":
+            obtido, esperado = tree.get(chave), valores.get(chave)
+        elif op == "in":
+            obtido, esperado = chave in tree, chave in valores
+        elif op == "iter_from":
+            # Até três chaves >= chave
+            obtido = [k for k, _ in zip(tree.iter_from(chave), range(3))]
+            i = bisect_left(oraculo, chave)
+            esperado = oraculo[i:i + 3]
+        elif op == "iter_from_reverso":
+            # Até três chaves <= chave, em ordem decrescente
+            obtido = [k for k, _ in zip(tree.iter_from(chave, reverse=True), range(3))]
+            j = bisect_right(oraculo, chave)
+            esperado = oraculo[max(j - 3, 0):j][::-1]
+        else:
+            obtido = (tree.min(), tree.max()) if oraculo else None
+            esperado = (oraculo[0], oraculo[-1]) if oraculo else None
+        if obtido != esperado:
+            raise Divergencia(f"passo {passo}: {op}({chave}) devolveu {obtido!r}, esperado {esperado!r}")
+        if len(tree) != len(oraculo):
+            raise Divergencia(f"passo {passo}: len {len(tree)}, esperado {len(oraculo)}")
+        if validar_cada and passo % validar_cada == 0:
+            validar(tree, passo)
+    validar(tree, len(sequencia))
+    if list(tree) != oraculo:
+        raise Divergencia("iteração final diverge da lista ordenada")
+    return len(oraculo)
+
+
+def validar(tree, passo):
+    try:
+        tree.validate()
+    except AssertionError as erro:
+        raise Divergencia(f"passo {passo}: invariante quebrada: {erro}") from None
+
+
+def vazao(fabrica, sequencia, repeticoes):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        tree = fabrica()
+        insert, pop, get, iter_from = tree.insert, tree.pop, tree.get, tree.iter_from
+        inicio = time.perf_counter()
+        for op, chave in sequencia:
+            if op == "insert":
+                insert(chave, chave)
+            elif op == "pop":
+                pop(chave, None)
+            elif op == "get":
+                get(chave)
+            elif op == "in":
+                chave in tree
+            elif op == "iter_from":
+                next(iter_from(chave), None)
+            elif op == "iter_from_reverso":
+                next(iter_from(chave, reverse=True), None)
+            elif len(tree):
+                tree.min(), tree.max()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return len(sequencia) / melhor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=2024)
+    parser.add_argument("--operacoes", type=int, default=50_000)
+    parser.add_argument("--arvores", nargs="+", default=list(ARVORES), choices=list(ARVORES))
+    parser.add_argument("--validar-cada", type=int, default=500)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--baseline")
+    parser.add_argument("--gravar-baseline", action="store_true")
+    parser.add_argument("--tolerancia", type=float, default=0.2)
+    args = parser.parse_args()
+    if args.gravar_baseline and not args.baseline:
+        parser.error("--gravar-baseline precisa de --baseline")
+
+    sequencia = sortear(args.seed, args.operacoes)
+    print(f"Fuzz diferencial: seed={args.seed}, {args.operacoes:,} operações, "
+          f"validate() a cada {args.validar_cada} passos")
+    print(f"{'árvore':<24} {'chaves no fim':>13} {'ops/s':>10}")
+    resultados, falhou = {}, False
+    for nome in args.arvores:
+        try:
+            chaves = diferencial(ARVORES[nome](), sequencia, args.validar_cada)
+        except Divergencia as erro:
+            print(f"❌ {nome}: {erro} (reproduza com --seed {args.seed} --operacoes {args.operacoes})")
+            falhou = True
+            continue
+        resultados[nome] = vazao(ARVORES[nome], sequencia, args.repeticoes)
+        print(f"{nome:<24} {chaves:>13,} {resultados[nome]:>10,.0f}")
+
+    if args.baseline and args.gravar_baseline:
+        with open(args.baseline, "w") as arquivo:
+            json.dump({"seed": args.seed, "operacoes": args.operacoes, "ops_por_segundo": resultados},
+                      arquivo, indent=2)
+        print(f"Baseline gravada em {args.baseline}")
+    elif args.baseline:
+        with open(args.baseline) as arquivo:
+            base = json.load(arquivo)
+        if (base["seed"], base["operacoes"]) != (args.seed, args.operacoes):
+            print(f"⚠️  baseline gravada com seed={base['seed']} e {base['operacoes']:,} operações")
+        print(f"\n{'árvore':<24} {'baseline':>10} {'agora':>10} {'variação':>9}")
+        for nome, atual in resultados.items():
+            if nome not in base["ops_por_segundo"]:
+                continue
+            referencia = base["ops_por_segundo"][nome]
+            variacao = atual / referencia - 1
+            queda = variacao < -args.tolerancia
+            falhou = falhou or queda
+            print(f"{nome:<24} {referencia:>10,.0f} {atual:>10,.0f} {variacao:>+8.0%}"
+                  f"{'  ❌ abaixo da tolerância' if queda else ''}")
+
+    if falhou:
+        sys.exit(1)
+    print("✅ Todas as árvores concordam com a lista ordenada e passam em validate()")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""Base dos motores binários sem ponteiro de pai (AVL, treap, LLRB).
+
+Os nós têm key, value, left e right, com None no lugar de filho ausente,
+mais o campo de balanceamento de cada motor (altura, prioridade, cor).
+Sem ponteiro de pai, as alterações guardam o caminho da descida numa
+pilha (ou descem recursivamente) e as rotações devolvem a nova raiz da
+subárvore, que quem chamou pendura de volta no pai.
+
+Esta classe cuida do que não depende do balanceamento: busca, iteração em
+ordem com pilha explícita, iter_from e a verificação da ordem das chaves.
+Cada motor fornece insert, pop, _load_sorted e _check_node.
+"""
+from abc import abstractmethod
+
+from arvore_ordenada import SortedTree, _MISSING
+
+
+class BinarySearchTree(SortedTree):
+    """Árvore binária de busca; subclasses definem o balanceamento."""
+
+    def __init__(self):
+        self.root = None
+        self._len = 0
+
+    def _find(self, key):
+        # Nó com a chave, ou None
+        node = self.root
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            elif node.key < key:
+                node = node.right
+            else:
+                return node
+        return None
+
+    # -------------------------
+    # Interface de mapa
+    # -------------------------
+    def __len__(self):
+        return self._len
+
+    def __contains__(self, key):
+        return self._find(key) is not None
+
+    def get(self, key, default=None):
+        node = self._find(key)
+        return default if node is None else node.value
+
+    def __getitem__(self, key):
+        node = self._find(key)
+        if node is None:
+            raise KeyError(key)
+        return node.value
+
+    def pop(self, key, default=_MISSING):
+        value = self._pop(key)
+        if value is _MISSING:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        return value
+
+    # -------------------------
+    # Iteração preguiçosa
+    # -------------------------
+    # A pilha guarda os ancestrais ainda não emitidos; _walk emite o topo e
+    # empilha o caminho até o próximo (o mínimo da subárvore à direita, ou o
+    # máximo da subárvore à esquerda em ordem decrescente)
+    def _walk(self, stack, reverse=False):
+        while stack:
+            node = stack.pop()
+            yield node
+            child = node.left if reverse else node.right
+            while child is not None:
+                stack.append(child)
+                child = child.right if reverse else child.left
+
+    def _nodes(self, reverse=False):
+        stack = []
+        node = self.root
+        while node is not None:
+            stack.append(node)
+            node = node.right if reverse else node.left
+        return self._walk(stack, reverse)
+
+    def _nodes_from(self, key, reverse=False):
+        # Empilha só os nós do caminho que ainda estão do lado certo de key
+        stack = []
+        node = self.root
+        while node is not None:
+            if reverse:
+                if key < node.key:
+                    node = node.left
+                else:
+                    stack.append(node)
+                    node = node.right
+            elif node.key < key:
+                node = node.right
+            else:
+                stack.append(node)
+                node = node.left
+        return self._walk(stack, reverse)
+
+    def __iter__(self):
+        return (node.key for node in self._nodes())
+
+    def __reversed__(self):
+        return (node.key for node in self._nodes(reverse=True))
+
+    def items(self, reverse=False):
+        return ((node.key, node.value) for node in self._nodes(reverse))
+
+    def iter_from(self, key, reverse=False):
+        """Itera as chaves a partir da primeira >= key (ou <= key se reverse)."""
+        return (node.key for node in self._nodes_from(key, reverse))
+
+    def items_from(self, key, reverse=False):
+        return ((node.key, node.value) for node in self._nodes_from(key, reverse))
+
+    def min(self):
+        """Menor chave da árvore, em O(log n)."""
+        node = self.root
+        if node is None:
+            raise ValueError("árvore vazia")
+        while node.left is not None:
+            node = node.left
+        return node.key
+
+    def max(self):
+        """Maior chave da árvore, em O(log n)."""
+        node = self.root
+        if node is None:
+            raise ValueError("árvore vazia")
+        while node.right is not None:
+            node = node.right
+        return node.key
+
+    # -------------------------
+    # Verificação de invariantes
+    # -------------------------
+    def validate(self):
+        """Confere a ordem das chaves, o tamanho e as invariantes do motor, em O(n).
+
+        Devolve o que _check_node devolve para a raiz (altura, altura negra).
+        A primeira violação levanta AssertionError (também com python -O).
+        """
+        last = [_MISSING]
+        count = [0]
+
+        def visit(node):
+            if node is None:
+                return self._check_node(None, None, None)
+            left = visit(node.left)
+            # Em ordem simétrica, cada chave é maior que a anterior
+            if last[0] is not _MISSING and not last[0] < node.key:
+                raise AssertionError(f"chave {node.key!r} fora de ordem depois de {last[0]!r}")
+            last[0] = node.key
+            count[0] += 1
+            right = visit(node.right)
+            return self._check_node(node, left, right)
+
+        result = visit(self.root)
+        if count[0] != self._len:
+            raise AssertionError(f"len {self._len} com {count[0]} nós na árvore")
+        return result
+
+    @abstractmethod
+    def _check_node(self, node, left, right):
+        """Resultado da subárvore a partir do resultado dos dois filhos (node
+        None: folha vazia); AssertionError se algo não confere."""
@@ -0,0 +1,290 @@
+"""Interface comum de mapa ordenado e escolha do motor na construção.
+
+Cada árvore do repositório nasceu com a sua API: search devolve um nó (ou
+NULL) na RedBlackTree, um índice na NumpyRedBlackTree e um bool na BTree;
+successor recebe um nó numa e uma chave na outra. `SortedTree` fixa o que
+todas oferecem do mesmo jeito, com chaves e valores (nunca nós):
+
+- insert(key, value) -> bool (True se a chave era nova), pop, get, len,
+  in, [], delete, setdefault;
+- iteração em ordem (keys/values/items, reverse=True), iter_from,
+  items_from, min, max, floor e ceiling;
+- insert_many, delete_many, get_many, contains_many e from_sorted;
+- validate(), save/load/open_mmap.
+
+As subclasses implementam os métodos abstratos; o resto tem uma versão
+genérica aqui, que cada motor substitui quando tem uma melhor. O que é de
+um motor só (search e successor por nó, cursor, select/rank, join/split,
+estatísticas) continua fora da interface.
+
+`make_tree(engine, **kwargs)` escolhe o motor pelo nome; a carga de
+trabalho decide (ver benchmarks/bench_motores.py): leituras favorecem a
+AVL, mais rasa; escritas favorecem a rubro-negra, com menos rotações.
+"""
+import importlib
+import os
+import sys
+from abc import ABCMeta, abstractmethod
+
+from persistencia import MappedTree, save_items
+
+# _MISSING marca "pop sem default" (os motores importam daqui); os métodos
+# genéricos consultam com _NOT_FOUND, que nenhum motor confunde com ele
+_MISSING = object()
+_NOT_FOUND = object()
+
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Nome -> (pasta, módulo, classe). Importados só quando pedidos, para que
+# um motor com dependência ausente (NumPy) não impeça os outros
+ENGINES = {
+    "rb": ("arvore-rubro-negra", "rubro_negra", "RedBlackTree"),
+    "llrb": ("arvore-rubro-negra", "rubro_negra_llrb", "LeftLeaningRedBlackTree"),
+    "numpy": ("arvore-rubro-negra", "rubro_negra_numpy", "NumpyRedBlackTree"),
+    "avl": ("arvore-avl", "avl", "AVLTree"),
+    "treap": ("arvore-treap", "treap", "Treap"),
+    "234": ("arvore-2-3-4", "main", "Tree234"),
+    "btree": ("arvore-2-3-4", "main", "BTree"),
+}
+
+
+def engine_class(engine):
+    """Classe do motor `engine` (uma chave de ENGINES)."""
+    if engine not in ENGINES:
+        raise ValueError(f"motor desconhecido: {engine!r} (opções: {', '.join(ENGINES)})")
+    folder, module, name = ENGINES[engine]
+    path = os.path.join(_RAIZ, folder)
+    if path not in sys.path:
+        sys.path.append(path)
+    return getattr(importlib.import_module(module), name)
+
+
+def make_tree(engine="rb", **kwargs):
+    """Árvore vazia do motor `engine`; kwargs vão para o construtor (order=, seed=...)."""
+    return engine_class(engine)(**kwargs)
+
+
+def _sorted_unique(keys, values=None):
+    # Materializa a entrada em listas ordenadas e sem chaves repetidas (todos
+    # os motores usam esta cópia, em from_sorted e nos lotes).
+    # sorted() é O(n) sobre entrada já ordenada (o Timsort detecta a sequência),
+    # então o caminho ordenado não paga O(n log n); entrada fora de ordem é
+    # ordenada aqui. Chaves repetidas ficam com o último valor, como em insert.
+    if values is None:
+        keys = sorted(keys)
+        values = [None] * len(keys)
+    else:
+        pairs = sorted(zip(keys, values), key=lambda kv: kv[0])
+        keys = [k for k, _ in pairs]
+        values = [v for _, v in pairs]
+    if any(keys[i] == keys[i + 1] for i in range(len(keys) - 1)):
+        unique_keys, unique_values = [], []
+        for k, v in zip(keys, values):
+            if unique_keys and unique_keys[-1] == k:
+                unique_values[-1] = v
+            else:
+                unique_keys.append(k)
+                unique_values.append(v)
+        keys, values = unique_keys, unique_values
+    return keys, values
+
+
+def _merge_sorted(keys, values, new_keys, new_values):
+    # Intercala duas sequências ordenadas e sem repetições; em chaves iguais
+    # vale o valor novo. Devolve (chaves, valores, quantidade de chaves novas)
+    out_keys, out_values = [], []
+    i = j = added = 0
+    while i < len(keys) and j < len(new_keys):
+        if keys[i] < new_keys[j]:
+            out_keys.append(keys[i])
+            out_values.append(values[i])
+            i += 1
+        else:
+            if new_keys[j] < keys[i]:
+                added += 1
+            else:
+                i += 1
+            out_keys.append(new_keys[j])
+            out_values.append(new_values[j])
+            j += 1
+    added += len(new_keys) - j
+    out_keys.extend(keys[i:])
+    out_values.extend(values[i:])
+    out_keys.extend(new_keys[j:])
+    out_values.extend(new_values[j:])
+    return out_keys, out_values, added
+
+
+def _subtract_sorted(keys, values, removed_keys):
+    # Remove de uma sequência ordenada as chaves de outra, também ordenada.
+    # Devolve (chaves, valores, quantidade removida)
+    out_keys, out_values = [], []
+    j = 0
+    for k, v in zip(keys, values):
+        while j < len(removed_keys) and removed_keys[j] < k:
+            j += 1
+        if j < len(removed_keys) and removed_keys[j] == k:
+            continue
+        out_keys.append(k)
+        out_values.append(v)
+    return out_keys, out_values, len(keys) - len(out_keys)
+
+
+# ABCMeta em vez de herdar de ABC: ABC declara __slots__ = (), o que muda o
+# layout das subclasses e impede enable_stats de trocar __class__
+class SortedTree(metaclass=ABCMeta):
+    """Mapa ordenado chave -> valor; ver o topo do módulo."""
+
+    # -------------------------
+    # Métodos que cada motor implementa
+    # -------------------------
+    @abstractmethod
+    def insert(self, key, value=None):
+        """Insere ou substitui; devolve True se a chave era nova."""
+
+    @abstractmethod
+    def pop(self, key, default=_MISSING):
+        """Remove e devolve o valor de key (KeyError sem default)."""
+
+    @abstractmethod
+    def get(self, key, default=None):
+        """Valor de key, ou default."""
+
+    @abstractmethod
+    def __len__(self):
+        pass
+
+    @abstractmethod
+    def items(self, reverse=False):
+        """Pares (chave, valor) em ordem, preguiçosamente."""
+
+    @abstractmethod
+    def iter_from(self, key, reverse=False):
+        """Chaves a partir da primeira >= key (ou <= key se reverse)."""
+
+    @abstractmethod
+    def validate(self):
+        """Confere as invariantes do motor; AssertionError na primeira violação."""
+
+    # -------------------------
+    # Construção
+    # -------------------------
+    @classmethod
+    def from_sorted(cls, keys, values=None, **kwargs):
+        """Árvore com as chaves (e valores) dados; entrada fora de ordem é ordenada."""
+        tree = cls(**kwargs)
+        tree._load_sorted(*_sorted_unique(keys, values))
+        return tree
+
+    def _load_sorted(self, keys, values):
+        # Versão genérica para árvore vazia; os motores constroem em O(n)
+        for key, value in zip(keys, values):
+            self.insert(key, value)
+
+    # -------------------------
+    # Interface de mapa
+    # -------------------------
+    def __contains__(self, key):
+        return self.get(key, _NOT_FOUND) is not _NOT_FOUND
+
+    def __getitem__(self, key):
+        value = self.get(key, _NOT_FOUND)
+        if value is _NOT_FOUND:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.insert(key, value)
+
+    def __delitem__(self, key):
+        if self.pop(key, _NOT_FOUND) is _NOT_FOUND:
+            raise KeyError(key)
+
+    def delete(self, key):
+        if self.pop(key, _NOT_FOUND) is _NOT_FOUND:
+            print(f"Valor {key} não encontrado na árvore")
+            return False
+        return True
+
+    def setdefault(self, key, default=None):
+        value = self.get(key, _NOT_FOUND)
+        if value is not _NOT_FOUND:
+            return value
+        self.insert(key, default)
+        return default
+
+    # -------------------------
+    # Ordem
+    # -------------------------
+    def __iter__(self):
+        return (key for key, _ in self.items())
+
+    def __reversed__(self):
+        return (key for key, _ in self.items(reverse=True))
+
+    def keys(self, reverse=False):
+        return reversed(self) if reverse else iter(self)
+
+    def values(self, reverse=False):
+        return (value for _, value in self.items(reverse))
+
+    def items_from(self, key, reverse=False):
+        """Pares (chave, valor) a partir da primeira chave >= key (ou <= key se reverse)."""
+        # Um get por chave, O(k log n); os motores andam direto pelos nós
+        return ((k, self.get(k)) for k in self.iter_from(key, reverse))
+
+    def min(self):
+        for key in self:
+            return key
+        raise ValueError("árvore vazia")
+
+    def max(self):
+        for key in reversed(self):
+            return key
+        raise ValueError("árvore vazia")
+
+    def floor(self, key):
+        """Maior chave <= key, ou None."""
+        return next(self.iter_from(key, reverse=True), None)
+
+    def ceiling(self, key):
+        """Menor chave >= key, ou None."""
+        return next(self.iter_from(key), None)
+
+    # -------------------------
+    # Operações em lote
+    # -------------------------
+    def insert_many(self, keys, values=None):
+        """Insere um lote de chaves (e valores); devolve quantas eram novas."""
+        keys, values = _sorted_unique(keys, values)
+        return sum(self.insert(key, value) for key, value in zip(keys, values))
+
+    def delete_many(self, keys):
+        """Remove um lote de chaves; devolve quantas existiam."""
+        return sum(self.pop(key, _NOT_FOUND) is not _NOT_FOUND for key in _sorted_unique(keys)[0])
+
+    def get_many(self, keys, default=None):
+        """Devolve os valores do lote, na ordem original (default para as ausentes)."""
+        return [self.get(key, default) for key in keys]
+
+    def contains_many(self, keys):
+        """Devolve uma máscara de booleanos, na ordem do lote, indicando quais chaves existem."""
+        return [value is not _NOT_FOUND for value in self.get_many(keys, _NOT_FOUND)]
+
+    # -------------------------
+    # Persistência em disco
+    # -------------------------
+    def save(self, path):
+        """Grava a árvore em `path` no formato binário de comum/persistencia.py."""
+        save_items(path, self.items())
+
+    @staticmethod
+    def open_mmap(path):
+        """Abre um arquivo gravado por save como árvore somente leitura via mmap."""
+        return MappedTree(path)
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        """Reconstrói uma árvore mutável a partir do arquivo, em O(n)."""
+        with MappedTree(path) as mapped:
+            return cls.from_sorted(list(mapped.keys()), list(mapped.values()), **kwargs)
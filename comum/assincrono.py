@@ -0,0 +1,164 @@
+"""Fachada asyncio para as árvores, com agrupamento de consultas.
+
+`AsyncTree` embrulha qualquer árvore do repositório para uso dentro de um
+laço de eventos:
+
+- `await get(key)`: com `coalesce=True`, as consultas que chegam na mesma
+  volta do laço são agrupadas e respondidas por um único get_many (chaves em
+  ordem, uma descida compartilhada) quando o laço chega ao fim daquela
+  volta. Cada consulta passa a esperar a volta inteira, então o agrupamento
+  só compensa quando cada get avulso é caro, como numa ShardedTree (uma ida
+  e volta entre processos por chamada); numa árvore no próprio processo,
+  get direto é mais rápido e é o padrão. Chaves sem hash (listas, por
+  exemplo) não entram no lote, que é um dict por chave: vão direto à
+  árvore;
+- `await put(key, value)` e `await delete(key)`: alterações feitas na hora,
+  depois de responder as consultas pendentes, para que cada consulta veja a
+  árvore como estava quando foi feita;
+- `async for key in irange(lo, hi)` e `items(lo, hi)`: varreduras que
+  devolvem o controle ao laço a cada `yield_every` chaves. A varredura não
+  guarda nenhum ponteiro da árvore entre uma pausa e outra: cada trecho
+  recomeça com iter_from a partir da última chave entregue, então alterações
+  feitas por outras tarefas durante a pausa não a quebram.
+
+As árvores são síncronas e rápidas (microssegundos por operação); a fachada
+não usa threads, só evita que varreduras longas segurem o laço.
+"""
+import asyncio
+
+_MISSING = object()
+
+
+class AsyncTree:
+    """Árvore para uso com asyncio: get agrupado, put/delete e varreduras cooperativas."""
+
+    def __init__(self, tree, yield_every=256, coalesce=False):
+        self.tree = tree
+        self.yield_every = yield_every
+        self.coalesce = coalesce
+        # chave -> lista de (future, default) esperando a próxima descida em lote
+        self._pending = {}
+        self._flush_handle = None
+        self.batches = 0
+
+    # -------------------------
+    # Consultas agrupadas
+    # -------------------------
+    def _flush(self):
+        self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        self.batches += 1
+        keys = list(pending)
+        try:
+            values = self.tree.get_many(keys, _MISSING)
+        except Exception as exc:
+            # O lote falhou inteiro (uma chave incomparável, uma partição
+            # fora do ar): todas as consultas dele recebem o erro, em vez de
+            # esperar para sempre por uma resposta que não virá
+            for waiting in pending.values():
+                for future, _ in waiting:
+                    if not future.done():
+                        future.set_exception(exc)
+            return
+        for key, value in zip(keys, values):
+            for future, default in pending[key]:
+                if not future.done():
+                    future.set_result(default if value is _MISSING else value)
+
+    async def get(self, key, default=None):
+        if not self.coalesce:
+            return self.tree.get(key, default)
+        loop = asyncio.get_running_loop()
+        try:
+            waiting = self._pending.setdefault(key, [])
+        except TypeError:
+            # Sem hash não dá para agrupar; a consulta direta é equivalente
+            return self.tree.get(key, default)
+        future = loop.create_future()
+        waiting.append((future, default))
+        if self._flush_handle is None:
+            # call_soon roda depois das tarefas já prontas nesta volta do laço,
+            # que podem acrescentar suas consultas ao mesmo lote
+            self._flush_handle = loop.call_soon(self._flush)
+        return await future
+
+    async def contains(self, key):
+        return await self.get(key, _MISSING) is not _MISSING
+
+    async def get_many(self, keys, default=None):
+        return self.tree.get_many(keys, default)
+
+    # -------------------------
+    # Alterações
+    # -------------------------
+    def _settle(self):
+        # Responde as consultas pendentes antes de alterar a árvore
+        if self._pending:
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+            self._flush()
+
+    async def put(self, key, value=None):
+        self._settle()
+        return self.tree.insert(key, value)
+
+    async def delete(self, key, default=None):
+        self._settle()
+        return self.tree.pop(key, default)
+
+    async def put_many(self, keys, values=None):
+        self._settle()
+        return self.tree.insert_many(keys, values)
+
+    async def delete_many(self, keys):
+        self._settle()
+        return self.tree.delete_many(keys)
+
+    # -------------------------
+    # Varreduras cooperativas
+    # -------------------------
+    def _chunk(self, lo, hi, after):
+        # Próximo trecho de até yield_every chaves em [lo, hi), depois de `after`
+        if after is _MISSING:
+            keys = iter(self.tree) if lo is None else self.tree.iter_from(lo)
+        else:
+            keys = self.tree.iter_from(after)
+        chunk = []
+        for key in keys:
+            if after is not _MISSING and not after < key:
+                continue
+            if hi is not None and not key < hi:
+                break
+            chunk.append(key)
+            if len(chunk) == self.yield_every:
+                break
+        return chunk
+
+    async def irange(self, lo=None, hi=None):
+        """Itera as chaves em [lo, hi), devolvendo o controle ao laço a cada trecho."""
+        after = _MISSING
+        while True:
+            chunk = self._chunk(lo, hi, after)
+            for key in chunk:
+                yield key
+            if len(chunk) < self.yield_every:
+                return
+            after = chunk[-1]
+            await asyncio.sleep(0)
+
+    async def items(self, lo=None, hi=None):
+        """Como irange, mas com os valores, buscados por trecho com get_many."""
+        after = _MISSING
+        while True:
+            chunk = self._chunk(lo, hi, after)
+            for item in zip(chunk, self.tree.get_many(chunk)):
+                yield item
+            if len(chunk) < self.yield_every:
+                return
+            after = chunk[-1]
+            await asyncio.sleep(0)
+
+    def __aiter__(self):
+        return self.irange()
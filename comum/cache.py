@@ -0,0 +1,209 @@
+"""Cache com capacidade limitada e expiração, indexado por árvores ordenadas.
+
+`TreeCache` junta um dict (chave -> entrada, consulta O(1)) com árvores
+ordenadas pela ordem de despejo:
+
+- por expiração: chaves (expira_em, seq), de modo que a entrada que vence
+  primeiro é sempre o mínimo da árvore. As vencidas formam um prefixo da
+  árvore: limpar é ler esse prefixo em ordem e removê-lo com delete_many
+  (ou com um único split, se a árvore tiver), sem varrer o cache;
+- por uso (política "lru"): chaves seq, renovadas a cada acesso; o mínimo é
+  a entrada usada há mais tempo.
+
+Quando a capacidade estoura, as vencidas saem primeiro; se não bastar, sai
+o mínimo da árvore da política: a menos usada ("lru") ou a que vence antes
+("ttl"). Cada put também remove algumas vencidas, então a limpeza é diluída
+entre as escritas; expire() remove todas de uma vez.
+
+Qualquer árvore do repositório com insert, pop, min, items e delete_many
+serve (RedBlackTree, BTree, Tree234).
+"""
+import time
+
+_NEVER = float("inf")
+_MISSING = object()
+
+
+class TreeCache:
+    """Cache chave -> valor com política "lru" ou "ttl" e contadores de acerto."""
+
+    # Vencidas removidas a cada put, além da própria chave
+    purge_per_put = 2
+    # A partir de quantas vencidas de uma vez a limpeza usa split, se houver
+    split_above = 64
+
+    def __init__(self, tree_class, capacity=None, ttl=None, policy="lru",
+                 clock=time.monotonic, **kwargs):
+        if policy not in ("lru", "ttl"):
+            raise ValueError("policy deve ser 'lru' ou 'ttl'")
+        if capacity is not None and capacity < 1:
+            raise ValueError("capacity deve ser positiva")
+        self.capacity = capacity
+        self.ttl = ttl
+        self.policy = policy
+        self.clock = clock
+        # chave -> [valor, chave na árvore de expiração, chave na de uso]
+        self._entries = {}
+        self._by_expiry = tree_class(**kwargs)
+        self._by_use = tree_class(**kwargs) if policy == "lru" else None
+        self._seq = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _next_seq(self):
+        self._seq += 1
+        return self._seq
+
+    # -------------------------
+    # Remoção de entradas
+    # -------------------------
+    def _discard(self, key):
+        value, expiry_key, use_key = self._entries.pop(key)
+        if expiry_key is not None:
+            self._by_expiry.pop(expiry_key)
+        if use_key is not None:
+            self._by_use.pop(use_key)
+        return value
+
+    def _purge(self, now, limit=None):
+        # Remove vencidas: o prefixo da árvore de expiração até `now`
+        tree = self._by_expiry
+        if not len(tree) or tree.min()[0] > now:
+            return 0
+        expired = []
+        # Primeira chave que fica; se todas venceram, um limite acima de qualquer chave
+        boundary = (_NEVER, _NEVER)
+        for expiry_key, key in tree.items():
+            if expiry_key[0] > now or len(expired) == limit:
+                boundary = expiry_key
+                break
+            expired.append((expiry_key, key))
+        if len(expired) > self.split_above and hasattr(tree, "split"):
+            # Prefixo grande: split (RedBlackTree) corta tudo de uma vez em O(log n)
+            self._by_expiry = tree.split(boundary)[1]
+        else:
+            tree.delete_many([expiry_key for expiry_key, _ in expired])
+        use_keys = []
+        for _, key in expired:
+            use_key = self._entries.pop(key)[2]
+            if use_key is not None:
+                use_keys.append(use_key)
+        if use_keys:
+            self._by_use.delete_many(use_keys)
+        self.expirations += len(expired)
+        return len(expired)
+
+    def expire(self, now=None):
+        """Remove todas as entradas vencidas; devolve quantas eram."""
+        return self._purge(self.clock() if now is None else now)
+
+    def _evict(self, now):
+        # Abre espaço para uma entrada nova
+        while len(self._entries) >= self.capacity:
+            if self._purge(now, 1):
+                continue
+            tree = self._by_use if self.policy == "lru" else self._by_expiry
+            self._discard(tree[tree.min()])
+            self.evictions += 1
+
+    # -------------------------
+    # Interface de mapa
+    # -------------------------
+    def _live(self, key, now):
+        # Entrada ainda válida ou None; a vencida é removida na hora
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] is not None and entry[1][0] <= now:
+            self._discard(key)
+            self.expirations += 1
+            return None
+        return entry
+
+    def get(self, key, default=None):
+        entry = self._live(key, self.clock())
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        if entry[2] is not None:
+            # Renova a posição na ordem de uso
+            self._by_use.pop(entry[2])
+            entry[2] = self._next_seq()
+            self._by_use.insert(entry[2], key)
+        return entry[0]
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def put(self, key, value, ttl=None):
+        """Guarda key -> value; ttl (segundos) substitui o padrão do cache."""
+        now = self.clock()
+        if key in self._entries:
+            self._discard(key)
+        self._purge(now, self.purge_per_put)
+        if self.capacity is not None:
+            self._evict(now)
+
+        ttl = self.ttl if ttl is None else ttl
+        seq = self._next_seq()
+        expiry_key = None
+        if ttl is not None:
+            expiry_key = (now + ttl, seq)
+        elif self.policy == "ttl":
+            # Sem prazo, a entrada fica no fim da ordem de despejo (FIFO entre si)
+            expiry_key = (_NEVER, seq)
+        if expiry_key is not None:
+            self._by_expiry.insert(expiry_key, key)
+        use_key = None
+        if self._by_use is not None:
+            use_key = seq
+            self._by_use.insert(use_key, key)
+        self._entries[key] = [value, expiry_key, use_key]
+
+    def __setitem__(self, key, value):
+        self.put(key, value)
+
+    def pop(self, key, default=None):
+        if self._live(key, self.clock()) is None:
+            return default
+        return self._discard(key)
+
+    def __delitem__(self, key):
+        if self._live(key, self.clock()) is None:
+            raise KeyError(key)
+        self._discard(key)
+
+    def __contains__(self, key):
+        # Não conta como acesso: não mexe nos contadores nem na ordem de uso
+        return self._live(key, self.clock()) is not None
+
+    def __len__(self):
+        # Pode incluir vencidas ainda não removidas; expire() antes para o exato
+        return len(self._entries)
+
+    def clear(self):
+        for key in list(self._entries):
+            self._discard(key)
+
+    # -------------------------
+    # Contadores
+    # -------------------------
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def counters(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "size": len(self._entries),
+        }
+
@@ -0,0 +1,244 @@
+"""Árvore compartilhada entre threads: vários leitores, um escritor por vez.
+
+`ConcurrentTree` embrulha qualquer uma das árvores do repositório
+(RedBlackTree, NumpyRedBlackTree, BTree, Tree234). Consultas pontuais seguram
+a trava de leitura e rodam em paralelo entre si; operações que alteram a
+árvore seguram a trava de escrita, exclusiva. Assim nenhuma leitura enxerga
+uma rotação ou um split pela metade.
+
+A iteração não segura trava nenhuma enquanto o chamador consome os itens:
+ela percorre um snapshot (listas de chaves e valores em ordem) tirado sob a
+trava de leitura. O snapshot é reaproveitado por todas as iterações até a
+próxima escrita, então em cargas dominadas por leitura ele custa O(n) uma
+vez, e não a cada iteração.
+"""
+import threading
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+
+
+class RWLock:
+    """Trava leitores-escritor com preferência para o escritor.
+
+    Um escritor esperando barra novos leitores, para que um fluxo contínuo de
+    leituras não o deixe esperando para sempre. Não é reentrante.
+    """
+
+    def __init__(self):
+        # O caminho rápido usa só o mutex (with em C, sem frames Python);
+        # a condição é para quem precisa esperar
+        self._mutex = threading.Lock()
+        self._cond = threading.Condition(self._mutex)
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    def acquire_read(self):
+        with self._mutex:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+
+    def release_read(self):
+        with self._mutex:
+            self._readers -= 1
+            if not self._readers and self._writers_waiting:
+                self._cond.notify_all()
+
+    def acquire_write(self):
+        with self._mutex:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+
+    def release_write(self):
+        with self._mutex:
+            self._writer = False
+            self._cond.notify_all()
+
+    @contextmanager
+    def read(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class ConcurrentTree:
+    """Embrulha uma árvore para uso por várias threads."""
+
+    def __init__(self, tree):
+        self._tree = tree
+        self._lock = RWLock()
+        self._snapshot = None
+
+    # -------------------------
+    # Acesso direto sob trava
+    # -------------------------
+    @contextmanager
+    def reading(self):
+        """Bloco com a trava de leitura; entrega a árvore para consultas compostas."""
+        with self._lock.read():
+            yield self._tree
+
+    @contextmanager
+    def writing(self):
+        """Bloco com a trava de escrita; entrega a árvore para alterações compostas."""
+        with self._lock.write():
+            try:
+                yield self._tree
+            finally:
+                self._snapshot = None
+
+    def _write(self, method, *args):
+        lock = self._lock
+        lock.acquire_write()
+        try:
+            self._snapshot = None
+            return getattr(self._tree, method)(*args)
+        finally:
+            lock.release_write()
+
+    # -------------------------
+    # Consultas (em paralelo)
+    # -------------------------
+    # Os métodos abaixo repetem acquire/try/finally em vez de usar um
+    # context manager: numa leitura de poucos microssegundos, os frames extras
+    # do contextmanager custavam mais do que a própria busca
+    def __len__(self):
+        lock = self._lock
+        lock.acquire_read()
+        try:
+            return len(self._tree)
+        finally:
+            lock.release_read()
+
+    def __contains__(self, key):
+        lock = self._lock
+        lock.acquire_read()
+        try:
+            return key in self._tree
+        finally:
+            lock.release_read()
+
+    def __getitem__(self, key):
+        lock = self._lock
+        lock.acquire_read()
+        try:
+            return self._tree[key]
+        finally:
+            lock.release_read()
+
+    def get(self, key, default=None):
+        lock = self._lock
+        lock.acquire_read()
+        try:
+            return self._tree.get(key, default)
+        finally:
+            lock.release_read()
+
+    def get_many(self, keys, default=None):
+        lock = self._lock
+        lock.acquire_read()
+        try:
+            return self._tree.get_many(keys, default)
+        finally:
+            lock.release_read()
+
+    def contains_many(self, keys):
+        lock = self._lock
+        lock.acquire_read()
+        try:
+            return self._tree.contains_many(keys)
+        finally:
+            lock.release_read()
+
+    # -------------------------
+    # Alterações (uma por vez)
+    # -------------------------
+    def insert(self, key, value=None):
+        return self._write("insert", key, value)
+
+    def __setitem__(self, key, value):
+        self._write("__setitem__", key, value)
+
+    def setdefault(self, key, default=None):
+        return self._write("setdefault", key, default)
+
+    def delete(self, key):
+        return self._write("delete", key)
+
+    def __delitem__(self, key):
+        self._write("__delitem__", key)
+
+    def pop(self, key, *default):
+        return self._write("pop", key, *default)
+
+    def insert_many(self, keys, values=None):
+        return self._write("insert_many", keys, values)
+
+    def delete_many(self, keys):
+        return self._write("delete_many", keys)
+
+    # -------------------------
+    # Iteração sobre snapshot
+    # -------------------------
+    def snapshot(self):
+        """Devolve (chaves, valores) em ordem, consistentes entre si."""
+        snap = self._snapshot
+        if snap is None:
+            with self._lock.read():
+                snap = self._snapshot
+                if snap is None:
+                    # Dois leitores podem montar o snapshot ao mesmo tempo;
+                    # o conteúdo é o mesmo e fica valendo o último
+                    keys, values = [], []
+                    for key, value in self._tree.items():
+                        keys.append(key)
+                        values.append(value)
+                    snap = self._snapshot = (keys, values)
+        return snap
+
+    def __iter__(self):
+        return iter(self.snapshot()[0])
+
+    def __reversed__(self):
+        return reversed(self.snapshot()[0])
+
+    def keys(self, reverse=False):
+        return reversed(self) if reverse else iter(self)
+
+    def values(self, reverse=False):
+        values = self.snapshot()[1]
+        return reversed(values) if reverse else iter(values)
+
+    def items(self, reverse=False):
+        keys, values = self.snapshot()
+        pairs = zip(keys, values)
+        return reversed(list(pairs)) if reverse else pairs
+
+    def iter_from(self, key, reverse=False):
+        """Itera as chaves do snapshot a partir da primeira >= key (ou <= key se reverse)."""
+        keys = self.snapshot()[0]
+        if reverse:
+            return (keys[i] for i in range(bisect_right(keys, key) - 1, -1, -1))
+        return (keys[i] for i in range(bisect_left(keys, key), len(keys)))
+
+    def irange(self, lo=None, hi=None, reverse=False):
+        """Itera as chaves do snapshot em [lo, hi); None deixa o limite aberto."""
+        keys = self.snapshot()[0]
+        start = 0 if lo is None else bisect_left(keys, lo)
+        stop = len(keys) if hi is None else bisect_left(keys, hi)
+        indices = range(stop - 1, start - 1, -1) if reverse else range(start, stop)
+        return (keys[i] for i in indices)
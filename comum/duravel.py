@@ -0,0 +1,459 @@
+"""Árvore durável: log de escrita antecipada (WAL) e checkpoints completos.
+
+`DurableTree` embrulha uma árvore do repositório (RedBlackTree, BTree,
+Tree234) e grava cada insert/delete num log binário antes de devolver.
+Depois de uma queda, a árvore é remontada a partir do último checkpoint
+mais o trecho do log escrito depois dele, e não repetindo todo o histórico.
+
+Arquivos no diretório:
+
+    wal.<seg>.log         segmentos do log, numerados em ordem
+    checkpoint.<seg>.arv  conteúdo completo da árvore (formato de
+                          comum/persistencia.py) com tudo o que veio antes
+                          do segmento <seg>
+
+Cada registro do log é [tamanho u32][crc32 u32][operação u8][pickle]. Um
+registro cortado no meio (queda durante a escrita) falha no tamanho ou no
+CRC; a recuperação para nele e trunca o segmento ali.
+
+Política de fsync (`sync`):
+
+- "always": cada operação só volta depois do fsync do seu registro. Com
+  várias threads escrevendo, quem chega durante um fsync entra no seguinte
+  (commit em grupo): um fsync confirma todas as operações pendentes.
+- "batch": fsync a cada `batch_size` operações; uma queda perde no máximo
+  esse número de operações.
+- "interval": uma thread faz fsync a cada `interval` segundos.
+- "none": o log vai para o sistema operacional a cada 64 KiB, sem fsync;
+  sobrevive à queda do processo, não à da máquina.
+
+Checkpoint: a cada `checkpoint_every` operações (ou ao chamar checkpoint()),
+o log passa para um segmento novo e as chaves e valores são copiados em
+listas sob a trava, o único trecho O(n) que bloqueia as escritas. A
+gravação do arquivo (codificação, fsync, troca atômica) roda numa thread
+de fundo; terminada, os segmentos e checkpoints anteriores são apagados.
+A recuperação carrega o checkpoint com from_sorted (carga em lote, sem
+rebalancear) e só reaplica, operação por operação, o trecho do log depois
+dele. Arquivos .tmp de um checkpoint interrompido são apagados ao abrir.
+
+Os checkpoints não são incrementais: cada um copia as n chaves sob a trava
+e grava o arquivo inteiro, mesmo que só algumas tenham mudado, e a
+recuperação custa O(n + trecho do log). Com checkpoint_every da ordem
+de n ou maior, a cópia custa O(1) amortizado por operação.
+
+As chaves seguem as regras do formato em disco: todas do mesmo tipo, entre
+int, float, str e bytes. insert confere isso antes de registrar a operação,
+para que o checkpoint não falhe depois. Se a gravação de um checkpoint em
+fundo falhar mesmo assim (disco cheio, por exemplo), o log anterior fica
+intacto e o erro sobe na próxima chamada a checkpoint(wait=True), flush()
+ou close().
+"""
+import os
+import pickle
+import struct
+import threading
+import time
+import zlib
+
+from persistencia import MappedTree, _key_kind, save_items
+
+_MISSING = object()
+_FRAME = struct.Struct("<II")
+_INSERT = 1
+_DELETE = 2
+# Política "none": tamanho do buffer que vai para o sistema de uma vez
+_UNSYNCED_BYTES = 1 << 16
+SYNC_POLICIES = ("always", "batch", "interval", "none")
+
+
+def _segment_number(name, prefix, suffix):
+    if name.startswith(prefix) and name.endswith(suffix):
+        middle = name[len(prefix):-len(suffix)]
+        if middle.isdigit():
+            return int(middle)
+    return None
+
+
+def _fsync_directory(path):
+    # Torna duráveis as criações, trocas e remoções de arquivos no diretório
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _read_log(path):
+    """Registros (operação, carga) de um segmento e o tamanho da parte íntegra."""
+    with open(path, "rb") as f:
+        data = f.read()
+    records, pos = [], 0
+    while pos + _FRAME.size <= len(data):
+        size, crc = _FRAME.unpack_from(data, pos)
+        start, end = pos + _FRAME.size, pos + _FRAME.size + size
+        if size == 0 or end > len(data) or zlib.crc32(data[start:end]) != crc:
+            break
+        records.append((data[start], data[start + 1:end]))
+        pos = end
+    return records, pos
+
+
+class DurableTree:
+    """Árvore cujas alterações sobrevivem a quedas (ver o docstring do módulo).
+
+    Abrir um diretório que já tem dados recupera o estado gravado;
+    `recovery` diz quantas chaves vieram do checkpoint, quantas operações
+    do log foram reaplicadas e quanto tempo levou, e `fsyncs` conta os
+    fsync do log. Argumentos extras (como order) vão para o construtor da
+    árvore.
+    """
+
+    def __init__(self, tree_class, directory, sync="batch", batch_size=256, interval=0.05,
+                 checkpoint_every=None, **kwargs):
+        if sync not in SYNC_POLICIES:
+            raise ValueError(f"sync deve ser um de {SYNC_POLICIES}")
+        self.tree_class = tree_class
+        self.directory = directory
+        self.sync = sync
+        self.batch_size = batch_size
+        self.interval = interval
+        self.checkpoint_every = checkpoint_every
+        self._kwargs = kwargs
+        os.makedirs(directory, exist_ok=True)
+
+        # _lock ordena as alterações da árvore e do buffer do log; _io_lock
+        # serializa as gravações no arquivo (e a troca de segmento)
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._buffer = bytearray()
+        self._lsn = 0          # número da última operação registrada
+        self._written_lsn = 0  # ... entregue ao sistema operacional
+        self._synced_lsn = 0   # ... com fsync
+        self._since_checkpoint = 0
+        self._checkpointing = None
+        self._checkpoint_error = None
+        self._closed = False
+        self.fsyncs = 0
+
+        self._tree, self._segment, self.recovery = self._recover()
+        # Tipo das chaves no formato em disco ("q", "d", "s" ou "b")
+        self._kind = _key_kind((self._tree.min(),)) if len(self._tree) else None
+        self._file = open(self._log_path(self._segment), "ab")
+        _fsync_directory(directory)
+
+        self._stop = threading.Event()
+        self._flusher = None
+        if sync == "interval":
+            self._flusher = threading.Thread(target=self._flush_periodically, daemon=True)
+            self._flusher.start()
+
+    # -------------------------
+    # Caminhos e recuperação
+    # -------------------------
+    def _log_path(self, segment):
+        return os.path.join(self.directory, f"wal.{segment:08d}.log")
+
+    def _checkpoint_path(self, segment):
+        return os.path.join(self.directory, f"checkpoint.{segment:08d}.arv")
+
+    def _files(self, prefix, suffix):
+        numbers = (_segment_number(name, prefix, suffix) for name in os.listdir(self.directory))
+        return sorted(n for n in numbers if n is not None)
+
+    def _recover(self):
+        start = time.perf_counter()
+        # Um checkpoint interrompido deixa o .tmp de save_items para trás;
+        # o checkpoint anterior e o log continuam valendo
+        for name in os.listdir(self.directory):
+            if name.startswith("checkpoint.") and name.endswith(".arv.tmp"):
+                os.remove(os.path.join(self.directory, name))
+        checkpoints = self._files("checkpoint.", ".arv")
+        base = checkpoints[-1] if checkpoints else 0
+        if checkpoints:
+            with MappedTree(self._checkpoint_path(base)) as mapped:
+                tree = self.tree_class.from_sorted(list(mapped.keys()), list(mapped.values()),
+                                                   **self._kwargs)
+        else:
+            tree = self.tree_class(**self._kwargs)
+        loaded = len(tree)
+
+        replayed = 0
+        segments = [s for s in self._files("wal.", ".log") if s >= base]
+        for segment in segments:
+            path = self._log_path(segment)
+            records, valid = _read_log(path)
+            for op, payload in records:
+                if op == _INSERT:
+                    tree.insert(*pickle.loads(payload))
+                else:
+                    tree.pop(pickle.loads(payload), None)
+            replayed += len(records)
+            empty = valid == 0
+            if valid != os.path.getsize(path):
+                # Cauda cortada por uma queda no meio da escrita
+                with open(path, "r+b") as f:
+                    f.truncate(valid)
+                    os.fsync(f.fileno())
+        # Escritas novas vão para um segmento novo (ou para o último, se vazio)
+        if not segments:
+            segment = base
+        else:
+            segment = segments[-1] if empty else segments[-1] + 1
+        recovery = {"checkpoint_keys": loaded, "replayed": replayed,
+                    "seconds": time.perf_counter() - start}
+        return tree, segment, recovery
+
+    # -------------------------
+    # Log
+    # -------------------------
+    def _append(self, op, payload):
+        # Chamado com _lock: o registro entra no buffer na ordem da alteração
+        body = bytes((op,)) + payload
+        self._buffer += _FRAME.pack(len(body), zlib.crc32(body))
+        self._buffer += body
+        self._lsn += 1
+        self._since_checkpoint += 1
+        return self._lsn
+
+    def _flush(self, lsn, fsync):
+        # Grava o buffer até pelo menos `lsn`. Quem espera o _io_lock durante
+        # o fsync de outra thread costuma encontrar o seu registro já gravado
+        with self._io_lock:
+            if (self._synced_lsn if fsync else self._written_lsn) >= lsn:
+                return
+            with self._lock:
+                data, self._buffer = self._buffer, bytearray()
+                last = self._lsn
+            f = self._file
+            if data:
+                f.write(data)
+                f.flush()
+            self._written_lsn = last
+            if fsync:
+                os.fsync(f.fileno())
+                self.fsyncs += 1
+                self._synced_lsn = last
+
+    def _commit(self, lsn):
+        # Aplica a política de fsync depois de soltar _lock
+        sync = self.sync
+        if sync == "always":
+            self._flush(lsn, True)
+        elif sync == "batch":
+            if lsn - self._synced_lsn >= self.batch_size:
+                self._flush(lsn, True)
+        elif sync == "none" and len(self._buffer) >= _UNSYNCED_BYTES:
+            self._flush(lsn, False)
+        if self.checkpoint_every and self._since_checkpoint >= self.checkpoint_every:
+            self.checkpoint(wait=False)
+
+    def _flush_periodically(self):
+        while not self._stop.wait(self.interval):
+            self._flush(self._lsn, True)
+
+    def flush(self):
+        """fsync de tudo o que já foi registrado, qualquer que seja a política."""
+        self._flush(self._lsn, True)
+        self._raise_checkpoint_error()
+
+    # -------------------------
+    # Alterações (registradas no log)
+    # -------------------------
+    def insert(self, key, value=None):
+        # TypeError/OverflowError aqui, e não na thread do checkpoint
+        kind = _key_kind((key,))
+        payload = pickle.dumps((key, value), protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            if kind != self._kind and len(self._tree):
+                raise TypeError(f"chave {key!r} não é do tipo das chaves já gravadas")
+            self._kind = kind
+            result = self._tree.insert(key, value)
+            lsn = self._append(_INSERT, payload)
+        self._commit(lsn)
+        return result
+
+    def __setitem__(self, key, value):
+        self.insert(key, value)
+
+    def _pop(self, key):
+        # Remove key e devolve o seu valor, ou _MISSING (sem registrar nada)
+        with self._lock:
+            value = self._tree.pop(key, _MISSING)
+            if value is _MISSING:
+                return value
+            lsn = self._append(_DELETE, pickle.dumps(key, protocol=pickle.HIGHEST_PROTOCOL))
+        self._commit(lsn)
+        return value
+
+    def pop(self, key, default=_MISSING):
+        value = self._pop(key)
+        if value is _MISSING:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        return value
+
+    def delete(self, key):
+        """Remove key; devolve False (sem registrar nada) se ela não existir."""
+        return self._pop(key) is not _MISSING
+
+    def __delitem__(self, key):
+        self.pop(key)
+
+    # -------------------------
+    # Consultas (sob _lock)
+    # -------------------------
+    # As consultas seguram a mesma trava das alterações: uma busca não vê a
+    # árvore no meio de uma rotação. A iteração percorre uma cópia tirada
+    # sob a trava, O(n), e não segura as escritas enquanto quem chamou
+    # consome o iterador.
+    #
+    # insert e delete alteram a árvore antes do fsync. Em "always", uma
+    # consulta que viu essas alterações espera o fsync delas antes de
+    # voltar (entrando no mesmo commit em grupo), e nunca devolve algo que
+    # uma queda apagaria. Nas outras políticas as consultas não esperam: podem
+    # ver operações que uma queda ainda perderia, as mesmas que a política
+    # já aceita perder.
+    @property
+    def tree(self):
+        """A árvore em memória, sem trava; alterações devem passar por aqui."""
+        return self._tree
+
+    def _durable(self, lsn):
+        # Chamado sem _lock, com o lsn lido junto com a consulta
+        if self.sync == "always" and self._synced_lsn < lsn:
+            self._flush(lsn, True)
+
+    def __len__(self):
+        with self._lock:
+            size, lsn = len(self._tree), self._lsn
+        self._durable(lsn)
+        return size
+
+    def __contains__(self, key):
+        with self._lock:
+            found, lsn = key in self._tree, self._lsn
+        self._durable(lsn)
+        return found
+
+    def __getitem__(self, key):
+        # A ausência também precisa ser durável: espera antes do KeyError
+        with self._lock:
+            value, lsn = self._tree.get(key, _MISSING), self._lsn
+        self._durable(lsn)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        with self._lock:
+            value, lsn = self._tree.get(key, default), self._lsn
+        self._durable(lsn)
+        return value
+
+    def __iter__(self):
+        with self._lock:
+            keys, lsn = list(self._tree), self._lsn
+        self._durable(lsn)
+        return iter(keys)
+
+    def items(self, reverse=False):
+        with self._lock:
+            items, lsn = list(self._tree.items(reverse=reverse)), self._lsn
+        self._durable(lsn)
+        return iter(items)
+
+    # -------------------------
+    # Checkpoint
+    # -------------------------
+    def checkpoint(self, wait=True):
+        """Grava o conteúdo atual e descarta o log anterior a ele.
+
+        A troca de segmento e a cópia das chaves acontecem agora; a gravação
+        roda numa thread (wait=False) ou antes de voltar (wait=True). Se já
+        houver um checkpoint em andamento, não começa outro.
+        """
+        with self._io_lock:
+            running = self._checkpointing
+            if running is not None and running.is_alive():
+                if not wait:
+                    return False
+            else:
+                running = None
+        if running is not None:
+            running.join()
+            self._raise_checkpoint_error()
+            return False
+        with self._io_lock:
+            with self._lock:
+                data, self._buffer = self._buffer, bytearray()
+                last = self._lsn
+                keys, values = [], []
+                for key, value in self._tree.items():
+                    keys.append(key)
+                    values.append(value)
+                self._since_checkpoint = 0
+                old = self._file
+                self._segment += 1
+                segment = self._segment
+                self._file = open(self._log_path(segment), "ab")
+            # Fecha o segmento antigo com tudo o que já estava no buffer
+            old.write(data)
+            old.flush()
+            os.fsync(old.fileno())
+            old.close()
+            self._written_lsn = self._synced_lsn = last
+        _fsync_directory(self.directory)
+        thread = threading.Thread(target=self._write_checkpoint, args=(segment, keys, values))
+        self._checkpointing = thread
+        thread.start()
+        if wait:
+            thread.join()
+            self._raise_checkpoint_error()
+        return True
+
+    def _raise_checkpoint_error(self):
+        # Erro guardado pela thread do checkpoint: sobe uma vez só
+        error, self._checkpoint_error = self._checkpoint_error, None
+        if error is not None:
+            raise error
+
+    def _write_checkpoint(self, segment, keys, values):
+        try:
+            save_items(self._checkpoint_path(segment), zip(keys, values))
+            _fsync_directory(self.directory)
+        except BaseException as exc:
+            # Sem o checkpoint novo, os segmentos antigos continuam valendo
+            self._checkpoint_error = exc
+            return
+        # O checkpoint novo cobre tudo o que está nos segmentos anteriores
+        for old in self._files("wal.", ".log"):
+            if old < segment:
+                os.remove(self._log_path(old))
+        for old in self._files("checkpoint.", ".arv"):
+            if old < segment:
+                os.remove(self._checkpoint_path(old))
+        _fsync_directory(self.directory)
+
+    # -------------------------
+    # Encerramento
+    # -------------------------
+    def close(self):
+        """fsync do que falta, espera o checkpoint em andamento e fecha o log."""
+        if self._closed:
+            return
+        self._closed = True
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        if self._checkpointing is not None:
+            self._checkpointing.join()
+        self._flush(self._lsn, True)
+        self._file.close()
+        self._raise_checkpoint_error()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,211 @@
+"""Contadores opcionais dos caminhos quentes das árvores.
+
+Quando as estatísticas são ligadas (`tree.enable_stats()`), a instância
+passa a ser de uma subclasse instrumentada, criada uma única vez por classe,
+que envolve as operações públicas e os passos de rebalanceamento. Desligadas
+(`tree.disable_stats()`), a instância volta à classe original: o código
+executado é exatamente o de sempre, sem nenhum teste de "estatística ligada?"
+no caminho quente.
+
+Para cada operação (insert, delete, search, setdefault) são registrados:
+- depth: nós visitados na descida até a chave (ou até a folha, se faltar);
+- comparisons: comparações de chave dessa descida;
+- rotations, recolors (rubro-negra) e splits, merges, borrows (árvore B);
+- ns: duração da operação, agrupada em potências de 2.
+
+A descida é medida por uma busca espelho com a chave embrulhada em
+`CountingKey`, feita antes da operação, de modo que a chave gravada na
+árvore nunca é o embrulho.
+"""
+import json
+import time
+from collections import Counter
+
+METRICS = ("depth", "comparisons", "rotations", "recolors", "splits", "merges", "borrows", "ns")
+EVENTS = ("rotations", "recolors", "splits", "merges", "borrows")
+
+
+class CountingKey:
+    """Embrulha uma chave e conta as comparações feitas com ela."""
+
+    __slots__ = ("key", "comparisons")
+
+    def __init__(self, key):
+        self.key = key
+        self.comparisons = 0
+
+    def __lt__(self, other):
+        self.comparisons += 1
+        return self.key < other
+
+    def __gt__(self, other):
+        self.comparisons += 1
+        return self.key > other
+
+    def __le__(self, other):
+        self.comparisons += 1
+        return self.key <= other
+
+    def __ge__(self, other):
+        self.comparisons += 1
+        return self.key >= other
+
+    def __eq__(self, other):
+        self.comparisons += 1
+        return self.key == other
+
+    def __ne__(self, other):
+        self.comparisons += 1
+        return self.key != other
+
+    __hash__ = None
+
+
+def _bucket(ns):
+    # Limite superior da potência de 2 que contém ns (1, 2, 4, 8, ...)
+    return 1 << max(ns - 1, 0).bit_length()
+
+
+class TreeStats:
+    """Totais por evento e histogramas por operação e métrica.
+
+    Com `log=True`, guarda também um registro por operação (dict com a
+    operação, a chave e todas as métricas), para cruzar picos de latência
+    com o rebalanceamento que os causou.
+    """
+
+    def __init__(self, log=False):
+        self.totals = Counter()
+        self.histograms = {}
+        self.log = [] if log else None
+        self._current = None
+
+    def count(self, event, n=1):
+        if not n:
+            return
+        self.totals[event] += n
+        if self._current is not None:
+            self._current[event] += n
+
+    def begin(self, op, key, depth, comparisons):
+        self._current = {"op": op, "key": key, "depth": depth, "comparisons": comparisons}
+        for event in EVENTS:
+            self._current[event] = 0
+        self._start = time.perf_counter_ns()
+
+    def end(self):
+        record = self._current
+        record["ns"] = time.perf_counter_ns() - self._start
+        self._current = None
+
+        op = record["op"]
+        self.totals[op] += 1
+        self.totals["comparisons"] += record["comparisons"]
+        per_op = self.histograms.setdefault(op, {metric: Counter() for metric in METRICS})
+        for metric in METRICS:
+            value = _bucket(record[metric]) if metric == "ns" else record[metric]
+            per_op[metric][value] += 1
+        if self.log is not None:
+            self.log.append(record)
+
+    def histogram(self, op, metric):
+        """Lista ordenada de (valor, ocorrências) da métrica na operação."""
+        return sorted(self.histograms.get(op, {}).get(metric, Counter()).items())
+
+    def reset(self):
+        self.totals.clear()
+        self.histograms.clear()
+        if self.log is not None:
+            self.log.clear()
+
+    def as_dict(self):
+        """Totais, histogramas e registro em estruturas prontas para JSON."""
+        result = {
+            "totals": dict(self.totals),
+            "histograms": {
+                op: {metric: {str(value): n for value, n in sorted(counter.items())}
+                     for metric, counter in per_op.items()}
+                for op, per_op in self.histograms.items()
+            },
+        }
+        if self.log is not None:
+            result["log"] = [dict(record, key=repr(record["key"])) for record in self.log]
+        return result
+
+    def save_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.as_dict(), f, indent=2, ensure_ascii=False)
+
+    def summary(self):
+        """Resumo em texto: totais e média de cada métrica por operação."""
+        lines = []
+        for op, per_op in sorted(self.histograms.items()):
+            total = sum(per_op["depth"].values())
+            means = []
+            for metric in METRICS[:-1]:
+                mean = sum(value * n for value, n in per_op[metric].items()) / total
+                if mean:
+                    means.append(f"{metric}={mean:.2f}")
+            lines.append(f"{op:<10} {total:>10,} ops  " + "  ".join(means))
+        return "\n".join(lines)
+
+
+# -------------------------
+# Subclasses instrumentadas
+# -------------------------
+class StatsOperations:
+    """Envolve as operações públicas (chave como primeiro argumento).
+
+    A classe da árvore fornece `_trace(key)`, que devolve (profundidade,
+    comparações) de uma busca espelho pela chave.
+    """
+
+    def _run(self, op, base, key, *args):
+        stats = self.stats
+        # Chamada aninhada (como __setitem__ -> insert): só a operação mais
+        # externa é registrada
+        if stats._current is not None:
+            return base(self, key, *args)
+        stats.begin(op, key, *self._trace(key))
+        try:
+            return base(self, key, *args)
+        finally:
+            stats.end()
+
+    def insert(self, key, value=None):
+        return self._run("insert", self._base_class.insert, key, value)
+
+    def __setitem__(self, key, value):
+        return self._run("insert", self._base_class.__setitem__, key, value)
+
+    def setdefault(self, key, default=None):
+        return self._run("setdefault", self._base_class.setdefault, key, default)
+
+    def delete(self, key):
+        return self._run("delete", self._base_class.delete, key)
+
+    def __delitem__(self, key):
+        return self._run("delete", self._base_class.__delitem__, key)
+
+    def pop(self, key, *default):
+        return self._run("delete", self._base_class.pop, key, *default)
+
+    def __contains__(self, key):
+        return self._run("search", self._base_class.__contains__, key)
+
+    def __getitem__(self, key):
+        return self._run("search", self._base_class.__getitem__, key)
+
+    def get(self, key, default=None):
+        return self._run("search", self._base_class.get, key, default)
+
+
+_INSTRUMENTED = {}
+
+
+def instrumented_class(cls, hooks):
+    """Subclasse de `cls` com as operações e os ganchos `hooks` instrumentados."""
+    if cls not in _INSTRUMENTED:
+        _INSTRUMENTED[cls] = type(cls.__name__, (StatsOperations, hooks, cls),
+                                  {"_base_class": cls, "__module__": cls.__module__})
+    return _INSTRUMENTED[cls]
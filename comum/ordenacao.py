@@ -0,0 +1,154 @@
+"""Ordem por função de chave, como em sorted(key=..., reverse=...).
+
+As árvores comparam as chaves com `<`. Para ordenar registros por um campo,
+o caminho comum é embrulhá-los num objeto com __lt__ escrito em Python, que
+roda a cada comparação de cada descida (e a busca ainda chama __eq__).
+
+`KeyedTree` faz o contrário: a chave derivada key(registro) é calculada uma
+vez por operação e guardada como chave do nó da árvore interna, com o par
+(registro, valor) como valor. As descidas comparam só as chaves guardadas
+(tuplas, números, strings), comparações que rodam em C.
+
+reverse=True não inverte a comparação, o que custaria um embrulho de novo:
+a árvore interna continua em ordem crescente e só o sentido da iteração (e
+de min/max) é trocado.
+
+Dois registros com a mesma chave derivada ocupam a mesma entrada: o último
+inserido substitui o anterior, como num dict indexado por key(registro).
+"""
+_MISSING = object()
+
+
+def _identity(record):
+    return record
+
+
+class KeyedTree:
+    """Mapa registro -> valor ordenado por key(registro), sobre outra árvore.
+
+    `tree` é uma árvore vazia do repositório (RedBlackTree, BTree, Tree234);
+    irange usa o cursor dela.
+    """
+
+    def __init__(self, tree, key=None, reverse=False):
+        self.tree = tree
+        self.key = key if key is not None else _identity
+        self.reverse = reverse
+
+    # -------------------------
+    # Operações de um registro
+    # -------------------------
+    def insert(self, record, value=None):
+        return self.tree.insert(self.key(record), (record, value))
+
+    def __setitem__(self, record, value):
+        self.insert(record, value)
+
+    def get(self, record, default=None):
+        entry = self.tree.get(self.key(record), _MISSING)
+        return default if entry is _MISSING else entry[1]
+
+    def __getitem__(self, record):
+        entry = self.tree.get(self.key(record), _MISSING)
+        if entry is _MISSING:
+            raise KeyError(record)
+        return entry[1]
+
+    def find(self, sort_key, default=None):
+        """Registro guardado com a chave derivada sort_key (sem calcular key)."""
+        entry = self.tree.get(sort_key, _MISSING)
+        return default if entry is _MISSING else entry[0]
+
+    def __contains__(self, record):
+        return self.key(record) in self.tree
+
+    def pop(self, record, default=_MISSING):
+        entry = self.tree.pop(self.key(record), _MISSING)
+        if entry is _MISSING:
+            if default is _MISSING:
+                raise KeyError(record)
+            return default
+        return entry[1]
+
+    def __delitem__(self, record):
+        self.pop(record)
+
+    def __len__(self):
+        return len(self.tree)
+
+    # -------------------------
+    # Lotes (a chave de cada registro é calculada uma vez)
+    # -------------------------
+    def insert_many(self, records, values=None):
+        records = list(records)
+        values = [None] * len(records) if values is None else values
+        key = self.key
+        return self.tree.insert_many([key(r) for r in records], list(zip(records, values)))
+
+    def delete_many(self, records):
+        key = self.key
+        return self.tree.delete_many([key(r) for r in records])
+
+    def get_many(self, records, default=None):
+        key = self.key
+        entries = self.tree.get_many([key(r) for r in records], _MISSING)
+        return [default if entry is _MISSING else entry[1] for entry in entries]
+
+    def contains_many(self, records):
+        key = self.key
+        return self.tree.contains_many([key(r) for r in records])
+
+    # -------------------------
+    # Ordem
+    # -------------------------
+    def _entries(self, reverse=False):
+        return self.tree.values(reverse=self.reverse != reverse)
+
+    def __iter__(self):
+        return (record for record, _ in self._entries())
+
+    def __reversed__(self):
+        return (record for record, _ in self._entries(reverse=True))
+
+    def keys(self, reverse=False):
+        return (record for record, _ in self._entries(reverse))
+
+    def values(self, reverse=False):
+        return (value for _, value in self._entries(reverse))
+
+    def items(self, reverse=False):
+        return self._entries(reverse)
+
+    def min(self):
+        """Primeiro registro na ordem da árvore (o de maior chave se reverse)."""
+        sort_key = self.tree.max() if self.reverse else self.tree.min()
+        return self.tree[sort_key][0]
+
+    def max(self):
+        sort_key = self.tree.min() if self.reverse else self.tree.max()
+        return self.tree[sort_key][0]
+
+    def irange(self, lo=None, hi=None):
+        """Itens (registro, valor) com chave derivada em [lo, hi), na ordem da árvore.
+
+        lo e hi são chaves derivadas, não registros; com reverse, os itens
+        saem do maior para o menor.
+        """
+        cursor = self.tree.cursor()
+        if not self.reverse:
+            if lo is not None:
+                cursor.seek(lo)
+            while cursor.valid and (hi is None or cursor.key < hi):
+                yield cursor.value
+                cursor.next()
+            return
+        # Última chave < hi: a primeira >= hi e um passo para trás
+        if hi is not None:
+            cursor.seek(hi)
+        if hi is None or not cursor.valid:
+            cursor.last()
+        else:
+            cursor.prev()
+        while cursor.valid and (lo is None or not cursor.key < lo):
+            yield cursor.value
+            cursor.prev()
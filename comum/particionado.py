@@ -0,0 +1,361 @@
+"""Árvore particionada por intervalos entre processos de trabalho.
+
+`ShardedTree` divide o espaço de chaves em N intervalos contíguos, cada um
+guardado por uma árvore própria num processo separado. Operações em lote
+(insert_many, delete_many, contains_many, get_many) são repartidas por
+intervalo e enviadas a todos os processos antes de esperar qualquer
+resposta, então os N processos trabalham ao mesmo tempo, cada um num núcleo.
+
+Como a partição é por intervalo, a ordem global é a concatenação das ordens
+de cada partição: iteração e irange só percorrem as partições na ordem dos
+limites, sem intercalação.
+
+Os limites nascem dos quantis do primeiro lote inserido (ou são passados em
+`split_points`). Quando uma partição passa de `skew` vezes a média,
+`rebalance` recalcula os limites pelos quantis globais e move para os
+vizinhos as chaves que mudaram de dono.
+
+Cada chamada é uma ida e volta entre processos (dezenas de microssegundos),
+então operações de uma chave só compensam em lote.
+"""
+import multiprocessing
+from bisect import bisect_right
+from itertools import islice
+
+# Sentinela para distinguir "sem padrão" de um padrão None em pop()
+_MISSING = object()
+
+
+# -------------------------
+# Processo de trabalho
+# -------------------------
+def _key_at(tree, rank):
+    select = getattr(tree, "select", None)
+    if select is not None:
+        return select(rank)
+    return next(islice(iter(tree), rank, None))
+
+
+def _range_items(tree, lo, hi):
+    # Itens com chave em [lo, hi); None deixa o limite aberto
+    items = tree.items() if lo is None else tree.items_from(lo)
+    for key, value in items:
+        if hi is not None and not key < hi:
+            return
+        yield key, value
+
+
+def _worker(conn, tree_class, kwargs):
+    tree = tree_class(**kwargs)
+    while True:
+        command, args = conn.recv()
+        if command == "stop":
+            conn.close()
+            return
+        try:
+            if command == "insert_many":
+                result = tree.insert_many(*args)
+            elif command == "delete_many":
+                result = tree.delete_many(*args)
+            elif command == "contains_many":
+                result = tree.contains_many(*args)
+            elif command == "get_many":
+                result = tree.get_many(*args)
+            elif command == "pop":
+                # (existia?, valor): a sentinela não atravessa o pipe
+                value = tree.pop(args[0], _MISSING)
+                result = (False, None) if value is _MISSING else (True, value)
+            elif command == "items":
+                lo, hi, limit = args
+                result = list(islice(_range_items(tree, lo, hi), limit))
+            elif command == "key_at":
+                result = _key_at(tree, *args)
+            elif command == "split_off":
+                # Remove e devolve os itens fora de [lo, hi)
+                lo, hi = args
+                moved = []
+                if hasattr(tree, "split"):
+                    # RedBlackTree corta as pontas em O(log n) com split
+                    if lo is not None:
+                        below, tree = tree.split(lo)
+                        moved += below.items()
+                    if hi is not None:
+                        tree, above = tree.split(hi)
+                        moved += above.items()
+                else:
+                    if lo is not None:
+                        moved += _range_items(tree, None, lo)
+                    if hi is not None:
+                        moved += _range_items(tree, hi, None)
+                    tree.delete_many([key for key, _ in moved])
+                result = moved
+            else:
+                raise ValueError(f"comando desconhecido: {command}")
+        except Exception as exc:
+            conn.send((False, exc))
+        else:
+            conn.send((True, result))
+
+
+# -------------------------
+# Fachada
+# -------------------------
+class ShardedTree:
+    """Árvore ordenada particionada por intervalos entre `shards` processos.
+
+    `tree_class` (e `kwargs`) criam a árvore de cada processo: RedBlackTree,
+    BTree, Tree234 ou NumpyRedBlackTree. A classe precisa ser importável
+    pelos processos filhos.
+    """
+
+    def __init__(self, tree_class, shards=None, split_points=None, skew=2.0,
+                 auto_rebalance=True, **kwargs):
+        shards = shards or multiprocessing.cpu_count()
+        if split_points is not None and len(split_points) != shards - 1:
+            raise ValueError("split_points deve ter shards - 1 limites")
+        self._bounds = sorted(split_points) if split_points is not None else None
+        self._sizes = [0] * shards
+        self.skew = skew
+        self.auto_rebalance = auto_rebalance
+
+        self._conns = []
+        self._procs = []
+        for _ in range(shards):
+            parent, child = multiprocessing.Pipe()
+            proc = multiprocessing.Process(target=_worker, args=(child, tree_class, kwargs), daemon=True)
+            proc.start()
+            child.close()
+            self._conns.append(parent)
+            self._procs.append(proc)
+
+    def close(self):
+        for conn in self._conns:
+            conn.send(("stop", ()))
+        for proc in self._procs:
+            proc.join()
+        self._conns = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def shards(self):
+        return len(self._conns)
+
+    @property
+    def split_points(self):
+        return list(self._bounds or ())
+
+    def shard_sizes(self):
+        return list(self._sizes)
+
+    # -------------------------
+    # Comunicação
+    # -------------------------
+    def _receive(self, i):
+        ok, result = self._conns[i].recv()
+        if not ok:
+            raise result
+        return result
+
+    def _fan_out(self, requests):
+        # requests: {partição: (comando, args)}; envia tudo antes de esperar.
+        # Todas as respostas são lidas antes de levantar o primeiro erro:
+        # uma resposta esquecida no pipe seria lida pela chamada seguinte
+        for i, request in requests.items():
+            self._conns[i].send(request)
+        replies = {i: self._conns[i].recv() for i in requests}
+        for ok, result in replies.values():
+            if not ok:
+                raise result
+        return {i: result for i, (_, result) in replies.items()}
+
+    def _call(self, i, command, *args):
+        self._conns[i].send((command, args))
+        return self._receive(i)
+
+    def _shard_of(self, key):
+        return bisect_right(self._bounds, key) if self._bounds else 0
+
+    def _partition(self, keys):
+        # {partição: índices das chaves do lote que caem nela}
+        groups = {}
+        bounds = self._bounds or ()
+        for index, key in enumerate(keys):
+            groups.setdefault(bisect_right(bounds, key), []).append(index)
+        return groups
+
+    def _bootstrap(self, keys):
+        # Primeiro lote numa árvore sem limites: os quantis dele viram os limites
+        distinct = sorted(set(keys))
+        n = self.shards
+        if n == 1 or len(distinct) < n:
+            self._bounds = []
+            return
+        self._bounds = [distinct[len(distinct) * i // n] for i in range(1, n)]
+
+    # -------------------------
+    # Operações em lote (em paralelo)
+    # -------------------------
+    def insert_many(self, keys, values=None):
+        """Insere um lote de chaves (e valores); devolve quantas eram novas."""
+        keys = list(keys)
+        values = [None] * len(keys) if values is None else list(values)
+        if self._bounds is None:
+            self._bootstrap(keys)
+        groups = self._partition(keys)
+        added = self._fan_out({
+            i: ("insert_many", ([keys[j] for j in idx], [values[j] for j in idx]))
+            for i, idx in groups.items()
+        })
+        for i, n in added.items():
+            self._sizes[i] += n
+        if self.auto_rebalance and self.is_skewed():
+            self.rebalance()
+        return sum(added.values())
+
+    def delete_many(self, keys):
+        """Remove um lote de chaves; devolve quantas existiam."""
+        keys = list(keys)
+        groups = self._partition(keys)
+        removed = self._fan_out({i: ("delete_many", ([keys[j] for j in idx],))
+                                 for i, idx in groups.items()})
+        for i, n in removed.items():
+            self._sizes[i] -= n
+        return sum(removed.values())
+
+    def _gather(self, command, keys, fill, *extra):
+        keys = list(keys)
+        groups = self._partition(keys)
+        replies = self._fan_out({i: (command, ([keys[j] for j in idx], *extra))
+                                 for i, idx in groups.items()})
+        result = [fill] * len(keys)
+        for i, idx in groups.items():
+            for j, answer in zip(idx, replies[i]):
+                result[j] = answer
+        return result
+
+    def contains_many(self, keys):
+        """Máscara de booleanos, na ordem do lote, indicando quais chaves existem."""
+        return self._gather("contains_many", keys, False)
+
+    def get_many(self, keys, default=None):
+        """Valores das chaves, na ordem do lote (default para as ausentes)."""
+        return self._gather("get_many", keys, default, default)
+
+    # -------------------------
+    # Operações de uma chave (uma ida e volta cada)
+    # -------------------------
+    def insert(self, key, value=None):
+        return self.insert_many([key], [value]) == 1
+
+    def __contains__(self, key):
+        return self._call(self._shard_of(key), "contains_many", [key])[0]
+
+    def get(self, key, default=None):
+        return self._call(self._shard_of(key), "get_many", [key], default)[0]
+
+    def pop(self, key, default=_MISSING):
+        # Uma ida e volta só: busca e remoção acontecem juntas no processo
+        i = self._shard_of(key)
+        found, value = self._call(i, "pop", key)
+        if not found:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        self._sizes[i] -= 1
+        return value
+
+    def __len__(self):
+        return sum(self._sizes)
+
+    # -------------------------
+    # Ordem global
+    # -------------------------
+    def _overlapping(self, lo, hi):
+        first = 0 if lo is None else self._shard_of(lo)
+        last = self.shards - 1 if hi is None else self._shard_of(hi)
+        return range(first, last + 1)
+
+    def irange_items(self, lo=None, hi=None):
+        """Itens com chave em [lo, hi), em ordem; as partições respondem em paralelo."""
+        replies = self._fan_out({i: ("items", (lo, hi, None)) for i in self._overlapping(lo, hi)})
+        for i in sorted(replies):
+            yield from replies[i]
+
+    def irange(self, lo=None, hi=None):
+        """Chaves em [lo, hi), em ordem; None deixa o limite aberto."""
+        return (key for key, _ in self.irange_items(lo, hi))
+
+    def items(self):
+        return self.irange_items()
+
+    def _paged(self, lo, page=4096):
+        # Chaves a partir de lo, buscadas em páginas sob demanda, partição por
+        # partição: quem consome só o começo não paga pelo resto
+        for i in self._overlapping(lo, None):
+            start, after = lo, False
+            while True:
+                batch = self._call(i, "items", start, None, page)
+                for key, _ in batch:
+                    # Páginas seguintes recomeçam na última chave já entregue
+                    if not (after and key == start):
+                        yield key
+                if len(batch) < page:
+                    break
+                start, after = batch[-1][0], True
+
+    def iter_from(self, key):
+        """Chaves a partir da primeira >= key, em ordem, buscadas em páginas."""
+        return self._paged(key)
+
+    def __iter__(self):
+        return self._paged(None)
+
+    # -------------------------
+    # Rebalanceamento dos limites
+    # -------------------------
+    def is_skewed(self):
+        total = sum(self._sizes)
+        if self.shards == 1 or total < 16 * self.shards:
+            return False
+        return max(self._sizes) > self.skew * total / self.shards
+
+    def rebalance(self):
+        """Recalcula os limites pelos quantis globais e migra as chaves.
+
+        Cada novo limite é a chave de posição global total * i / N, achada com
+        select na partição que a contém. Depois, cada partição entrega as
+        chaves fora do seu novo intervalo, que são reinseridas no novo dono.
+        """
+        total = sum(self._sizes)
+        if self.shards == 1 or not total:
+            return
+        starts = [0]
+        for size in self._sizes:
+            starts.append(starts[-1] + size)
+        bounds = []
+        for i in range(1, self.shards):
+            rank = total * i // self.shards
+            owner = bisect_right(starts, rank) - 1
+            bounds.append(self._call(owner, "key_at", rank - starts[owner]))
+
+        self._bounds = bounds
+        limits = [None] + bounds + [None]
+        moved = self._fan_out({i: ("split_off", (limits[i], limits[i + 1])) for i in range(self.shards)})
+        keys, values = [], []
+        for i, items in moved.items():
+            self._sizes[i] -= len(items)
+            for key, value in items:
+                keys.append(key)
+                values.append(value)
+        groups = self._partition(keys)
+        added = self._fan_out({
+            i: ("insert_many", ([keys[j] for j in idx], [values[j] for j in idx]))
+            for i, idx in groups.items()
+        })
+        for i, n in added.items():
+            self._sizes[i] += n
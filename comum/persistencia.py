@@ -0,0 +1,326 @@
+"""Formato binário em disco compartilhado pelas árvores, com leitura via mmap.
+
+A árvore é gravada como suas chaves em ordem, num vetor de largura fixa
+(inteiros e floats) ou num vetor de deslocamentos + bytes (str e bytes),
+seguido opcionalmente dos valores serializados com pickle. Um vetor
+ordenado é uma árvore de busca implícita e perfeitamente balanceada: a busca
+binária sobre ele tem a mesma profundidade log2(n) da árvore em memória, sem
+gravar nenhum ponteiro.
+
+Layout (little-endian, seções alinhadas em 8 bytes):
+
+    cabeçalho (64 bytes)
+        magic "ARVORE\\0\\0", versão (u32), tipo da chave (1 byte: q, d, s, b),
+        tem valores (u8), n (u64), deslocamentos das seções (u64 x 4)
+    chaves        n x int64/float64, ou (n + 1) deslocamentos u64 + dados
+    valores       (n + 1) deslocamentos u64 + pickles concatenados (opcional)
+
+`MappedTree` abre o arquivo com mmap somente leitura e responde buscas,
+intervalos e iteração direto das páginas mapeadas, sem desserializar nada
+de antemão. Vários processos abrindo o mesmo arquivo compartilham as
+mesmas páginas do cache do sistema operacional.
+"""
+import mmap
+import os
+import pickle
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+
+MAGIC = b"ARVORE\x00\x00"
+VERSION = 1
+HEADER_SIZE = 64
+_HEADER = struct.Struct("<8sIcB2xQQQQQ")
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+
+def _key_kind(keys):
+    if not keys:
+        return "q"
+    kinds = set()
+    for k in keys:
+        if isinstance(k, bool):
+            raise TypeError("chaves bool não são suportadas no formato em disco")
+        if isinstance(k, int):
+            if not _INT64_MIN <= k <= _INT64_MAX:
+                raise OverflowError(f"chave {k} fora do intervalo de int64 do formato em disco")
+            kinds.add("q")
+        elif isinstance(k, float):
+            kinds.add("d")
+        elif isinstance(k, str):
+            kinds.add("s")
+        elif isinstance(k, bytes):
+            kinds.add("b")
+        else:
+            raise TypeError(f"tipo de chave não suportado no formato em disco: {type(k).__name__}")
+    if len(kinds) > 1:
+        raise TypeError("todas as chaves devem ter o mesmo tipo para serem gravadas")
+    return kinds.pop()
+
+
+def _pad(f):
+    f.write(b"\x00" * (-f.tell() % 8))
+
+
+def _write_blobs(f, blobs):
+    # Grava (n + 1) deslocamentos relativos seguidos dos blobs; devolve o
+    # deslocamento absoluto do início dos dados
+    f.write(array("Q", accumulate((len(b) for b in blobs), initial=0)).tobytes())
+    _pad(f)
+    data_offset = f.tell()
+    f.write(b"".join(blobs))
+    _pad(f)
+    return data_offset
+
+
+def save_items(path, items):
+    """Grava pares (chave, valor) já em ordem crescente de chave em `path`.
+
+    A gravação vai para um arquivo temporário que substitui `path` de forma
+    atômica, então leitores nunca veem um arquivo pela metade.
+    """
+    keys, values = [], []
+    for k, v in items:
+        keys.append(k)
+        values.append(v)
+    kind = _key_kind(keys)
+    has_values = any(v is not None for v in values)
+
+    # Tudo o que pode falhar (codificação, pickle) acontece antes de abrir o
+    # arquivo; um erro de escrita apaga o temporário
+    key_bytes = key_blobs = None
+    if kind in "qd":
+        key_bytes = array(kind, keys).tobytes()
+    elif kind == "s":
+        key_blobs = [k.encode("utf-8") for k in keys]
+    else:
+        key_blobs = keys
+    value_blobs = None
+    if has_values:
+        value_blobs = [pickle.dumps(v, protocol=pickle.HIGHEST_PROTOCOL) for v in values]
+
+    tmp = f"{path}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(b"\x00" * HEADER_SIZE)
+            keys_offset = f.tell()
+            keys_data_offset = 0
+            if key_blobs is None:
+                f.write(key_bytes)
+                _pad(f)
+            else:
+                keys_data_offset = _write_blobs(f, key_blobs)
+
+            values_offset = values_data_offset = 0
+            if has_values:
+                values_offset = f.tell()
+                values_data_offset = _write_blobs(f, value_blobs)
+
+            f.seek(0)
+            f.write(_HEADER.pack(MAGIC, VERSION, kind.encode(), has_values, len(keys),
+                                 keys_offset, keys_data_offset, values_offset, values_data_offset))
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    os.replace(tmp, path)
+
+
+class _BlobKeys:
+    # Sequência de chaves de tamanho variável lida sob demanda do mmap;
+    # tem __len__ e __getitem__, o bastante para o módulo bisect
+    def __init__(self, mm, offsets, base, decode):
+        self._mm = mm
+        self._offsets = offsets
+        self._base = base
+        self._decode = decode
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        start = self._base + self._offsets[i]
+        raw = self._mm[start:self._base + self._offsets[i + 1]]
+        return raw.decode("utf-8") if self._decode else raw
+
+
+class MappedTree:
+    """Árvore somente leitura servida de um arquivo gravado por save_items."""
+
+    def __init__(self, path):
+        self._views = []
+        self._mm = None
+        self._file = open(path, "rb")
+        try:
+            self._map(path)
+        except BaseException:
+            # Cabeçalho inválido ou arquivo truncado: não deixa o arquivo aberto
+            self.close()
+            raise
+
+    def _map(self, path):
+        size = os.fstat(self._file.fileno()).st_size
+        if size < HEADER_SIZE:
+            raise ValueError(f"{path} não é um arquivo de árvore ({size} bytes, cabeçalho tem {HEADER_SIZE})")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, kind, has_values, n, keys_offset, keys_data_offset,
+         values_offset, values_data_offset) = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} não é um arquivo de árvore")
+        if version != VERSION:
+            raise ValueError(f"versão {version} do formato não suportada (esperada {VERSION})")
+        kind = kind.decode("latin-1")
+        if kind not in ("q", "d", "s", "b") or has_values > 1:
+            raise ValueError(f"{path}: cabeçalho corrompido (tipo {kind!r}, valores {has_values})")
+
+        self._n = n
+        buf = self._view(memoryview(self._mm))
+        if kind in ("q", "d"):
+            self._keys = self._view(self._section(buf, path, keys_offset, n).cast(kind))
+        else:
+            offsets = self._view(self._section(buf, path, keys_offset, n + 1).cast("Q"))
+            self._check_blobs(path, offsets, keys_data_offset, size)
+            self._keys = _BlobKeys(self._mm, offsets, keys_data_offset, kind == "s")
+        self._values = None
+        if has_values:
+            offsets = self._view(self._section(buf, path, values_offset, n + 1).cast("Q"))
+            self._check_blobs(path, offsets, values_data_offset, size)
+            self._values = _BlobKeys(self._mm, offsets, values_data_offset, False)
+
+    @staticmethod
+    def _section(buf, path, offset, count):
+        # Fatia de `count` palavras de 8 bytes; o arquivo precisa contê-la inteira
+        end = offset + 8 * count
+        if offset < HEADER_SIZE or offset % 8 or end > len(buf):
+            raise ValueError(f"{path} truncado ou corrompido: seção [{offset}, {end}) "
+                             f"fora de {len(buf)} bytes")
+        return buf[offset:end]
+
+    @staticmethod
+    def _check_blobs(path, offsets, base, size):
+        # Os blobs são lidos sob demanda; o último precisa terminar dentro do arquivo
+        if base > size or base + offsets[len(offsets) - 1] > size:
+            raise ValueError(f"{path} truncado ou corrompido: dados terminam depois de {size} bytes")
+
+    def _view(self, view):
+        # Guarda as memoryviews para liberá-las antes de fechar o mmap
+        self._views.append(view)
+        return view
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if self._mm is not None:
+            self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _value(self, i):
+        if self._values is None:
+            return None
+        return pickle.loads(self._values[i])
+
+    # -------------------------
+    # Busca
+    # -------------------------
+    def _index(self, key):
+        i = bisect_left(self._keys, key)
+        if i < self._n and self._keys[i] == key:
+            return i
+        return -1
+
+    def __len__(self):
+        return self._n
+
+    def __contains__(self, key):
+        return self._index(key) >= 0
+
+    def __getitem__(self, key):
+        i = self._index(key)
+        if i < 0:
+            raise KeyError(key)
+        return self._value(i)
+
+    def get(self, key, default=None):
+        i = self._index(key)
+        if i < 0:
+            return default
+        return self._value(i)
+
+    def min(self):
+        if not self._n:
+            raise ValueError("árvore vazia")
+        return self._keys[0]
+
+    def max(self):
+        if not self._n:
+            raise ValueError("árvore vazia")
+        return self._keys[self._n - 1]
+
+    # -------------------------
+    # Iteração e intervalos
+    # -------------------------
+    def _indices(self, reverse=False):
+        return range(self._n - 1, -1, -1) if reverse else range(self._n)
+
+    def __iter__(self):
+        return (self._keys[i] for i in self._indices())
+
+    def __reversed__(self):
+        return (self._keys[i] for i in self._indices(reverse=True))
+
+    def keys(self, reverse=False):
+        return reversed(self) if reverse else iter(self)
+
+    def values(self, reverse=False):
+        return (self._value(i) for i in self._indices(reverse))
+
+    def items(self, reverse=False):
+        return ((self._keys[i], self._value(i)) for i in self._indices(reverse))
+
+    def iter_from(self, key, reverse=False):
+        """Itera as chaves a partir da primeira >= key (ou <= key se reverse)."""
+        if reverse:
+            return (self._keys[i] for i in range(bisect_right(self._keys, key) - 1, -1, -1))
+        return (self._keys[i] for i in range(bisect_left(self._keys, key), self._n))
+
+    def items_from(self, key, reverse=False):
+        if reverse:
+            indices = range(bisect_right(self._keys, key) - 1, -1, -1)
+        else:
+            indices = range(bisect_left(self._keys, key), self._n)
+        return ((self._keys[i], self._value(i)) for i in indices)
+
+    def rank(self, key):
+        """Quantidade de chaves estritamente menores que key."""
+        return bisect_left(self._keys, key)
+
+    def select(self, k):
+        """Devolve a k-ésima menor chave (k começa em 0; negativo conta do fim)."""
+        if k < 0:
+            k += self._n
+        if not 0 <= k < self._n:
+            raise IndexError("índice fora do intervalo da árvore")
+        return self._keys[k]
+
+    def count_range(self, lo=None, hi=None):
+        """Quantidade de chaves em [lo, hi); None deixa o limite aberto."""
+        upper = self._n if hi is None else self.rank(hi)
+        lower = 0 if lo is None else self.rank(lo)
+        return max(upper - lower, 0)
+
+    def irange(self, lo=None, hi=None, reverse=False):
+        """Itera apenas as chaves em [lo, hi); None deixa o limite aberto."""
+        start = 0 if lo is None else self.rank(lo)
+        stop = self._n if hi is None else self.rank(hi)
+        indices = range(stop - 1, start - 1, -1) if reverse else range(start, stop)
+        return (self._keys[i] for i in indices)
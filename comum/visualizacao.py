@@ -0,0 +1,316 @@
+"""Desenho das árvores com layout compacto, para árvores pequenas e grandes.
+
+O desenho antigo (plot_rbt nos scripts de teste) dividia o deslocamento
+horizontal por dois a cada nível, indexava as posições por node.key e fazia
+uma chamada ax.plot por aresta e um ax.text por nó: acima de uns 15 níveis
+os nós se sobrepunham e, com 100 mil nós, o matplotlib não terminava.
+
+Aqui o layout segue a ideia de Reingold-Tilford: cada subárvore é montada
+de baixo para cima e guarda os contornos esquerdo e direito (o x mais à
+esquerda e mais à direita de cada nível, relativo à sua raiz). Irmãos são
+empurrados só o necessário para os contornos não se tocarem, e o pai fica
+centrado sobre os filhos. Juntar duas subárvores custa a altura da menor,
+e a soma disso numa árvore balanceada é O(n). Os nós são identificados por
+índice, então chaves repetidas não colidem.
+
+O desenho usa uma coleção por tipo de elemento (LineCollection para as
+arestas, EllipseCollection ou PolyCollection para os nós), rasterizada
+acima de `rasterize_above` nós, de modo que um SVG de 100 mil nós sai como
+uma imagem embutida e não como 200 mil elementos. Rótulos só são escritos
+até `label_limit` nós.
+
+Com max_depth (ou max_nodes, que escolhe a profundidade), subárvores abaixo
+do corte viram um triângulo cinza com o número de chaves escondidas. Na
+rubro-negra o número vem do campo size, sem visitar a subárvore.
+
+Serve para RedBlackTree, PersistentRedBlackTree, BTree e Tree234.
+"""
+from matplotlib.collections import EllipseCollection, LineCollection, PolyCollection
+from matplotlib.figure import Figure
+import matplotlib.patches as patches
+
+# Cores e medidas em unidades do eixo: um nível = 1 na vertical
+RED_COLOR = "red"
+BLACK_COLOR = "black"
+BTREE_COLOR = "#cfe2f3"
+SUMMARY_COLOR = "#b0b0b0"
+NODE_HEIGHT = 0.6
+KEY_WIDTH = 0.8
+# Mesmo valor de rubro_negra.RED (comum/ não importa as árvores)
+RED = 1
+
+
+class TreeLayout:
+    """Posições calculadas por layout(): listas paralelas indexadas pelo nó."""
+
+    __slots__ = ("x", "y", "widths", "labels", "colors", "summaries", "edges", "binary", "depth")
+
+    def __init__(self, binary):
+        self.x = []
+        self.y = []
+        self.widths = []
+        self.labels = []
+        self.colors = []
+        self.summaries = []  # índices dos nós que resumem uma subárvore
+        self.edges = []      # pares (pai, filho)
+        self.binary = binary
+        self.depth = 0
+
+    def __len__(self):
+        return len(self.x)
+
+    def bounds(self):
+        left = min(x - w / 2 for x, w in zip(self.x, self.widths))
+        right = max(x + w / 2 for x, w in zip(self.x, self.widths))
+        return left, right, -self.depth, 0
+
+
+# -------------------------
+# Adaptadores: como ler os nós de cada árvore
+# -------------------------
+def _binary_adapter(tree):
+    null = getattr(tree, "NULL", None)
+
+    def children(node):
+        return [None if c is null else c for c in (node.left, node.right)]
+
+    def info(node):
+        color = RED_COLOR if node.color == RED else BLACK_COLOR
+        return str(node.key), color, 1.0
+
+    def hidden(node):
+        return node.size
+
+    return (None if tree.root is null else tree.root), children, info, hidden
+
+
+def _btree_adapter(tree):
+    def children(node):
+        return node.children
+
+    def info(node):
+        label = "|".join(str(k) for k in node.keys)
+        return label, BTREE_COLOR, max(1.0, KEY_WIDTH * len(node.keys))
+
+    def hidden(node):
+        total, stack = 0, [node]
+        while stack:
+            node = stack.pop()
+            total += len(node.keys)
+            stack.extend(node.children)
+        return total
+
+    return (tree.root if tree.root.keys else None), children, info, hidden
+
+
+def _adapter(tree):
+    if hasattr(tree.root, "keys") and hasattr(tree.root, "children"):
+        return False, _btree_adapter(tree)
+    if isinstance(tree.root, int):
+        raise TypeError("NumpyRedBlackTree não tem objetos de nó; converta com RedBlackTree.from_sorted(tree.items())")
+    return True, _binary_adapter(tree)
+
+
+def _depth_for(root, children, max_nodes):
+    # Maior profundidade cujos níveis visíveis somam até max_nodes nós
+    level, seen, depth = [root], 0, 0
+    while level:
+        seen += len(level)
+        nxt = [c for node in level for c in children(node) if c is not None]
+        if not nxt or seen + len(nxt) > max_nodes:
+            return depth
+        level, depth = nxt, depth + 1
+    return depth
+
+
+# -------------------------
+# Layout
+# -------------------------
+def layout(tree, max_depth=None, max_nodes=None, gap=0.5):
+    """Calcula as posições dos nós (ver o docstring do módulo).
+
+    max_depth corta a árvore nessa profundidade (a raiz tem profundidade 0);
+    max_nodes escolhe a maior profundidade que mostra até esse número de nós.
+    gap é o espaço mínimo entre dois nós vizinhos do mesmo nível.
+    """
+    binary, (root, children, info, hidden) = _adapter(tree)
+    result = TreeLayout(binary)
+    if root is None:
+        return result
+    if max_nodes is not None:
+        limit = _depth_for(root, children, max_nodes)
+        max_depth = limit if max_depth is None else min(max_depth, limit)
+
+    rel = []     # x relativo ao pai
+    kids = []    # índices dos filhos de cada nó
+    x, y, widths, labels, colors = result.x, result.y, result.widths, result.labels, result.colors
+
+    def place(node, depth):
+        # Devolve (índice, contorno esquerdo, contorno direito); contornos são
+        # listas por nível, relativas ao centro do nó
+        i = len(x)
+        label, color, width = info(node)
+        x.append(0.0)
+        y.append(-depth)
+        rel.append(0.0)
+        kids.append(())
+        below = children(node)
+        if max_depth is not None and depth >= max_depth and any(c is not None for c in below):
+            labels.append(f"+{hidden(node)}")
+            colors.append(SUMMARY_COLOR)
+            widths.append(width)
+            result.summaries.append(i)
+            result.depth = max(result.depth, depth + 1)
+            half = widths[i] / 2
+            return i, [-half, -half], [half, half]
+        labels.append(label)
+        colors.append(color)
+        widths.append(width)
+        result.depth = max(result.depth, depth)
+        half = width / 2
+
+        placed = [(side, place(c, depth + 1)) for side, c in enumerate(below) if c is not None]
+        if not placed:
+            return i, [-half], [half]
+
+        # Empurra cada filho para a direita até encostar no contorno acumulado
+        _, left, right = placed[0][1]
+        offsets = [0.0]
+        left, right = list(left), list(right)
+        for _, (_, c_left, c_right) in placed[1:]:
+            shift = max(r - l for r, l in zip(right, c_left)) + gap
+            offsets.append(shift)
+            for d, r in enumerate(c_right):
+                if d < len(right):
+                    right[d] = r + shift
+                else:
+                    right.append(r + shift)
+            left.extend(l + shift for l in c_left[len(left):])
+
+        if binary and len(placed) == 1:
+            # Filho único da rubro-negra: fica do seu lado, não embaixo do pai
+            mid = (1 + gap) / 2 if placed[0][0] == 0 else -(1 + gap) / 2
+        else:
+            mid = (offsets[0] + offsets[-1]) / 2
+        kids[i] = tuple(index for _, (index, _, _) in placed)
+        for index, offset in zip(kids[i], offsets):
+            rel[index] = offset - mid
+            result.edges.append((i, index))
+        return i, [-half] + [l - mid for l in left], [half] + [r - mid for r in right]
+
+    place(root, 0)
+    # Posições absolutas numa passada de cima para baixo (os pais vêm antes)
+    for i, children_of in enumerate(kids):
+        for c in children_of:
+            x[c] = x[i] + rel[c]
+    return result
+
+
+# -------------------------
+# Desenho
+# -------------------------
+def draw(lay, ax, label_limit=400, rasterize_above=5000, fontsize=None):
+    """Desenha um TreeLayout num eixo do matplotlib, com uma coleção por elemento."""
+    n = len(lay)
+    if n == 0:
+        ax.axis("off")
+        return
+    raster = n > rasterize_above
+    x, y = lay.x, lay.y
+    segments = [((x[p], y[p]), (x[c], y[c])) for p, c in lay.edges]
+    ax.add_collection(LineCollection(segments, colors="k", linewidths=1.0 if n < 2000 else 0.3,
+                                     alpha=0.7, zorder=1, rasterized=raster))
+
+    summary = set(lay.summaries)
+    nodes = [i for i in range(n) if i not in summary]
+    if lay.binary:
+        ax.add_collection(EllipseCollection(
+            [NODE_HEIGHT] * len(nodes), [NODE_HEIGHT] * len(nodes), [0] * len(nodes),
+            units="xy", offsets=[(x[i], y[i]) for i in nodes], offset_transform=ax.transData,
+            facecolors=[lay.colors[i] for i in nodes], edgecolors="black",
+            linewidths=1.5 if n < 2000 else 0, zorder=2, rasterized=raster))
+    else:
+        h = NODE_HEIGHT / 2
+        boxes = [((x[i] - lay.widths[i] / 2, y[i] - h), (x[i] + lay.widths[i] / 2, y[i] - h),
+                  (x[i] + lay.widths[i] / 2, y[i] + h), (x[i] - lay.widths[i] / 2, y[i] + h))
+                 for i in nodes]
+        ax.add_collection(PolyCollection(boxes, facecolors=BTREE_COLOR, edgecolors="black",
+                                         linewidths=1.0 if n < 2000 else 0, zorder=2, rasterized=raster))
+    if summary:
+        h = NODE_HEIGHT / 2
+        triangles = [((x[i], y[i] + h), (x[i] - lay.widths[i] / 2, y[i] - h),
+                      (x[i] + lay.widths[i] / 2, y[i] - h)) for i in lay.summaries]
+        ax.add_collection(PolyCollection(triangles, facecolors=SUMMARY_COLOR, edgecolors="gray",
+                                         zorder=2, rasterized=raster))
+
+    if n <= label_limit:
+        size = fontsize or (12 if n <= 40 else 8 if n <= 150 else 5)
+        for i in range(n):
+            white = lay.binary and lay.colors[i] != SUMMARY_COLOR
+            ax.text(x[i], y[i] - (0.5 if i in summary else 0), lay.labels[i], ha="center", va="center",
+                    fontsize=size, fontweight="bold", color="white" if white else "black", zorder=3)
+
+    left, right, bottom, top = lay.bounds()
+    ax.set_xlim(left - 1, right + 1)
+    ax.set_ylim(bottom - 1, top + 1)
+    # Círculos redondos enquanto a árvore não é larga demais para a figura
+    if right - left <= 12 * (top - bottom + 2):
+        ax.set_aspect("equal")
+    ax.axis("off")
+
+
+def _legend(ax, lay):
+    if lay.binary:
+        handles = [patches.Patch(color="red", label="Nós RED"), patches.Patch(color="black", label="Nós BLACK")]
+    else:
+        handles = [patches.Patch(facecolor=BTREE_COLOR, edgecolor="black", label="Nós (chaves)")]
+    if lay.summaries:
+        handles.append(patches.Patch(color=SUMMARY_COLOR, label="Subárvore resumida (+chaves)"))
+    ax.legend(handles=handles, loc="upper right", bbox_to_anchor=(1, 1))
+
+
+def _figsize(lay, max_width=60):
+    # Largura proporcional à árvore, com teto (o Agg não passa de 65536 px)
+    left, right, bottom, top = lay.bounds() if len(lay) else (0, 1, -1, 0)
+    width = min(max(15, (right - left) * 0.35), max_width)
+    height = min(max(10, (top - bottom) * 0.8), 40)
+    return width, height
+
+
+def _render_into(fig, lay, title, legend, label_limit, rasterize_above):
+    ax = fig.add_subplot(1, 1, 1)
+    draw(lay, ax, label_limit=label_limit, rasterize_above=rasterize_above)
+    if title:
+        ax.set_title(title, fontsize=16, fontweight="bold", pad=20)
+    if legend and len(lay):
+        _legend(ax, lay)
+    return fig
+
+
+def render(tree, title=None, legend=True, max_depth=None, max_nodes=None,
+           label_limit=400, rasterize_above=5000):
+    """Monta a figura da árvore numa Figure própria, sem pyplot."""
+    lay = layout(tree, max_depth=max_depth, max_nodes=max_nodes)
+    return _render_into(Figure(figsize=_figsize(lay)), lay, title, legend, label_limit, rasterize_above)
+
+
+def export(tree, target, format=None, dpi=100, **kwargs):
+    """Grava a árvore em PNG ou SVG (caminho ou arquivo aberto), sem abrir janela.
+
+    O formato vem de `format` ou da extensão do caminho; argumentos extras
+    vão para render().
+    """
+    fig = render(tree, **kwargs)
+    fig.savefig(target, format=format, dpi=dpi, bbox_inches="tight")
+    return fig
+
+
+def plot_tree(tree, title=None, legend=True, max_depth=None, max_nodes=None,
+              label_limit=400, rasterize_above=5000):
+    """Mostra a árvore numa janela do pyplot (o que os scripts de teste usam)."""
+    import matplotlib.pyplot as plt
+
+    lay = layout(tree, max_depth=max_depth, max_nodes=max_nodes)
+    fig = _render_into(plt.figure(figsize=_figsize(lay)), lay, title, legend, label_limit, rasterize_above)
+    fig.tight_layout()
+    plt.show()